@@ -1,8 +1,11 @@
 """Context."""
 from collections import defaultdict
+from concurrent import futures
+from functools import partial
+import heapq
+from io import TextIOWrapper
 import itertools
 import logging
-import pickle
 import struct
 import time
 import traceback
@@ -14,6 +17,9 @@ from .cache_manager import CacheManager
 from .conf import SparkConf
 from .exceptions import ContextIsLockedException
 from .fileio import File, TextFile
+from .fileio.framed_pickle import load_batches
+from .fileio.prefetch import Prefetch
+from .fileio.streams import iter_lines, read_exactly
 from .partition import Partition
 from .rdd import EmptyRDD, RDD
 from .task_context import TaskContext
@@ -114,6 +120,10 @@ class Context:
     :param float retry_wait: seconds to wait between retries
     :param cache_manager: custom cache manager (like `TimedCacheManager`)
     :param catch_exceptions: whether to catch and silence user space exceptions
+    :param prefetch: settings to read the inputs of ``textFile()``,
+        ``binaryFiles()`` and the SQL readers ahead in background threads
+        (see :class:`pysparkling.fileio.prefetch.Prefetch`). By default,
+        inputs are read one after another without background threads.
     """
 
     __last_rdd_id = 0
@@ -121,7 +131,7 @@ class Context:
     def __init__(self, pool=None, serializer=None, deserializer=None,
                  data_serializer=None, data_deserializer=None,
                  max_retries=3, retry_wait=0.0, cache_manager=None,
-                 catch_exceptions=False):
+                 catch_exceptions=False, *, prefetch=None):
         if pool is None:
             pool = DummyPool()
         if serializer is None:
@@ -136,6 +146,7 @@ class Context:
         self.retry_wait = retry_wait
 
         self._cache_manager = cache_manager or CacheManager()
+        self._prefetch = prefetch if prefetch is not None else Prefetch(depth=0, max_bytes=0)
         self._catch_exceptions = catch_exceptions
         self._pool = pool
         self._serializer = serializer
@@ -236,7 +247,9 @@ class Context:
 
         :param minPartitions: (optional)
             By default, every file is a partition, but this option allows to
-            split these further.
+            split these further. Uncompressed files that are larger than
+            their share of the total size are split into byte ranges at
+            frame boundaries.
 
         :rtype: RDD
 
@@ -257,14 +270,14 @@ class Context:
         resolved_names = File.resolve_filenames(name)
         log.debug('pickleFile() resolved "%s" to %s files.', name, len(resolved_names))
 
-        n_partitions = len(resolved_names)
+        splits = input_splits(sorted(resolved_names), minPartitions)
+
+        n_partitions = len(splits)
         if minPartitions and minPartitions > n_partitions:
             n_partitions = minPartitions
 
-        rdd_filenames = self.parallelize(sorted(resolved_names), n_partitions)
-        rdd = rdd_filenames.flatMap(
-            lambda f_name: pickle.load(File(f_name).load())
-        )
+        rdd_splits = self.parallelize(splits, n_partitions)
+        rdd = rdd_splits.flatMap(read_pickle_split)
         rdd._name = name
         return rdd
 
@@ -320,58 +333,138 @@ class Context:
             )
             yield _run_task(task_context, rdd, func, partition)
 
-    def _runJob_distributed(self, rdd, func, partitions):
-        serialized_func_rdd = self._serializer((func, rdd))
+    def runApproximateJob(self, rdd, func, evaluator, timeout,
+                          partitions=None):
+        """Run a job and evaluate the tasks that complete within ``timeout``.
 
-        def prepare(partition):
-            t_start = time.perf_counter()
-            cm_clone = self._cache_manager.clone_contains(
-                lambda i: i[1] == partition.index)
-            self._stats['driver_cache_clone'] += time.perf_counter() - t_start
+        :param func: Map function with signature
+            func(TaskContext, Iterator over elements).
+        :param evaluator: An instance with a ``merge(task_result)`` and a
+            ``currentResult()`` method, like the evaluators in
+            :mod:`pysparkling.partial`.
+        :param timeout: Time in milliseconds after which the result is
+            evaluated. `None` means all tasks are awaited.
+        :param partitions: List of partitions that are involved. `None` means
+            the map job is applied to all partitions.
+        :returns: Result of ``evaluator.currentResult()``.
+        """
+        if not partitions:
+            partitions = rdd.partitions()
 
-            t_start = time.perf_counter()
-            task_context = TaskContext(
-                cache_manager=cm_clone,
-                catch_exceptions=self._catch_exceptions,
-                stage_id=0,
-                partition_id=partition.index,
-                max_retries=self.max_retries,
-                retry_wait=self.retry_wait,
-            )
-            serialized_task_context = self._serializer(task_context)
-            self._stats['driver_serialize_task_context'] += time.perf_counter() - t_start
-
-            t_start = time.perf_counter()
-            serialized_partition = self._data_deserializer(partition)
-            self._stats['driver_serialize_data'] += time.perf_counter() - t_start
-
-            return (
-                self._deserializer,
-                self._data_serializer,
-                self._data_deserializer,
-                serialized_func_rdd,
-                serialized_task_context,
-                serialized_partition,
-            )
+        # acquire lock
+        if self.locked:
+            raise ContextIsLockedException
+        self.locked = True
 
-        prepared_partitions = (prepare(p) for p in partitions)
-        for d in self._pool.map(runJob_map, prepared_partitions):
-            t_start = time.perf_counter()
-            map_result, cache_result, s = self._data_deserializer(d)
-            self._stats['driver_deserialize_data'] += time.perf_counter() - t_start
+        deadline = None if timeout is None else time.monotonic() + timeout / 1000.0
 
-            # join cache
-            t_start = time.perf_counter()
-            self._cache_manager.join(cache_result)
-            self._stats['driver_cache_join'] += time.perf_counter() - t_start
+        try:
+            if isinstance(self._pool, DummyPool):
+                for task_result in self._runJob_local(rdd, func, partitions):
+                    evaluator.merge(task_result)
+                    if deadline is not None and time.monotonic() >= deadline:
+                        break
+            else:
+                for task_result in self._runJob_distributed_until(rdd, func, partitions, deadline):
+                    evaluator.merge(task_result)
+        finally:
+            # release lock
+            self.locked = False
+
+        return evaluator.currentResult()
+
+    def _prepare_task(self, serialized_func_rdd, partition):
+        t_start = time.perf_counter()
+        cm_clone = self._cache_manager.clone_contains(
+            lambda i: i[1] == partition.index)
+        self._stats['driver_cache_clone'] += time.perf_counter() - t_start
+
+        t_start = time.perf_counter()
+        task_context = TaskContext(
+            cache_manager=cm_clone,
+            catch_exceptions=self._catch_exceptions,
+            stage_id=0,
+            partition_id=partition.index,
+            max_retries=self.max_retries,
+            retry_wait=self.retry_wait,
+        )
+        serialized_task_context = self._serializer(task_context)
+        self._stats['driver_serialize_task_context'] += time.perf_counter() - t_start
+
+        t_start = time.perf_counter()
+        serialized_partition = self._data_deserializer(partition)
+        self._stats['driver_serialize_data'] += time.perf_counter() - t_start
+
+        return (
+            self._deserializer,
+            self._data_serializer,
+            self._data_deserializer,
+            serialized_func_rdd,
+            serialized_task_context,
+            serialized_partition,
+        )
+
+    def _process_task_output(self, d):
+        t_start = time.perf_counter()
+        map_result, cache_result, s = self._data_deserializer(d)
+        self._stats['driver_deserialize_data'] += time.perf_counter() - t_start
+
+        # join cache
+        t_start = time.perf_counter()
+        self._cache_manager.join(cache_result)
+        self._stats['driver_cache_join'] += time.perf_counter() - t_start
+
+        # collect stats
+        for k, v in s.items():
+            self._stats[k] += v
+
+        return map_result
+
+    def _runJob_distributed(self, rdd, func, partitions):
+        serialized_func_rdd = self._serializer((func, rdd))
 
-            # collect stats
-            for k, v in s.items():
-                self._stats[k] += v
+        prepared_partitions = (self._prepare_task(serialized_func_rdd, p)
+                               for p in partitions)
+        for d in self._pool.map(runJob_map, prepared_partitions):
+            yield self._process_task_output(d)
 
-            yield map_result
+    def _runJob_distributed_until(self, rdd, func, partitions, deadline):
+        """Yields the results of the tasks that complete before the deadline.
 
-    def binaryFiles(self, path, minPartitions=None):
+        Pools with ``submit()`` (``concurrent.futures``) or ``apply_async()``
+        (``multiprocessing``) are stopped waiting for at the deadline. Other
+        pools are consumed through ``map()`` and only checked in between
+        results.
+        """
+        serialized_func_rdd = self._serializer((func, rdd))
+        prepared_partitions = [self._prepare_task(serialized_func_rdd, p)
+                               for p in partitions]
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        if hasattr(self._pool, 'submit'):
+            tasks = [self._pool.submit(runJob_map, p) for p in prepared_partitions]
+            done, not_done = futures.wait(tasks, timeout=remaining())
+            for task in not_done:
+                task.cancel()
+            for task in tasks:
+                if task in done:
+                    yield self._process_task_output(task.result())
+        elif hasattr(self._pool, 'apply_async'):
+            tasks = [self._pool.apply_async(runJob_map, (p,)) for p in prepared_partitions]
+            for task in tasks:
+                task.wait(remaining())
+            for task in tasks:
+                if task.ready():
+                    yield self._process_task_output(task.get())
+        else:
+            for d in self._pool.map(runJob_map, prepared_partitions):
+                yield self._process_task_output(d)
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+
+    def binaryFiles(self, path, minPartitions=None, archiveMembers=False):
         """Read a binary file into an RDD.
 
         :param path:
@@ -383,6 +476,11 @@ class Context:
             By default, every file is a partition, but this option allows to
             split these further.
 
+        :param archiveMembers: (optional)
+            Read the files in tar and zip archives as separate files named
+            ``<archive>/<member>`` instead of the concatenation of all of
+            them. See :func:`archive_splits` for the partitions.
+
         :rtype: RDD
 
         .. warning::
@@ -408,13 +506,18 @@ class Context:
         resolved_names = File.resolve_filenames(path)
         log.debug('binaryFile() resolved "%s" to %s files.', path, len(resolved_names))
 
+        if archiveMembers:
+            splits = archive_splits(sorted(resolved_names), minPartitions)
+            rdd = self.parallelize(splits, len(splits)).flatMap(read_binary_members)
+            rdd._name = path
+            return rdd
+
         n_partitions = len(resolved_names)
         if minPartitions and minPartitions > n_partitions:
             n_partitions = minPartitions
 
         rdd_filenames = self.parallelize(sorted(resolved_names), n_partitions)
-        rdd = rdd_filenames.map(lambda f_name:
-                                (f_name, File(f_name).load().read()))
+        rdd = rdd_filenames.mapPartitions(partial(self._prefetch.map, map_binary_file))
         rdd._name = path
         return rdd
 
@@ -433,6 +536,10 @@ class Context:
 
         :rtype: RDD
 
+        Records are read file by file: uncompressed local files are
+        memory-mapped and other files are streamed, so only the records
+        themselves are copied into Python objects.
+
         .. warning::
             Only an ``int`` recordLength is part of the PySpark API.
 
@@ -474,19 +581,25 @@ class Context:
         ['bello', 'bellobello']
         """
 
-        rdd = self.binaryFiles(path).values()
         if recordLength is None:
-            pass
-        elif isinstance(recordLength, int):
-            chunker = FixedLengthChunker(recordLength)
-            rdd = rdd.flatMap(chunker)
+            rdd = self.binaryFiles(path).values()
+            rdd._name = path
+            return rdd
+
+        if isinstance(recordLength, int):
+            record_reader = FixedLengthRecordReader(recordLength)
         else:
-            chunker = VariableLengthChunker(recordLength)
-            rdd = rdd.flatMap(chunker)
+            record_reader = VariableLengthRecordReader(recordLength)
+
+        resolved_names = File.resolve_filenames(path)
+        log.debug('binaryRecords() resolved "%s" to %s files.', path, len(resolved_names))
+
+        rdd_filenames = self.parallelize(sorted(resolved_names), len(resolved_names))
+        rdd = rdd_filenames.flatMap(record_reader)
         rdd._name = path
         return rdd
 
-    def textFile(self, filename, minPartitions=None, use_unicode=True):
+    def textFile(self, filename, minPartitions=None, use_unicode=True, archiveMembers=False):
         """Read a text file into an RDD.
 
         :param filename:
@@ -496,27 +609,57 @@ class Context:
 
         :param minPartitions: (optional)
             By default, every file is a partition, but this option allows to
-            split these further.
+            split these further. Uncompressed files that are larger than
+            their share of the total size are split into byte ranges that
+            are read by separate tasks.
 
         :param use_unicode: (optional, default=True)
             Use ``utf8`` if ``True`` and ``ascii`` if ``False``.
 
+        :param archiveMembers: (optional)
+            Read the files in tar and zip archives separately, so that they
+            can be in different partitions and a line never continues in the
+            next file. See :func:`archive_splits` for the partitions.
+
         :rtype: RDD
+
+
+        Example:
+
+        >>> import pysparkling
+        >>> from tempfile import NamedTemporaryFile
+        >>> tmpFile = NamedTemporaryFile(delete=True)
+        >>> tmpFile.close()
+        >>> with open(tmpFile.name, 'w') as f:
+        ...     _ = f.write('\\n'.join(str(i) for i in range(1000)))
+        >>> rdd = pysparkling.Context().textFile(tmpFile.name, minPartitions=3)
+        >>> rdd.getNumPartitions(), rdd.count(), rdd.collect()[-1]
+        (3, 1000, '999')
         """
         resolved_names = TextFile.resolve_filenames(filename)
         log.debug('textFile() resolved "%s" to %s files.', filename, len(resolved_names))
 
-        n_partitions = len(resolved_names)
+        encoding = 'utf8' if use_unicode else 'ascii'
+
+        if archiveMembers:
+            splits = archive_splits(sorted(resolved_names), minPartitions)
+            rdd = self.parallelize(splits, len(splits)).flatMap(
+                lambda split: read_text_member_lines(split, encoding)
+            )
+            rdd._name = filename
+            return rdd
+
+        splits = input_splits(sorted(resolved_names), minPartitions)
+
+        n_partitions = len(splits)
         if minPartitions and minPartitions > n_partitions:
             n_partitions = minPartitions
 
-        encoding = 'utf8' if use_unicode else 'ascii'
+        read_split = partial(read_text_split, encoding=encoding,
+                             read_ahead=self._prefetch.read_ahead)
 
-        rdd_filenames = self.parallelize(sorted(resolved_names), n_partitions)
-        rdd = rdd_filenames.flatMap(
-            lambda f_name:
-            TextFile(f_name).load(encoding=encoding).read().splitlines()
-        )
+        rdd_splits = self.parallelize(splits, n_partitions)
+        rdd = rdd_splits.mapPartitions(partial(self._prefetch.flat_map, read_split))
         rdd._name = filename
         return rdd
 
@@ -533,7 +676,7 @@ class Context:
             (x for rdd in rdds for x in rdd.collect())
         )
 
-    def wholeTextFiles(self, path, minPartitions=None, use_unicode=True):
+    def wholeTextFiles(self, path, minPartitions=None, use_unicode=True, archiveMembers=False):
         """Read text files into an RDD of pairs of file name and file content.
 
         :param path:
@@ -548,16 +691,29 @@ class Context:
         :param use_unicode: (optional, default=True)
             Use ``utf8`` if ``True`` and ``ascii`` if ``False``.
 
+        :param archiveMembers: (optional)
+            Read the files in tar and zip archives as separate files named
+            ``<archive>/<member>``. See :func:`archive_splits` for the
+            partitions.
+
         :rtype: RDD
         """
         resolved_names = TextFile.resolve_filenames(path)
         log.debug('wholeTextFiles() resolved "%s" to %s files.', path, len(resolved_names))
 
+        encoding = 'utf8' if use_unicode else 'ascii'
+
+        if archiveMembers:
+            splits = archive_splits(sorted(resolved_names), minPartitions)
+            rdd = self.parallelize(splits, len(splits)).flatMap(
+                lambda split: read_whole_text_members(split, encoding)
+            )
+            rdd._name = path
+            return rdd
+
         n_partitions = len(resolved_names)
         if minPartitions and minPartitions > n_partitions:
             n_partitions = minPartitions
-
-        encoding = 'utf8' if use_unicode else 'ascii'
         rdd_filenames = self.parallelize(
             [(f_name, encoding) for f_name in sorted(resolved_names)],
             n_partitions,
@@ -581,36 +737,238 @@ class DummyPool:
         pass
 
 
+def input_splits(file_names, minPartitions=None):
+    """Divide files into byte ranges.
+
+    Similar to Hadoop's input splits: when ``minPartitions`` is larger than
+    the number of files, files that are larger than the total size divided
+    by ``minPartitions`` are split into ranges of about that size if their
+    codec allows it. This includes compressed files that are
+    :attr:`~pysparkling.fileio.File.block_splittable` like bzip2 files.
+
+    :param list file_names: Resolved file names.
+    :param int minPartitions: Requested minimum number of partitions.
+    :returns: List of ``(file_name, start, end)`` where ``end`` is ``None``
+        for the end of the file.
+    :rtype: list
+    """
+    if not minPartitions or minPartitions <= len(file_names):
+        return [(f_name, 0, None) for f_name in file_names]
+
+    files = [File(f_name) for f_name in file_names]
+    sizes = [f.size() if f.splittable or f.block_splittable else None for f in files]
+    goal_size = max(1, sum(s for s in sizes if s) // minPartitions)
+
+    splits = []
+    for f_name, size in zip(file_names, sizes):
+        if not size or size <= goal_size:
+            splits.append((f_name, 0, None))
+            continue
+
+        # like Hadoop, allow the last split to be 10% larger
+        n = size // goal_size
+        if size - n * goal_size > goal_size // 10:
+            n += 1
+        bounds = [i * size // n for i in range(n)] + [None]
+        splits += [(f_name, start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+    return splits
+
+
+def archive_splits(file_names, minPartitions=None):
+    """Divide the members of archives into groups of similar size.
+
+    The members of tar and zip archives are listed up front and every
+    member is a unit of work like a file that is not an archive. Without
+    ``minPartitions`` every unit is a group. Otherwise, units are assigned
+    to ``minPartitions`` groups from the largest to the smallest, always to
+    the group with the smallest total size.
+
+    :param list file_names: Resolved file names.
+    :param int minPartitions: Requested number of partitions.
+    :returns: List of groups, each a list of ``(file_name, member_names)``
+        where ``member_names`` is ``None`` for files that are not archives.
+        Groups and member names are in the order of the input, so a group
+        is read in one pass.
+    :rtype: list
+    """
+    units = _archive_units(file_names)
+    n_groups = min(len(units), minPartitions) if minPartitions else len(units)
+    if n_groups < 1:
+        return []
+
+    loads = [(0, i) for i in range(n_groups)]
+    assignment = [[] for _ in range(n_groups)]
+    for unit_index in sorted(range(len(units)), key=lambda u: -units[u][2]):
+        load, i = heapq.heappop(loads)
+        assignment[i].append(unit_index)
+        heapq.heappush(loads, (load + units[unit_index][2], i))
+
+    return [
+        _archive_group([units[unit_index] for unit_index in sorted(unit_indices)])
+        for unit_indices in sorted(assignment, key=min)
+    ]
+
+
+def _archive_units(file_names):
+    """List the files and archive members as ``(file_name, member, size)``."""
+    units = []
+    for f_name in file_names:
+        f = File(f_name)
+        members = f.members()
+        if members is None:
+            units.append((f_name, None, f.size() or 0))
+        else:
+            units += [(f_name, name, size) for name, size in members]
+    return units
+
+
+def _archive_group(units):
+    """Merge the members of the same archive in consecutive units."""
+    group = []
+    for f_name, member, _ in units:
+        if member is None:
+            group.append((f_name, None))
+        elif group and group[-1][0] == f_name:
+            group[-1][1].append(member)
+        else:
+            group.append((f_name, [member]))
+    return group
+
+
+def iter_archive_split(split):
+    """Open the members and files of a group from :func:`archive_splits`.
+
+    :returns: Iterator of ``(file_name, name, stream)`` where ``name`` is
+        ``<file_name>/<member>`` for archive members. Every stream can only
+        be read until the next one is requested.
+    """
+    for f_name, members in split:
+        if members is None:
+            with File(f_name).load() as stream:
+                yield f_name, f_name, stream
+            continue
+
+        for member, stream in File(f_name).load_members(members):
+            yield f_name, f'{f_name}/{member}', stream
+
+
 # pickle-able helpers
 
+def read_pickle_split(split):
+    f_name, start, end = split
+    with File(f_name).load() as stream:
+        for batch in load_batches(stream, start, end):
+            yield from batch
+
+
+def read_text_split(split, encoding, read_ahead=0):
+    f_name, start, end = split
+    return TextFile(f_name).lines_in_range(start, end, encoding=encoding, read_ahead=read_ahead)
+
+
+def map_binary_file(f_name):
+    with File(f_name).load() as stream:
+        return f_name, stream.read()
+
+
+def read_binary_members(split):
+    for _, name, stream in iter_archive_split(split):
+        yield name, stream.read()
+
+
+def read_text_member_lines(split, encoding):
+    for _, _, stream in iter_archive_split(split):
+        with TextIOWrapper(stream, encoding, 'ignore') as text:
+            yield from iter_lines(text)
+
+
+def read_whole_text_members(split, encoding):
+    for _, name, stream in iter_archive_split(split):
+        yield name, stream.read().decode(encoding, 'ignore')
+
+
 def map_whole_text_file(f_name__encoding):
     f_name, encoding = f_name__encoding
-    return (
-        f_name,
-        TextFile(f_name).load(encoding=encoding).read(),
-    )
+    with TextFile(f_name).load(encoding=encoding) as stream:
+        return f_name, stream.read()
+
 
+class FixedLengthRecordReader:
+    """Reads the fixed length records of a file.
+
+    Uncompressed local files are memory-mapped and every record is copied
+    out of the mapped region as ``bytes``. Memoryviews would avoid the copy
+    but cannot be pickled back from process pools and would keep the map
+    open. Other files are streamed.
+    """
 
-class FixedLengthChunker:
     def __init__(self, recordLength):
         self.record_length = recordLength
 
-    def __call__(self, data):
-        for i in range(0, len(data), self.record_length):
-            yield data[i: i + self.record_length]
+    def __call__(self, f_name):
+        f = File(f_name)
+        mapped = f.load_mmap()
+        if mapped is not None:
+            try:
+                for i in range(0, len(mapped), self.record_length):
+                    yield mapped[i: i + self.record_length]
+            finally:
+                mapped.close()
+            return
+
+        with f.load() as stream:
+            yield from iter(lambda: read_exactly(stream, self.record_length), b'')
 
 
 class VariableLengthChunker:
+    """Splits a buffer into records that are prefixed with their length.
+
+    :param str recordLength: ``struct`` format of the length prefix.
+    """
+
     def __init__(self, recordLength):
         self.length_fmt = recordLength
-        self.prefix_length = struct.calcsize(recordLength)
+        self.prefix = struct.Struct(recordLength)
+        self.prefix_length = self.prefix.size
 
     def __call__(self, data):
-        while data:
-            prefix, data = data[:self.prefix_length], data[self.prefix_length:]
-            length = struct.unpack(self.length_fmt, prefix)[0]
-            package, data = data[:length], data[length:]
-            yield package
+        offset = 0
+        while offset < len(data):
+            length = self.prefix.unpack_from(data, offset)[0]
+            offset += self.prefix_length
+            yield data[offset:offset + length]
+            offset += length
+
+
+class VariableLengthRecordReader:
+    """Reads the length-prefixed records of a file.
+
+    Uncompressed local files are memory-mapped. Other files are streamed
+    and only one record is held in memory at a time.
+
+    :param str recordLength: ``struct`` format of the length prefix.
+    """
+
+    def __init__(self, recordLength):
+        self.chunker = VariableLengthChunker(recordLength)
+
+    def __call__(self, f_name):
+        f = File(f_name)
+        mapped = f.load_mmap()
+        if mapped is not None:
+            try:
+                yield from self.chunker(mapped)
+            finally:
+                mapped.close()
+            return
+
+        prefix = self.chunker.prefix
+        with f.load() as stream:
+            while True:
+                length_prefix = read_exactly(stream, prefix.size)
+                if not length_prefix:
+                    break
+                yield read_exactly(stream, prefix.unpack(length_prefix)[0])
 
 
 class SparkContext(Context):
@@ -3,10 +3,12 @@ import logging
 from .bz2 import Bz2
 from .codec import Codec
 from .gz import Gz
+from .lz4 import Lz4
 from .lzma import Lzma
 from .sevenz import SevenZ
 from .tar import Tar, TarBz2, TarGz
 from .zip import Zip
+from .zstd import Zstd
 
 log = logging.getLogger(__name__)
 
@@ -19,8 +21,28 @@ FILE_ENDINGS = [
     (('.bz2',), Bz2),
     (('.lzma', '.xz'), Lzma),
     (('.7z',), SevenZ),
+    (('.zst',), Zstd),
+    (('.lz4',), Lz4),
 ]
 
+#: Hadoop compression codec class names with a Python implementation.
+#: Hadoop's ``Lz4Codec`` writes LZ4 blocks and not frames, so it is not
+#: compatible with :class:`Lz4`.
+HADOOP_CODECS = {
+    'org.apache.hadoop.io.compress.GzipCodec': Gz,
+    'org.apache.hadoop.io.compress.BZip2Codec': Bz2,
+    'org.apache.hadoop.io.compress.ZStandardCodec': Zstd,
+}
+
+#: Codecs by the names of the ``compression`` option of Spark's writers.
+COMPRESSION_NAMES = {
+    'gzip': Gz,
+    'bzip2': Bz2,
+    'xz': Lzma,
+    'zstd': Zstd,
+    'lz4': Lz4,
+}
+
 
 class NoCodec(Codec):
     pass
@@ -37,3 +59,42 @@ def get_codec(path):
             return codec_class
 
     return NoCodec
+
+
+def get_path_suffix(path):
+    """File ending of a path if it has a codec.
+
+    >>> get_path_suffix('data.tar.gz'), get_path_suffix('data.txt')
+    ('.gz', '')
+
+    :rtype: str
+    """
+    for endings, _ in FILE_ENDINGS:
+        for ending in endings:
+            if path.endswith(ending):
+                return path[path.rfind('.'):]
+    return ''
+
+
+def get_codec_suffix(compressionCodecClass):
+    """File ending for a compression codec.
+
+    :param compressionCodecClass: A Hadoop codec class name like
+        ``org.apache.hadoop.io.compress.GzipCodec`` (or just ``GzipCodec``),
+        a name of :data:`COMPRESSION_NAMES` like ``zstd`` or a
+        :class:`Codec` subclass.
+    :rtype: str
+    """
+    codec_class = compressionCodecClass
+    if isinstance(compressionCodecClass, str):
+        codec_class = COMPRESSION_NAMES.get(compressionCodecClass.lower()) or next(
+            (c for name, c in HADOOP_CODECS.items()
+             if compressionCodecClass in (name, name.rpartition('.')[2])),
+            None,
+        )
+
+    for endings, c in FILE_ENDINGS:
+        if c is codec_class:
+            return endings[0]
+
+    raise ValueError(f'Unsupported compression codec: {compressionCodecClass}')
@@ -2,16 +2,140 @@ import bz2
 import io
 import logging
 
+from ..streams import CHUNK_SIZE, decoded_reader, StreamWindow
 from .codec import Codec
 
 log = logging.getLogger(__name__)
 
+_BLOCK_MAGIC = 0x314159265359
+_EOS_MAGIC = 0x177245385090
+_MAGIC_MASK = (1 << 48) - 1
+
+
+def _magic_patterns(magic):
+    """Byte patterns of a 48 bit magic number at every bit offset.
+
+    :returns: List of ``(shift, needle, needle_offset, length)`` where
+        ``needle`` are the bytes that are completely covered by the magic
+        number.
+    """
+    patterns = []
+    for shift in range(8):
+        length = (shift + 48 + 7) // 8
+        full = (magic << (length * 8 - 48 - shift)).to_bytes(length, 'big')
+        needle_offset = 1 if shift else 0
+        patterns.append((shift, full[needle_offset:6], needle_offset, length))
+    return patterns
+
+
+_PATTERNS = [(magic, _magic_patterns(magic)) for magic in (_BLOCK_MAGIC, _EOS_MAGIC)]
+
+
+def _find_magic(data, from_bit, magics):
+    """Find the first of the ``magics`` in ``data`` at or after a bit.
+
+    Candidates too close to the end of ``data`` to be verified are
+    ignored.
+
+    :returns: ``(bit, magic)`` or ``(None, None)``.
+    """
+    found = (None, None)
+    for magic, patterns in _PATTERNS:
+        if magic not in magics:
+            continue
+        for shift, needle, needle_offset, length in patterns:
+            first_byte = max(0, (from_bit - shift + 7) // 8)
+            pos = data.find(needle, first_byte + needle_offset)
+            while pos != -1:
+                p = pos - needle_offset
+                bit = p * 8 + shift
+                if p + length > len(data) or (found[0] is not None and bit >= found[0]):
+                    break
+                value = int.from_bytes(data[p:p + length], 'big') >> (length * 8 - 48 - shift)
+                if value & _MAGIC_MASK == magic:
+                    found = (bit, magic)
+                    break
+                pos = data.find(needle, pos + 1)
+    return found
+
 
 class Bz2(Codec):
-    """Implementation of :class:`.Codec` for bz2 compression."""
+    """Implementation of :class:`.Codec` for bz2 compression.
+
+    bzip2 compresses blocks of up to 900 kB independently. Like in Hadoop,
+    they are found by their magic numbers, so byte ranges of a file can be
+    decompressed in parallel.
+    """
+
+    splittable = False
+    has_blocks = True
 
     def compress(self, stream):
         return io.BytesIO(bz2.compress(b''.join(stream)))
 
+    def compress_chunks(self, chunks):
+        compressor = bz2.BZ2Compressor()
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def decompress_stream(self, stream):
+        return decoded_reader(stream, bz2.BZ2File)
+
     def decompress(self, stream):
         return io.BytesIO(bz2.decompress(stream.read()))
+
+    def block_splittable(self, header):
+        return header.startswith(b'BZh')
+
+    @staticmethod
+    def _next_magic(window, from_bit, magics, keep=None):
+        """Search the stream for a magic number from an absolute bit.
+
+        Data before ``keep`` (or the searched range) is dropped.
+        """
+        while True:
+            window.discard(from_bit // 8 - 8 if keep is None else keep)
+            bit, magic = _find_magic(window.data, from_bit - window.start * 8, magics)
+            if bit is not None:
+                return window.start * 8 + bit, magic
+            if window.eof:
+                return None, None
+            # the last bytes are searched again after the window grew
+            from_bit = max(from_bit, (window.end - 7) * 8)
+            window.fill(window.end + CHUNK_SIZE)
+
+    def iter_blocks(self, stream, offset=0):
+        # Like in Hadoop, a block magic number that occurs by chance in
+        # compressed data (the probability is 2^-48 per bit) is not handled.
+        window = StreamWindow(stream, offset)
+        start, _ = self._next_magic(window, offset * 8, (_BLOCK_MAGIC,))
+        while start is not None:
+            end, magic = self._next_magic(window, start + 48, (_BLOCK_MAGIC, _EOS_MAGIC),
+                                          keep=start // 8)
+            if end is None:
+                raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+
+            yield start, end, window.get(start // 8, (end + 7) // 8)
+
+            if magic == _BLOCK_MAGIC:
+                start = end
+            else:
+                # the next stream of a concatenated file or the end
+                start, _ = self._next_magic(window, end + 48, (_BLOCK_MAGIC,))
+
+    def decompress_block(self, data, start_bit, end_bit):
+        # A block with its own stream header and end-of-stream marker is a
+        # valid stream. Its checksum is the checksum of the block, which
+        # follows the block magic number.
+        n_bits = end_bit - start_bit
+        block = int.from_bytes(data, 'big') >> (len(data) * 8 - start_bit % 8 - n_bits)
+        block &= (1 << n_bits) - 1
+        crc = (block >> (n_bits - 80)) & 0xFFFFFFFF
+
+        stream = (((block << 48) | _EOS_MAGIC) << 32) | crc
+        n_bits += 80
+        padding = -n_bits % 8
+        return bz2.decompress(b'BZh9' + (stream << padding).to_bytes((n_bits + padding) // 8, 'big'))
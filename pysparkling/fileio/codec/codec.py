@@ -5,6 +5,17 @@ log = logging.getLogger(__name__)
 
 class Codec:
     """Codec."""
+
+    #: Whether a byte range of a file can be read without the data before it.
+    splittable = True
+
+    #: Whether the file contains several members that can be read separately.
+    archive = False
+
+    #: Whether the data can consist of independently compressed blocks.
+    #: See :meth:`block_splittable`.
+    has_blocks = False
+
     def __init__(self):
         pass
 
@@ -16,6 +27,24 @@ class Codec:
         """
         return stream
 
+    def compress_chunks(self, chunks):
+        """Compress incrementally.
+
+        :param chunks: Iterable of uncompressed ``bytes``.
+        :returns: Iterator of compressed ``bytes``.
+        """
+        return iter(chunks)
+
+    def decompress_stream(self, stream):
+        """Decompress incrementally.
+
+        :param stream: Readable file-like object with compressed data. It
+            is not necessarily seekable.
+        :returns: Readable file-like object with the uncompressed data.
+            Closing it closes ``stream``.
+        """
+        return stream
+
     def decompress(self, stream):
         """Decompress.
 
@@ -23,3 +52,65 @@ class Codec:
         :rtype: io.BytesIO
         """
         return stream
+
+    def list_members(self, stream):
+        """List the files in an archive.
+
+        :param stream: Readable file-like object with the archive. It is
+            closed afterwards.
+        :returns: List of ``(name, size)`` in the order of the archive or
+            ``None`` if the codec does not read archives.
+        """
+        stream.close()
+
+    def iter_members(self, stream, names):
+        """Extract files from an archive in one pass.
+
+        Every member can only be read until the next one is requested.
+
+        :param stream: Readable file-like object with the archive. It is
+            closed afterwards.
+        :param names: Names of the members to extract.
+        :returns: Iterator of ``(name, stream)`` in the order of the archive.
+            It is empty if the codec does not read archives.
+        """
+        stream.close()
+        return iter(())
+
+    def block_splittable(self, header):
+        """Whether blocks can be found from any position in the file.
+
+        :param bytes header: The first 18 bytes of the file.
+        :rtype: bool
+        """
+        return False
+
+    def iter_blocks(self, stream, offset=0):
+        """Find the blocks that begin at or after a position.
+
+        Positions of blocks are in bits as bzip2 blocks are not aligned to
+        bytes.
+
+        :param stream: Readable file-like object with the compressed data
+            from ``offset`` on.
+        :param int offset: Position of the stream in bytes.
+        :returns: Iterator of ``(start_bit, end_bit, data)`` where ``data``
+            are the bytes that contain the bits of the block. It is empty
+            if the codec has no blocks.
+        """
+        return iter(())
+
+    def index_blocks(self, stream):
+        """Find all blocks of a file.
+
+        :param stream: Readable file-like object with the compressed data.
+        :returns: List of ``(start_bit, end_bit)``.
+        """
+        return [(start_bit, end_bit) for start_bit, end_bit, _ in self.iter_blocks(stream)]
+
+    def decompress_block(self, data, start_bit, end_bit):
+        """Decompress a block from :meth:`iter_blocks`.
+
+        :rtype: bytes
+        """
+        return data
@@ -1,14 +1,35 @@
 import gzip
 from io import BytesIO
+import itertools
 import logging
+import zlib
 
+from ..streams import CHUNK_SIZE, ChunkWriter, decoded_reader, iter_chunks, read_exactly, reader, StreamWindow
 from .codec import Codec
 
 log = logging.getLogger(__name__)
 
+_BGZF_MAGIC = b'\x1f\x8b\x08\x04'
+_BGZF_SUBFIELD = b'BC\x02\x00'
+_BGZF_HEADER_SIZE = 18
+
+
+def _is_bgzf_header(header):
+    return header[:4] == _BGZF_MAGIC and header[12:16] == _BGZF_SUBFIELD
+
 
 class Gz(Codec):
-    """Implementation of :class:`.Codec` for gz compression."""
+    """Implementation of :class:`.Codec` for gz compression.
+
+    A gzip file can consist of several members that are compressed
+    independently. In BGZF files (block gzip, e.g. from ``bgzip``), the
+    members have a header with their size and are found from any position.
+    The members of other files are only found by decompressing the file, see
+    :meth:`pysparkling.fileio.File.build_block_index`.
+    """
+
+    splittable = False
+    has_blocks = True
 
     def compress(self, stream):
         compressed = BytesIO()
@@ -19,6 +40,19 @@ class Gz(Codec):
         compressed.seek(0)
         return compressed
 
+    def compress_chunks(self, chunks):
+        sink = ChunkWriter()
+        with gzip.GzipFile(fileobj=sink, mode='wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                compressed = sink.drain()
+                if compressed:
+                    yield compressed
+        yield sink.drain()
+
+    def decompress_stream(self, stream):
+        return decoded_reader(stream, lambda s: gzip.GzipFile(fileobj=s, mode='rb'))
+
     def decompress(self, stream):
         uncompressed = BytesIO()
 
@@ -27,3 +61,67 @@ class Gz(Codec):
 
         uncompressed.seek(0)
         return uncompressed
+
+    def block_splittable(self, header):
+        return _is_bgzf_header(header)
+
+    def iter_blocks(self, stream, offset=0):
+        window = StreamWindow(stream, offset)
+        position = offset
+        while True:
+            # search the next header
+            while window.fill(position + _BGZF_HEADER_SIZE):
+                header = window.get(position, position + _BGZF_HEADER_SIZE)
+                if _is_bgzf_header(header):
+                    break
+                found = window.data.find(_BGZF_MAGIC, position - window.start + 1)
+                if found == -1:
+                    position = max(position, window.end - len(_BGZF_MAGIC) + 1)
+                    window.fill(window.end + CHUNK_SIZE)
+                else:
+                    position = window.start + found
+                window.discard(position)
+            else:
+                return
+
+            # walk from block to block
+            while window.fill(position + _BGZF_HEADER_SIZE):
+                header = window.get(position, position + _BGZF_HEADER_SIZE)
+                if not _is_bgzf_header(header):
+                    break
+                end = position + int.from_bytes(header[16:18], 'little') + 1
+                window.fill(end)
+                yield position * 8, end * 8, window.get(position, end)
+                window.discard(end)
+                position = end
+            else:
+                return
+
+    def index_blocks(self, stream):
+        header = read_exactly(stream, _BGZF_HEADER_SIZE)
+        stream = reader(itertools.chain([header], iter_chunks(stream)))
+        if _is_bgzf_header(header):
+            return super().index_blocks(stream)
+
+        # the members of other files are found by decompressing them
+        blocks = []
+        start = position = 0
+        decompressor = zlib.decompressobj(31)
+        for data in iter_chunks(stream):
+            while data:
+                decompressor.decompress(data, CHUNK_SIZE)
+                if decompressor.eof:
+                    end = position + len(data) - len(decompressor.unused_data)
+                    blocks.append((start * 8, end * 8))
+                    start = position = end
+                    data = decompressor.unused_data
+                    decompressor = zlib.decompressobj(31)
+                else:
+                    position += len(data) - len(decompressor.unconsumed_tail)
+                    data = decompressor.unconsumed_tail
+        if position > start:
+            raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+        return blocks
+
+    def decompress_block(self, data, start_bit, end_bit):
+        return zlib.decompress(data, 31)
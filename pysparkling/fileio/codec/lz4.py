@@ -0,0 +1,82 @@
+try:
+    from lz4 import frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+from functools import partial
+from io import BytesIO
+import logging
+import os
+
+from ..prefetch import Prefetch
+from ..streams import decoded_reader, read_exactly, reader
+from .codec import Codec
+
+log = logging.getLogger(__name__)
+
+
+class Lz4(Codec):
+    """Implementation of :class:`.Codec` for LZ4 frame compression.
+
+    Needs the `lz4` module. Data is compressed in independent frames of
+    :attr:`frame_size` bytes in parallel threads. Concatenated frames are
+    read like a single one, also by the ``lz4`` command line tool. The
+    compression settings are class attributes, e.g. ``Lz4.level = 9``
+    applies to all lz4 files that are written.
+    """
+
+    splittable = False
+
+    #: Compression level. ``0`` is the fastest, levels from 3 to 16 use the
+    #: slower high compression mode.
+    level = 0
+
+    #: Number of compression threads. ``-1`` uses all CPUs and ``0``
+    #: compresses in the calling thread.
+    threads = -1
+
+    #: Uncompressed size of the frames that are compressed in parallel.
+    frame_size = 4 * 1024 * 1024
+
+    def __init__(self):
+        if lz4_frame is None:
+            log.warning('lz4 could not be imported. To read and write lz4 '
+                        'files, install the library with "pip install lz4". '
+                        'Not compressing streams.')
+        super().__init__()
+
+    def compress(self, stream):
+        if lz4_frame is None:
+            return Codec.compress(self, stream)
+
+        return BytesIO(b''.join(self.compress_chunks([stream.read()])))
+
+    def compress_chunks(self, chunks):
+        if lz4_frame is None:
+            yield from Codec.compress_chunks(self, chunks)
+            return
+
+        stream = reader(chunks)
+        frames = iter(lambda: read_exactly(stream, self.frame_size), b'')
+        threads = os.cpu_count() if self.threads == -1 else self.threads
+        # lz4 releases the GIL while it compresses
+        compress_frame = partial(lz4_frame.compress, compression_level=self.level)
+        empty = True
+        for compressed in Prefetch(depth=threads).map(compress_frame, frames):
+            empty = False
+            yield compressed
+        if empty:
+            yield compress_frame(b'')
+
+    def decompress_stream(self, stream):
+        if lz4_frame is None:
+            return Codec.decompress_stream(self, stream)
+
+        return decoded_reader(stream, lambda s: lz4_frame.LZ4FrameFile(s, mode='rb'))
+
+    def decompress(self, stream):
+        if lz4_frame is None:
+            return Codec.decompress(self, stream)
+
+        with lz4_frame.LZ4FrameFile(stream, mode='rb') as f:
+            return BytesIO(f.read())
@@ -2,6 +2,7 @@ from io import BytesIO
 import logging
 import lzma
 
+from ..streams import decoded_reader
 from .codec import Codec
 
 log = logging.getLogger(__name__)
@@ -13,6 +14,8 @@ class Lzma(Codec):
     Needs Python >= 3.3.
     """
 
+    splittable = False
+
     def __init__(self):
         if lzma is None:
             log.warning('LZMA codec not supported. It is only supported '
@@ -25,6 +28,24 @@ class Lzma(Codec):
 
         return BytesIO(lzma.compress(stream.read()))
 
+    def compress_chunks(self, chunks):
+        if lzma is None:
+            yield from Codec.compress_chunks(self, chunks)
+            return
+
+        compressor = lzma.LZMACompressor()
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def decompress_stream(self, stream):
+        if lzma is None:
+            return Codec.decompress_stream(self, stream)
+
+        return decoded_reader(stream, lzma.LZMAFile)
+
     def decompress(self, stream):
         if lzma is None:
             return Codec.decompress(self, stream)
@@ -17,6 +17,8 @@ class SevenZ(Codec):
     Needs the `pylzma` module.
     """
 
+    splittable = False
+
     def __init__(self):
         if py7zlib is None:
             log.warning('py7zlib could not be imported. To read 7z files, '
@@ -27,6 +29,18 @@ class SevenZ(Codec):
         log.warning('Writing of 7z compressed archives is not supported.')
         return stream
 
+    def compress_chunks(self, chunks):
+        log.warning('Writing of 7z compressed archives is not supported.')
+        return iter(chunks)
+
+    def decompress_stream(self, stream):
+        if py7zlib is None:
+            return Codec.decompress_stream(self, stream)
+
+        # py7zlib reads the complete archive
+        with stream:
+            return self.decompress(BytesIO(stream.read()))
+
     def decompress(self, stream):
         if py7zlib is None:
             return Codec.decompress(self, stream)
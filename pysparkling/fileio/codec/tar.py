@@ -1,15 +1,106 @@
 from io import BytesIO
 import logging
 import tarfile
+import tempfile
 
+from ..streams import iter_chunks, reader
 from .codec import Codec
 
 log = logging.getLogger(__name__)
 
+#: Members up to this size are spooled in memory, larger ones to disk.
+SPOOL_SIZE = 16 * 1024 * 1024
+
+
+def compress_chunks_to_tar(chunks, mode):
+    """Write chunks as a single member ``data`` of a tar archive.
+
+    The tar header contains the size of the member and :mod:`tarfile`
+    needs a seekable output, so input and output are spooled to temporary
+    files that only stay in memory while they are small.
+
+    :param chunks: Iterable of uncompressed ``bytes``.
+    :param str mode: Write mode for :func:`tarfile.open`, e.g. ``w:gz``.
+    :returns: Iterator of compressed ``bytes``.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool, \
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as compressed:
+        for chunk in chunks:
+            spool.write(chunk)
+
+        t = tarfile.TarInfo('data')
+        t.size = spool.tell()
+        spool.seek(0)
+        with tarfile.open(fileobj=compressed, mode=mode) as f:
+            f.addfile(t, spool)
+
+        compressed.seek(0)
+        yield from iter_chunks(compressed)
+
+
+def decompress_tar_stream(stream, mode):
+    """Read the files of a tar archive one after another.
+
+    :param stream: Readable file-like object. It does not need to be
+        seekable.
+    :param str mode: Stream read mode for :func:`tarfile.open`, e.g.
+        ``r|gz``.
+    :rtype: io.BufferedReader
+    """
+    def chunks():
+        with stream, tarfile.open(fileobj=stream, mode=mode) as f:
+            for tar_info in f:
+                if not tar_info.isfile():
+                    continue
+                yield from iter_chunks(f.extractfile(tar_info))
+
+    return reader(chunks())
+
+
+def _open_tar(stream, compression):
+    # seekable archives skip the data of members with seeks
+    separator = ':' if stream.seekable() else '|'
+    return tarfile.open(fileobj=stream, mode=f'r{separator}{compression}')
+
+
+def list_tar_members(stream, compression):
+    """List the files of a tar archive.
+
+    :param stream: Readable file-like object.
+    :param str compression: ``''``, ``'gz'`` or ``'bz2'``.
+    :returns: List of ``(name, size)``.
+    """
+    with stream, _open_tar(stream, compression) as f:
+        return [(tar_info.name, tar_info.size) for tar_info in f if tar_info.isfile()]
+
+
+def iter_tar_members(stream, compression, names):
+    """Extract some files of a tar archive.
+
+    :param stream: Readable file-like object.
+    :param str compression: ``''``, ``'gz'`` or ``'bz2'``.
+    :param names: Names of the members to extract.
+    :returns: Iterator of ``(name, stream)``.
+    """
+    remaining = set(names)
+    with stream, _open_tar(stream, compression) as f:
+        for tar_info in f:
+            if not remaining:
+                break
+            if not tar_info.isfile() or tar_info.name not in remaining:
+                continue
+
+            remaining.discard(tar_info.name)
+            with f.extractfile(tar_info) as member:
+                yield tar_info.name, member
+
 
 class Tar(Codec):
     """Implementation of :class:`.Codec` for tar compression."""
 
+    splittable = False
+    archive = True
+
     def compress(self, stream):
         compressed = BytesIO()
 
@@ -24,6 +115,18 @@ class Tar(Codec):
         compressed.seek(0)
         return compressed
 
+    def compress_chunks(self, chunks):
+        return compress_chunks_to_tar(chunks, 'w')
+
+    def decompress_stream(self, stream):
+        return decompress_tar_stream(stream, 'r|')
+
+    def list_members(self, stream):
+        return list_tar_members(stream, '')
+
+    def iter_members(self, stream, names):
+        return iter_tar_members(stream, '', names)
+
     def decompress(self, stream):
         uncompressed = BytesIO()
 
@@ -40,6 +143,9 @@ class Tar(Codec):
 class TarGz(Codec):
     """Implementation of :class:`.Codec` for .tar.gz compression."""
 
+    splittable = False
+    archive = True
+
     def compress(self, stream):
         compressed = BytesIO()
 
@@ -54,6 +160,18 @@ class TarGz(Codec):
         compressed.seek(0)
         return compressed
 
+    def compress_chunks(self, chunks):
+        return compress_chunks_to_tar(chunks, 'w:gz')
+
+    def decompress_stream(self, stream):
+        return decompress_tar_stream(stream, 'r|gz')
+
+    def list_members(self, stream):
+        return list_tar_members(stream, 'gz')
+
+    def iter_members(self, stream, names):
+        return iter_tar_members(stream, 'gz', names)
+
     def decompress(self, stream):
         uncompressed = BytesIO()
 
@@ -70,6 +188,9 @@ class TarGz(Codec):
 class TarBz2(Codec):
     """Implementation of :class:`.Codec` for .tar.bz2 compression."""
 
+    splittable = False
+    archive = True
+
     def compress(self, stream):
         compressed = BytesIO()
 
@@ -84,6 +205,18 @@ class TarBz2(Codec):
         compressed.seek(0)
         return compressed
 
+    def compress_chunks(self, chunks):
+        return compress_chunks_to_tar(chunks, 'w:bz2')
+
+    def decompress_stream(self, stream):
+        return decompress_tar_stream(stream, 'r|bz2')
+
+    def list_members(self, stream):
+        return list_tar_members(stream, 'bz2')
+
+    def iter_members(self, stream, names):
+        return iter_tar_members(stream, 'bz2', names)
+
     def decompress(self, stream):
         uncompressed = BytesIO()
 
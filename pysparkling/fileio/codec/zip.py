@@ -1,15 +1,47 @@
+from contextlib import ExitStack
 from io import BytesIO
 import logging
+import tempfile
 import zipfile
 
+from ..streams import ChunkWriter, iter_chunks, reader
 from .codec import Codec
 
 log = logging.getLogger(__name__)
 
 
+def _open_archive(stream):
+    """Open a zip archive in a stream that is not necessarily seekable.
+
+    The central directory is at the end, so zipfile needs to seek. Streams
+    that cannot seek are copied to a temporary file first.
+
+    :returns: ``(archive, resources)`` where closing the
+        :class:`contextlib.ExitStack` ``resources`` closes the archive, the
+        temporary file and ``stream``.
+    """
+    resources = ExitStack()
+    try:
+        resources.enter_context(stream)
+        if not stream.seekable():
+            spool = resources.enter_context(tempfile.TemporaryFile())
+            for chunk in iter_chunks(stream):
+                spool.write(chunk)
+            spool.seek(0)
+            stream = spool
+        archive = resources.enter_context(zipfile.ZipFile(file=stream, mode='r', allowZip64=True))
+    except BaseException:
+        resources.close()
+        raise
+    return archive, resources
+
+
 class Zip(Codec):
     """Implementation of :class:`.Codec` for zip compression."""
 
+    splittable = False
+    archive = True
+
     def compress(self, stream):
         compressed = BytesIO()
 
@@ -19,6 +51,50 @@ class Zip(Codec):
         compressed.seek(0)
         return compressed
 
+    def compress_chunks(self, chunks):
+        # zipfile writes data descriptors instead of seeking back to the
+        # local header when the output is not seekable
+        sink = ChunkWriter()
+        with zipfile.ZipFile(file=sink, mode='w', allowZip64=True) as f:
+            with f.open('data', mode='w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    compressed = sink.drain()
+                    if compressed:
+                        yield compressed
+        yield sink.drain()
+
+    def decompress_stream(self, stream):
+        archive, resources = _open_archive(stream)
+
+        def chunks():
+            try:
+                for f_name in archive.namelist():
+                    with archive.open(f_name) as member:
+                        yield from iter_chunks(member)
+            finally:
+                resources.close()
+
+        return reader(chunks())
+
+    def list_members(self, stream):
+        archive, resources = _open_archive(stream)
+        with resources:
+            return [(info.filename, info.file_size) for info in archive.infolist() if not info.is_dir()]
+
+    def iter_members(self, stream, names):
+        archive, resources = _open_archive(stream)
+
+        def members():
+            try:
+                for f_name in names:
+                    with archive.open(f_name) as member:
+                        yield f_name, member
+            finally:
+                resources.close()
+
+        return members()
+
     def decompress(self, stream):
         uncompressed = BytesIO()
 
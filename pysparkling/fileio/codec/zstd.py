@@ -0,0 +1,76 @@
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from io import BytesIO
+import logging
+
+from ..streams import decoded_reader, iter_chunks
+from .codec import Codec
+
+log = logging.getLogger(__name__)
+
+
+class Zstd(Codec):
+    """Implementation of :class:`.Codec` for Zstandard compression.
+
+    Needs the `zstandard` module. The compression settings are class
+    attributes, e.g. ``Zstd.level = 19`` applies to all zst files that
+    are written.
+    """
+
+    splittable = False
+
+    #: Compression level from 1 (fastest) to 22 (smallest).
+    level = 3
+
+    #: Number of compression threads. ``-1`` uses all CPUs and ``0``
+    #: compresses in the calling thread. Outputs are split into jobs of
+    #: several MiB, so small outputs use one thread anyway.
+    threads = -1
+
+    def __init__(self):
+        if zstandard is None:
+            log.warning('zstandard could not be imported. To read and write '
+                        'zst files, install the library with '
+                        '"pip install zstandard". Not compressing streams.')
+        super().__init__()
+
+    def _compressor(self):
+        return zstandard.ZstdCompressor(level=self.level, threads=self.threads)
+
+    def compress(self, stream):
+        if zstandard is None:
+            return Codec.compress(self, stream)
+
+        return BytesIO(self._compressor().compress(stream.read()))
+
+    def compress_chunks(self, chunks):
+        if zstandard is None:
+            yield from Codec.compress_chunks(self, chunks)
+            return
+
+        compressor = self._compressor().compressobj()
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def decompress_stream(self, stream):
+        if zstandard is None:
+            return Codec.decompress_stream(self, stream)
+
+        return decoded_reader(stream, lambda s: zstandard.ZstdDecompressor().stream_reader(
+            s, read_across_frames=True,
+        ))
+
+    def decompress(self, stream):
+        if zstandard is None:
+            return Codec.decompress(self, stream)
+
+        # frames written in chunks do not contain the content size that
+        # ZstdDecompressor.decompress() needs
+        decompressed = zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+        return BytesIO(b''.join(iter_chunks(decompressed)))
@@ -1,7 +1,8 @@
-from io import BytesIO
+import json
 import logging
 
-from . import codec, fs
+from . import codec, fs, prefetch
+from .streams import iter_chunks, read_exactly, reader, skip, StreamWindow
 
 log = logging.getLogger(__name__)
 
@@ -16,6 +17,7 @@ class File:
         self.file_name = file_name
         self.fs = fs.get_fs(file_name)(file_name)
         self.codec = codec.get_codec(file_name)()
+        self._block_splittable = None
 
     @staticmethod
     def resolve_filenames(all_expr):
@@ -28,6 +30,10 @@ class File:
             (i.e. ``my_data`` gets resolved to
             ``[my_data/part-00000, my_data/part-00001]``).
 
+        Directory listings go through
+        :data:`pysparkling.fileio.fs.listing.listing_cache`, which can keep
+        them for a configurable time.
+
         :returns: A list of file names.
         :rtype: list
         """
@@ -46,6 +52,9 @@ class File:
             A list of expressions.
             The expressions can contain the wildcard characters ``*`` and ``?``.
 
+        Directory listings are shared with :meth:`resolve_filenames` through
+        :data:`pysparkling.fileio.fs.listing.listing_cache`.
+
         :returns: A list of file names.
         :rtype: list
         """
@@ -63,32 +72,196 @@ class File:
         """
         return self.fs.exists()
 
-    def load(self):
-        """Load the data from a file.
+    def size(self):
+        """Size of the file in bytes as it is stored.
+
+        :returns: The size or ``None`` if it is unknown.
+        :rtype: int
+        """
+        return self.fs.size()
+
+    @property
+    def splittable(self):
+        """Whether the file can be read in independent byte ranges."""
+        return self.codec.splittable
+
+    def load(self, read_ahead=0, start=0):
+        """Open the file and decompress it while it is read.
 
-        :rtype: io.BytesIO
+        The returned file object should be closed after use (e.g. in a
+        ``with`` statement).
+
+        :param int read_ahead: (optional) Number of bytes to read ahead in
+            a background thread. Local files are always read directly.
+        :param int start: (optional) Offset in the decompressed data to
+            start at. Splittable files are opened at the offset, e.g. with
+            an HTTP range request, and others are read up to it.
+        :returns: Readable file-like object. It is not necessarily seekable.
         """
-        stream = self.fs.load()
-        stream = self.codec.decompress(stream)
+        if start and self.splittable:
+            stream = self.fs.load_stream_from(start)
+        else:
+            stream = self.fs.load_stream()
+        if read_ahead and not isinstance(self.fs, fs.Local):
+            stream = prefetch.read_ahead(stream, read_ahead)
+        stream = self.codec.decompress_stream(stream)
+
+        if start and not self.splittable:
+            skip(stream, start)
         return stream
 
+    @property
+    def block_splittable(self):
+        """Whether byte ranges of the compressed file can be read separately.
+
+        This is the case for bzip2 and BGZF files and for gzip files with
+        several members that have an index from :meth:`build_block_index`.
+        """
+        if self._block_splittable is None:
+            self._block_splittable = False
+            if self.codec.has_blocks:
+                if self.block_index() is not None:
+                    self._block_splittable = True
+                else:
+                    with self.fs.load_stream() as stream:
+                        self._block_splittable = self.codec.block_splittable(read_exactly(stream, 18))
+        return self._block_splittable
+
+    @property
+    def block_index_name(self):
+        """File name of the block index of this file.
+
+        The index is a hidden file next to this one.
+        """
+        head, sep, tail = self.file_name.rpartition('/')
+        return f'{head}{sep}.{tail}.blocks'
+
+    def block_index(self):
+        """Read the block index of this file.
+
+        :returns: List of ``(start_bit, end_bit)`` of the blocks or ``None``
+            if there is no index or it belongs to a file of another size.
+        """
+        index_file = File(self.block_index_name)
+        if not index_file.exists():
+            return None
+
+        with index_file.load() as stream:
+            index = json.loads(stream.read().decode('utf8'))
+        if index['size'] != self.size():
+            log.warning('Ignoring block index of %s created for another version.', self.file_name)
+            return None
+        return [tuple(block) for block in index['blocks']]
+
+    def build_block_index(self, persist=True):
+        """Find the blocks of a gzip or bzip2 file.
+
+        This scans the complete file and decompresses gzip files that are
+        not BGZF files. The index allows to read the byte ranges of gzip
+        files with several members (e.g. from ``pigz --independent`` or
+        concatenated files) separately and saves scanning the byte ranges of
+        other files.
+
+        :param bool persist: Write the index to :attr:`block_index_name`,
+            where it is used by later reads of this file.
+        :returns: List of ``(start_bit, end_bit)`` of the blocks.
+        """
+        if not self.codec.has_blocks:
+            raise ValueError(f'{type(self.codec).__name__} files do not have blocks.')
+
+        with self.fs.load_stream() as stream:
+            blocks = self.codec.index_blocks(stream)
+        if persist:
+            index = {'size': self.size(), 'blocks': blocks}
+            File(self.block_index_name).dump(json.dumps(index).encode('utf8'))
+            self._block_splittable = None
+        return blocks
+
+    def load_blocks(self, start=0, end=None, read_ahead=0):
+        """Decompress the blocks that begin in a byte range.
+
+        The blocks after the range follow, so that records that continue
+        beyond the range can be completed. Blocks are decompressed when the
+        iterator is advanced.
+
+        :param int start: Offset in the file.
+        :param int end: Offset in the file or ``None`` for the end.
+        :param int read_ahead: (optional) See :meth:`load`.
+        :returns: Iterator of ``(in_range, data)`` for every block.
+        """
+        index = self.block_index()
+        if index is not None:
+            index = [block for block in index if block[0] >= start * 8]
+            if not index:
+                return
+            start = index[0][0] // 8
+
+        stream = self.fs.load_stream_from(start)
+        if read_ahead and not isinstance(self.fs, fs.Local):
+            stream = prefetch.read_ahead(stream, read_ahead)
+
+        with stream:
+            if index is not None:
+                blocks = _iter_indexed_blocks(stream, start, index)
+            else:
+                blocks = self.codec.iter_blocks(stream, start)
+            for start_bit, end_bit, data in blocks:
+                yield (end is None or start_bit < end * 8,
+                       self.codec.decompress_block(data, start_bit, end_bit))
+
+    def members(self):
+        """List the files in an archive like a tar or zip file.
+
+        :returns: List of ``(name, size)`` in the order of the archive or
+            ``None`` if the file is not an archive.
+        :rtype: list
+        """
+        if not self.codec.archive:
+            return None
+        return self.codec.list_members(self.fs.load_stream())
+
+    def load_members(self, names):
+        """Extract files from an archive in one pass.
+
+        Only the requested members are decompressed where the format allows
+        it. Every member can only be read until the next one is requested.
+
+        :param names: Names of the members in the order of the archive.
+        :returns: Iterator of ``(name, stream)``.
+        """
+        return self.codec.iter_members(self.fs.load_stream(), names)
+
+    def load_mmap(self):
+        """Memory-map an uncompressed file.
+
+        The data is read by the OS through its page cache when it is
+        accessed instead of being read into a buffer up front. Slicing the
+        map still copies the slice.
+
+        :returns: A read-only :class:`mmap.mmap` that should be closed after
+            use or ``None`` if the file is compressed or the file system does
+            not support it.
+        """
+        if type(self.codec) not in (codec.Codec, codec.NoCodec):
+            return None
+        return self.fs.load_mmap()
+
     def dump(self, stream=None):
         """Writes a stream to a file.
 
+        The data is compressed and passed to the file system in chunks, so
+        it does not need to fit in memory.
+
         :param stream:
-            A BytesIO instance. ``bytes`` are also possible and are converted
-            to BytesIO.
+            A BytesIO instance. ``bytes`` and iterables of ``bytes`` are
+            also possible.
 
         :rtype: File
         """
         if stream is None:
-            stream = BytesIO()
-
-        if isinstance(stream, bytes):
-            stream = BytesIO(stream)
+            stream = b''
 
-        stream = self.codec.compress(stream)
-        self.fs.dump(stream)
+        self.fs.dump(reader(self.codec.compress_chunks(iter_chunks(stream))))
 
         return self
 
@@ -100,3 +273,12 @@ class File:
         """
         self.fs.make_public(recursive)
         return self
+
+
+def _iter_indexed_blocks(stream, offset, blocks):
+    window = StreamWindow(stream, offset)
+    for start_bit, end_bit in blocks:
+        start, end = start_bit // 8, (end_bit + 7) // 8
+        window.fill(end)
+        yield start_bit, end_bit, window.get(start, end)
+        window.discard(end_bit // 8)
@@ -0,0 +1,86 @@
+"""Pickle files as a sequence of length-framed batches.
+
+A file starts with :data:`MAGIC` followed by frames. Every frame is the
+length of the payload as a little-endian unsigned 64 bit integer and the
+payload, a pickled list of records. The framing allows to read a file batch
+by batch and to find the frames in a byte range without unpickling anything.
+"""
+import pickle
+import struct
+
+from .streams import skip
+
+MAGIC = b'PYSPKL\x00\x01'
+
+_LENGTH = struct.Struct('<Q')
+
+#: Target size of a pickled batch when the batch size is chosen automatically.
+AUTO_BATCH_BYTES = 1 << 16
+
+
+def dump_batches(iterator, batchSize=10):
+    """Pickle records in frames of ``batchSize`` records.
+
+    :param iterator: Iterable of records.
+    :param int batchSize: Number of records per batch. With ``0``, the batch
+        size grows until the pickled batches are about
+        :data:`AUTO_BATCH_BYTES` large.
+    :returns: Iterator of ``bytes``.
+    """
+    yield MAGIC
+
+    auto = batchSize < 1
+    size = 1 if auto else batchSize
+    iterator = iter(iterator)
+    while True:
+        batch = [record for _, record in zip(range(size), iterator)]
+        if not batch:
+            break
+
+        payload = pickle.dumps(batch)
+        yield _LENGTH.pack(len(payload)) + payload
+
+        if auto:
+            if len(payload) < AUTO_BATCH_BYTES:
+                size *= 2
+            elif len(payload) > AUTO_BATCH_BYTES * 10 and size > 1:
+                size //= 2
+
+
+def load_batches(stream, start=0, end=None):
+    """Unpickle the batches of a file one at a time.
+
+    Only the frames whose header begins in the byte range ``[start, end)``
+    are unpickled, which allows to split a file at arbitrary offsets. Files
+    written with a single :func:`pickle.dump` call are returned as one batch
+    in the range that contains the beginning of the file.
+
+    :param stream: Readable file-like object positioned at the beginning.
+    :param int start: Offset in the file.
+    :param int end: Offset in the file or ``None`` for the end of the file.
+    :returns: Iterator of lists of records.
+    """
+    header = stream.read(len(MAGIC))
+    if header != MAGIC:
+        if start == 0:
+            yield pickle.loads(header + stream.read())
+        return
+
+    offset = len(MAGIC)
+    while end is None or offset < end:
+        prefix = stream.read(_LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) < _LENGTH.size:
+            raise EOFError('Truncated frame header in pickle file.')
+        length = _LENGTH.unpack(prefix)[0]
+
+        if offset >= start:
+            payload = stream.read(length)
+            if len(payload) < length:
+                raise EOFError('Truncated frame in pickle file.')
+            yield pickle.loads(payload)
+        else:
+            skip(stream, length)
+
+        offset += _LENGTH.size + length
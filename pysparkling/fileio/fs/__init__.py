@@ -2,10 +2,11 @@ from .file_system import FileSystem
 from .gs import GS
 from .hdfs import Hdfs
 from .http import Http
+from .listing import listing_cache, ListingCache
 from .local import Local
 from .s3 import S3
 
-__all__ = ['FileSystem', 'GS', 'Hdfs', 'Http', 'Local', 'S3']
+__all__ = ['FileSystem', 'GS', 'Hdfs', 'Http', 'ListingCache', 'Local', 'S3', 'listing_cache']
 
 
 FILE_EXTENSIONS = [
@@ -1,5 +1,7 @@
 import logging
 
+from ..streams import skip
+
 log = logging.getLogger(__name__)
 
 
@@ -34,6 +36,14 @@ class FileSystem:
         """
         log.warning('Could not determine whether %s exists due to unhandled scheme.', self.file_name)
 
+    def size(self):
+        """Size of the file in bytes.
+
+        :returns: The size or ``None`` if it is unknown.
+        :rtype: int
+        """
+        return None
+
     def load(self):
         """Load a file to a stream.
 
@@ -41,6 +51,36 @@ class FileSystem:
         """
         log.error('Cannot load: %s', self.file_name)
 
+    def load_stream(self):
+        """Open a file for reading without loading it into memory.
+
+        File systems that cannot stream fall back to :meth:`load`.
+
+        :returns: Readable file-like object. It is not necessarily seekable.
+        """
+        return self.load()
+
+    def load_stream_from(self, start):
+        """Open a file for reading from byte ``start`` on.
+
+        File systems that cannot request a range read and discard the
+        data before ``start``.
+
+        :param int start: Offset in the file.
+        :returns: Readable file-like object. It is not necessarily seekable.
+        """
+        stream = self.load_stream()
+        skip(stream, start)
+        return stream
+
+    def load_mmap(self):
+        """Memory-map the file.
+
+        :returns: A read-only :class:`mmap.mmap` or ``None`` if the file
+            system does not support it.
+        """
+        return None
+
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
         """Load a file to a stream.
 
@@ -54,7 +94,8 @@ class FileSystem:
     def dump(self, stream):
         """Dump a stream to a file.
 
-        :param io.BytesIO stream: Input tream.
+        :param stream: A readable file-like object. It is not necessarily
+            seekable.
         """
         log.error('Cannot dump: %s', self.file_name)
 
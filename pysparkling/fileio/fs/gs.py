@@ -1,10 +1,13 @@
 from fnmatch import fnmatch
+import inspect
 from io import BytesIO, StringIO
 import logging
 
 from ...exceptions import FileSystemNotSupported
 from ...utils import parse_file_uri, Tokenizer
+from ..streams import ChunkWriter, reader, skip
 from .file_system import FileSystem
+from .listing import listing_cache
 
 log = logging.getLogger(__name__)
 
@@ -19,6 +22,10 @@ class GS(FileSystem):
 
     Paths are of the form `gs://bucket_name/file_path` or
     `gs://project_name:bucket_name/file_path`.
+
+    Blobs are downloaded in ranges of :attr:`chunk_size` if the client
+    library supports ranged downloads and uploaded with resumable uploads of
+    the same chunk size.
     """
 
     #: Set a default project name.
@@ -27,6 +34,10 @@ class GS(FileSystem):
     #: Default mime type.
     mime_type = 'text/plain'
 
+    #: Size of download ranges and upload chunks in bytes. Uploads require a
+    #: multiple of 256 KiB.
+    chunk_size = 8 * 1024 * 1024
+
     _clients = {}
 
     def __init__(self, file_name):
@@ -79,11 +90,18 @@ class GS(FileSystem):
         bucket = GS._get_client(project_name).get_bucket(bucket_name)
         expr_s = len(scheme) + 3 + len(project_name) + 1 + len(bucket_name) + 1
         expr = expr[expr_s:]
-        for k in bucket.list_blobs(prefix=prefix):
-            if fnmatch(k.name, expr) or fnmatch(k.name, expr + '/part*'):
-                files.append(f'{scheme}://{project_name}:{bucket_name}/{k.name}')
+        for name in GS._list_blobs(project_name, bucket, bucket_name, prefix):
+            if fnmatch(name, expr) or fnmatch(name, expr + '/part*'):
+                files.append(f'{scheme}://{project_name}:{bucket_name}/{name}')
         return files
 
+    @staticmethod
+    def _list_blobs(project_name, bucket, bucket_name, prefix):
+        return listing_cache.get(
+            ('gs', project_name, bucket_name, prefix),
+            lambda: [k.name for k in bucket.list_blobs(prefix=prefix)],
+        )
+
     @staticmethod
     def resolve_content(expr):
         scheme, raw_bucket_name, folder_path, pattern = parse_file_uri(expr)
@@ -103,12 +121,12 @@ class GS(FileSystem):
         bucket = GS._get_client(project_name).get_bucket(bucket_name)
 
         files = []
-        for k in bucket.list_blobs(prefix=folder_path):
-            if not k.name.endswith("/") and (
-                    fnmatch(k.name, expr) or fnmatch(k.name, pattern_expr)
+        for name in GS._list_blobs(project_name, bucket, bucket_name, folder_path):
+            if not name.endswith("/") and (
+                    fnmatch(name, expr) or fnmatch(name, pattern_expr)
             ):
                 files.append(
-                    f'{scheme}://{raw_bucket_name}/{k.name}'
+                    f'{scheme}://{raw_bucket_name}/{name}'
                 )
         return files
 
@@ -125,10 +143,52 @@ class GS(FileSystem):
         return (bucket.get_blob(blob_name)
                 or list(bucket.list_blobs(prefix=f'{blob_name}/')))
 
+    def size(self):
+        return self.blob.size
+
     def load(self):
         log.debug('Loading %s with size %s.', self.blob.name, self.blob.size)
         return BytesIO(self.blob.download_as_string())
 
+    def load_stream(self):
+        return self.load_stream_from(0)
+
+    def load_stream_from(self, start):
+        log.debug('Streaming %s with size %s from %s.', self.blob.name, self.blob.size, start)
+        size = self.blob.size
+        download_range = self._range_downloader()
+        if size is None or download_range is None:
+            if download_range is None:
+                log.warning('The installed client library cannot download ranges, '
+                            'downloading all of %s.', self.blob.name)
+            stream = self.load()
+            skip(stream, start)
+            return stream
+
+        def chunks():
+            for chunk_start in range(start, size, self.chunk_size):
+                yield download_range(chunk_start, min(chunk_start + self.chunk_size, size) - 1)
+
+        return reader(chunks())
+
+    def _range_downloader(self):
+        """Return a function that downloads the bytes from start to end
+        inclusive or ``None`` if the blob has no ranged downloads."""
+        download_as_bytes = getattr(self.blob, 'download_as_bytes', None)
+        if download_as_bytes is not None and 'start' in inspect.signature(download_as_bytes).parameters:
+            return lambda start, end: download_as_bytes(start=start, end=end)
+
+        if 'start' not in inspect.signature(self.blob.download_to_file).parameters:
+            return None
+
+        writer = ChunkWriter()
+
+        def download_range(start, end):
+            self.blob.download_to_file(writer, start=start, end=end)
+            return writer.drain()
+
+        return download_range
+
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
         log.debug('Loading %s with size %s.', self.blob.name, self.blob.size)
         return StringIO(
@@ -139,8 +199,9 @@ class GS(FileSystem):
 
     def dump(self, stream):
         log.debug('Dumping to %s.', self.blob.name)
-        self.blob.upload_from_string(stream.read(),
-                                     content_type=self.mime_type)
+        # with a chunk size and no known size, gcloud uses a resumable upload
+        self.blob.chunk_size = self.chunk_size
+        self.blob.upload_from_file(stream, content_type=self.mime_type)
         return self
 
     def make_public(self, recursive=False):
@@ -4,7 +4,9 @@ import logging
 
 from ...exceptions import FileSystemNotSupported
 from ...utils import format_file_uri, parse_file_uri
+from ..streams import CHUNK_SIZE, iter_chunks, reader
 from .file_system import FileSystem
+from .listing import listing_cache
 
 log = logging.getLogger(__name__)
 
@@ -48,6 +50,13 @@ class Hdfs(FileSystem):
             )
         return Hdfs._conn[cache_id], folder_path + file_pattern
 
+    @staticmethod
+    def _list(c, domain, path):
+        return listing_cache.get(
+            ('hdfs', domain, path),
+            lambda: c.list(path, status=True),
+        )
+
     def exists(self):
         c, p = Hdfs.client_and_path(self.file_name)
         try:
@@ -63,7 +72,7 @@ class Hdfs(FileSystem):
         scheme, domain, folder_path, _ = parse_file_uri(expr)
 
         files = []
-        for fn, file_status in c.list(folder_path, status=True):
+        for fn, file_status in Hdfs._list(c, domain, folder_path):
             file_local_path = f'{folder_path}{fn}'
             file_path = format_file_uri(scheme, domain, file_local_path)
             part_file_expr = expr + ("" if expr.endswith("/") else "/") + 'part*'
@@ -86,7 +95,7 @@ class Hdfs(FileSystem):
     @staticmethod
     def _get_folder_part_files(c, scheme, domain, folder_local_path, expr_with_part):
         files = []
-        for fn, file_status in c.list(folder_local_path, status=True):
+        for fn, file_status in Hdfs._list(c, domain, folder_local_path):
             sub_file_path = format_file_uri(scheme, domain, folder_local_path, fn)
             if fnmatch(sub_file_path, expr_with_part) and file_status["type"] != "DIRECTORY":
                 files.append(sub_file_path)
@@ -106,7 +115,7 @@ class Hdfs(FileSystem):
         :return: list of matching files absolute paths prefixed with the scheme and domain
         """
         file_paths = []
-        for fn, file_status in c.list(folder_path, status=True):
+        for fn, file_status in cls._list(c, domain, folder_path):
             file_local_path = f'{folder_path}{fn}'
             if expr is None or fnmatch(file_local_path, expr):
                 if file_status["type"] == "DIRECTORY":
@@ -136,26 +145,36 @@ class Hdfs(FileSystem):
 
         return cls._get_folder_files_by_expr(c, scheme, domain, folder_path, expr)
 
+    def size(self):
+        c, p = Hdfs.client_and_path(self.file_name)
+        return c.status(p)['length']
+
     def load(self):
         log.debug('Hdfs read for %s.', self.file_name)
+        with self.load_stream() as stream:
+            return BytesIO(stream.read())
+
+    def load_stream(self):
+        return self.load_stream_from(0)
+
+    def load_stream_from(self, start):
+        log.debug('Hdfs streaming read for %s from %s.', self.file_name, start)
         c, path = Hdfs.client_and_path(self.file_name)
 
-        with c.read(path) as reader:
-            r = BytesIO(reader.read())
+        def chunks():
+            with c.read(path, offset=start, chunk_size=CHUNK_SIZE) as data:
+                yield from data
 
-        return r
+        return reader(chunks())
 
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
         log.debug('Hdfs text read for %s.', self.file_name)
-        c, path = Hdfs.client_and_path(self.file_name)
-
-        with c.read(path) as reader:
-            r = StringIO(reader.read().decode(encoding, encoding_errors))
-
-        return r
+        with self.load_stream() as stream:
+            return StringIO(stream.read().decode(encoding, encoding_errors))
 
     def dump(self, stream):
         log.debug('Dump to %s with hdfs write.', self.file_name)
         c, path = Hdfs.client_and_path(self.file_name)
-        c.write(path, stream)
+        # a generator is uploaded in chunks, file objects would be iterated by line
+        c.write(path, iter_chunks(stream))
         return self
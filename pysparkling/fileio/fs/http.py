@@ -1,19 +1,36 @@
 from io import BytesIO, StringIO
 import logging
+import os
+import threading
 
 from ...exceptions import ConnectionException, FileSystemNotSupported
+from ..streams import iter_chunks, skip
 from .file_system import FileSystem
 
 log = logging.getLogger(__name__)
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     requests = None
 
+_session_lock = threading.Lock()
+_session = None
+_session_pid = None
+
 
 class Http(FileSystem):
-    """:class:`.FileSystem` implementation for HTTP."""
+    """:class:`.FileSystem` implementation for HTTP.
+
+    All requests of a process share a :class:`requests.Session`, so
+    connections are reused instead of being opened for every file. Byte
+    ranges are requested with ``Range`` headers, which allows to split large
+    files into partitions.
+    """
+
+    #: Maximum number of connections that are kept open per host.
+    pool_maxsize = 32
 
     def __init__(self, file_name):
         if requests is None:
@@ -24,6 +41,25 @@ class Http(FileSystem):
         super().__init__(file_name)
         self.headers = None
 
+    @classmethod
+    def session(cls):
+        """The session of the current process.
+
+        A forked process creates its own session as connections cannot be
+        shared between processes.
+
+        :rtype: requests.Session
+        """
+        global _session, _session_pid  # pylint: disable=global-statement
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                _session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=cls.pool_maxsize)
+                _session.mount('http://', adapter)
+                _session.mount('https://', adapter)
+                _session_pid = os.getpid()
+            return _session
+
     @staticmethod
     def resolve_filenames(expr):
         if Http(expr).exists():
@@ -31,25 +67,52 @@ class Http(FileSystem):
         return []
 
     def exists(self):
-        r = requests.head(self.file_name, allow_redirects=True)
+        r = self.session().head(self.file_name, allow_redirects=True)
         return r.status_code == 200
 
+    def size(self):
+        r = self.session().head(self.file_name, allow_redirects=True)
+        if r.status_code != 200 or 'Content-Length' not in r.headers:
+            return None
+        if r.headers.get('Content-Encoding', 'identity') != 'identity':
+            # the length of the encoded body, not of the file
+            return None
+        return int(r.headers['Content-Length'])
+
     def load(self):
-        log.debug('Http GET request for %s.', self.file_name)
-        r = requests.get(self.file_name, headers=self.headers)
-        if r.status_code != 200:
+        with self.load_stream() as stream:
+            return BytesIO(stream.read())
+
+    def load_stream(self):
+        return self.load_stream_from(0)
+
+    def load_stream_from(self, start):
+        log.debug('Http streaming GET request for %s from %s.', self.file_name, start)
+        headers = dict(self.headers or {})
+        if start:
+            headers.update({'Range': f'bytes={start}-', 'Accept-Encoding': 'identity'})
+
+        r = self.session().get(self.file_name, headers=headers, stream=True)
+        if r.status_code not in (200, 206):
+            r.close()
             raise ConnectionException()
-        return BytesIO(r.content)
+        r.raw.decode_content = True
+
+        if start and r.status_code == 200:
+            log.debug('%s does not support ranges, skipping %s bytes.', self.file_name, start)
+            skip(r.raw, start)
+        return r.raw
 
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
         # warning: encoding and encoding_errors are ignored
         log.debug('Http GET request for %s.', self.file_name)
-        r = requests.get(self.file_name, headers=self.headers)
+        r = self.session().get(self.file_name, headers=self.headers)
         if r.status_code != 200:
             raise ConnectionException()
         return StringIO(r.text)
 
     def dump(self, stream):
         log.debug('Dump to %s with http PUT.', self.file_name)
-        requests.put(self.file_name, data=b''.join(stream))
+        # requests sends iterators with chunked transfer encoding
+        self.session().put(self.file_name, data=iter_chunks(stream))
         return self
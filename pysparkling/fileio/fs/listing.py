@@ -0,0 +1,69 @@
+"""Cache of directory listings."""
+from collections import OrderedDict
+import threading
+import time
+
+__all__ = ['ListingCache', 'listing_cache']
+
+
+class ListingCache:
+    """Keeps directory listings for a limited time.
+
+    Resolving file name patterns lists directories, which is slow on large
+    trees and remote file systems, and streaming file sources repeat it on
+    every batch. With a ``ttl``, listings are reused for that many seconds.
+    New files are then only seen once the listing expired.
+
+    :param float ttl: Time to live of a listing in seconds. ``None`` or
+        ``0`` disable the cache.
+    :param int max_entries: Maximum number of listings that are kept.
+
+    >>> from pysparkling.fileio.fs.listing import ListingCache
+    >>> cache = ListingCache(ttl=60)
+    >>> cache.get('dir', lambda: ['a', 'b'])
+    ('a', 'b')
+    >>> cache.get('dir', lambda: ['a', 'b', 'c'])
+    ('a', 'b')
+    """
+
+    def __init__(self, ttl=None, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, list_fn):
+        """Return the cached listing for ``key`` or create it.
+
+        :param key: Hashable key that identifies the directory.
+        :param list_fn: Function that lists the directory.
+        :rtype: tuple
+        """
+        if not self.ttl:
+            return tuple(list_fn())
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+
+        listing = tuple(list_fn())
+        with self._lock:
+            self._entries[key] = (now, listing)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return listing
+
+    def invalidate(self, key=None):
+        """Remove the listing of ``key`` or all listings."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+#: Cache used by all file systems. Enable it with ``listing_cache.ttl = 10``.
+listing_cache = ListingCache()
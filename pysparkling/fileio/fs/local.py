@@ -1,17 +1,27 @@
 from fnmatch import fnmatch
-import glob
 import io
 import logging
+import mmap
 import os
+import re
+import shutil
 
-from ...utils import Tokenizer
 from .file_system import FileSystem
+from .listing import listing_cache
 
 log = logging.getLogger(__name__)
 
+_MAGIC = re.compile('[*?[]')
+
 
 class Local(FileSystem):
-    """:class:`.FileSystem` implementation for the local file system."""
+    """:class:`.FileSystem` implementation for the local file system.
+
+    Directories are listed through the listing cache and only where the
+    pattern can match: components before the first ``*`` are matched one
+    at a time, so for ``logs/2024-0?/*.gz`` only the matching month
+    directories are searched.
+    """
 
     @staticmethod
     def resolve_filenames(expr: str):
@@ -28,38 +38,116 @@ class Local(FileSystem):
         if not any(sep in expr for sep in os_sep):
             expr = '.' + os.path.sep + expr
 
-        t = Tokenizer(expr)
-        prefix = t.get_next(['*', '?'])
-
-        if not any(prefix.endswith(sep) for sep in os_sep) and any(sep in prefix for sep in os_sep):
-            prefix = os.path.dirname(prefix)
+        # ``*`` can match across separators, so everything below the
+        # directories that match the components before it is a candidate
+        star = expr.find('*')
+        if star < 0:
+            heads = Local._glob(expr)
+        else:
+            head_end = max(expr.rfind(sep, 0, star) for sep in os_sep)
+            if head_end < 0:
+                heads = [('', True)]
+            else:
+                heads = Local._glob(expr[:head_end] or expr[0])
 
         files = []
-        for root, _, filenames in os.walk(prefix):
-            for filename in filenames:
-                path = os.path.join(root, filename)
-                if fnmatch(path, expr) or fnmatch(path, expr + '/part*'):
-                    files.append(path)
+        for path, is_dir in heads:
+            candidates = Local._walk_files(path, include_hidden=True) if is_dir else [path]
+            files += [candidate for candidate in candidates
+                      if fnmatch(candidate, expr) or fnmatch(candidate, expr + '/part*')]
         return files
 
     @staticmethod
     def resolve_content(expr):
         if expr.startswith('file://'):
             expr = expr[7:]
-        matches = glob.glob(expr)
+
         file_paths = []
-        for match in matches:
-            if os.path.isfile(match):
-                file_paths.append(match)
+        for path, is_dir in Local._glob(expr, include_hidden=False):
+            if not is_dir:
+                file_paths.append(path)
             else:
-                file_paths += [
-                    os.path.join(root, f)
-                    for root, _, files in os.walk(match)
-                    for f in files
-                    if not f.startswith(("_", "."))
-                ]
+                file_paths += Local._walk_files(path, include_hidden=False)
         return file_paths
 
+    @staticmethod
+    def _list_dir(path):
+        """List a directory through the listing cache.
+
+        :returns: Sorted ``(name, is_dir, is_link)`` triples. ``is_dir``
+            follows symbolic links.
+        :rtype: tuple
+        """
+        def list_dir():
+            try:
+                with os.scandir(path) as entries:
+                    return sorted((e.name, e.is_dir(), e.is_symlink()) for e in entries)
+            except (FileNotFoundError, NotADirectoryError):
+                return []
+
+        return listing_cache.get(('file', os.path.abspath(path)), list_dir)
+
+    @staticmethod
+    def _glob(expr, include_hidden=True):
+        """Match a pattern one path component at a time.
+
+        :param bool include_hidden: Whether wildcards match names that
+            start with ``.``.
+        :returns: List of ``(path, is_dir)``.
+        """
+        magic = _MAGIC.search(expr)
+        if magic is None:
+            if os.path.isdir(expr):
+                return [(expr, True)]
+            if os.path.exists(expr):
+                return [(expr, False)]
+            return []
+
+        seps = os.path.sep + (os.path.altsep or '')
+        base_end = max(expr.rfind(sep, 0, magic.start()) for sep in seps)
+        if base_end < 0:
+            matches, components = [('', True)], expr
+        else:
+            matches, components = [(expr[:base_end] or expr[0], True)], expr[base_end + 1:]
+
+        for component in re.split(f'[{re.escape(seps)}]', components):
+            if not component:
+                # trailing or repeated separator
+                matches = [(path, is_dir) for path, is_dir in matches if is_dir]
+                continue
+
+            has_magic = _MAGIC.search(component) is not None
+            matches = [
+                (os.path.join(path, name) if path else name, name_is_dir)
+                for path, is_dir in matches if is_dir
+                for name, name_is_dir, _ in Local._list_dir(path or os.curdir)
+                if (fnmatch(name, component) if has_magic else name == component)
+                and (include_hidden or not has_magic
+                     or not name.startswith('.') or component.startswith('.'))
+            ]
+        return matches
+
+    @staticmethod
+    def _walk_files(path, include_hidden):
+        """All files under a directory.
+
+        Like ``os.walk()``, symbolic links to directories are not followed.
+
+        :param str path: Directory or ``''`` for the working directory.
+        :param bool include_hidden: Whether to include files that start
+            with ``_`` or ``.``.
+        :rtype: list
+        """
+        files = []
+        for name, is_dir, is_link in Local._list_dir(path or os.curdir):
+            name_path = os.path.join(path, name) if path else name
+            if is_dir:
+                if not is_link:
+                    files += Local._walk_files(name_path, include_hidden)
+            elif include_hidden or not name.startswith(('_', '.')):
+                files.append(name_path)
+        return files
+
     @property
     def file_path(self):
         if self.file_name.startswith('file://'):
@@ -69,10 +157,28 @@ class Local(FileSystem):
     def exists(self):
         return os.path.exists(self.file_path)
 
+    def size(self):
+        return os.path.getsize(self.file_path)
+
     def load(self):
         with io.open(self.file_path, 'rb') as f:
             return io.BytesIO(f.read())
 
+    def load_stream(self):
+        return io.open(self.file_path, 'rb')
+
+    def load_stream_from(self, start):
+        stream = self.load_stream()
+        stream.seek(start)
+        return stream
+
+    def load_mmap(self):
+        with io.open(self.file_path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                # empty files cannot be mapped
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
         with io.open(self.file_path, 'r',
                      encoding=encoding, errors=encoding_errors) as f:
@@ -89,6 +195,5 @@ class Local(FileSystem):
 
         log.debug('writing file %s', file_path)
         with io.open(file_path, 'wb') as f:
-            for c in stream:
-                f.write(c)
+            shutil.copyfileobj(stream, f)
         return self
@@ -1,15 +1,22 @@
 from fnmatch import fnmatch
+from functools import partial
 from io import BytesIO, StringIO
+import itertools
 import logging
+import threading
 
 from ...exceptions import FileSystemNotSupported
 from ...utils import parse_file_uri, Tokenizer
+from ..prefetch import Prefetch
+from ..streams import CHUNK_SIZE, read_exactly, reader, skip
 from .file_system import FileSystem
+from .listing import listing_cache
 
 log = logging.getLogger(__name__)
 
 try:
     import boto
+    from boto.s3.multipart import MultiPartUpload
 except ImportError:
     boto = None
 
@@ -20,13 +27,25 @@ class S3(FileSystem):
     Use environment variables ``AWS_SECRET_ACCESS_KEY`` and
     ``AWS_ACCESS_KEY_ID`` for auth and use file paths of the form
     ``s3://bucket_name/filename.txt``.
+
+    Objects larger than :attr:`part_size` are downloaded with parallel
+    ranged GETs and uploaded with parallel multipart uploads, using up to
+    :attr:`max_concurrency` connections.
     """
 
     #: Keyword arguments for new connections.
     #: Example: set to `{'anon': True}` for anonymous connections.
     connection_kwargs = {}
 
+    #: Size of the parts of ranged downloads and multipart uploads in bytes.
+    #: S3 requires at least 5 MiB and allows up to 10000 parts.
+    part_size = 8 * 1024 * 1024
+
+    #: Maximum number of parts that are transferred at the same time.
+    max_concurrency = 8
+
     _conn = None
+    _thread_conns = threading.local()
 
     def __init__(self, file_name):
         if boto is None:
@@ -34,25 +53,40 @@ class S3(FileSystem):
 
         super().__init__(file_name)
 
-        # obtain key
         t = Tokenizer(self.file_name)
         t.get_next('://')  # skip scheme
-        bucket_name = t.get_next('/')
-        key_name = t.get_next()
-        conn = self._get_conn()
-        bucket = conn.get_bucket(bucket_name, validate=False)
-        self.key = bucket.get_key(key_name)
-        if not self.key:
-            self.key = bucket.new_key(key_name)
+        self.bucket_name = t.get_next('/')
+        self.key_name = t.get_next()
+        self._key = None
+
+    @classmethod
+    def _connect(cls):
+        if boto is None:
+            raise FileSystemNotSupported('S3 not supported. Install "boto".')
+        return boto.connect_s3(**cls.connection_kwargs)
 
     @classmethod
     def _get_conn(cls):
         if not cls._conn:
-            if boto is None:
-                raise FileSystemNotSupported('S3 not supported. Install "boto".')
-            cls._conn = boto.connect_s3(**cls.connection_kwargs)
+            cls._conn = cls._connect()
         return cls._conn
 
+    @classmethod
+    def _get_thread_conn(cls):
+        """Connection for parallel transfers, boto connections are not thread-safe."""
+        conn = getattr(cls._thread_conns, 'conn', None)
+        if conn is None:
+            conn = cls._thread_conns.conn = cls._connect()
+        return conn
+
+    @property
+    def key(self):
+        """The boto key, which is only looked up when it is first needed."""
+        if self._key is None:
+            bucket = self._get_conn().get_bucket(self.bucket_name, validate=False)
+            self._key = bucket.get_key(self.key_name) or bucket.new_key(self.key_name)
+        return self._key
+
     @classmethod
     def resolve_filenames(cls, expr):
         files = []
@@ -67,11 +101,18 @@ class S3(FileSystem):
             validate=False
         )
         expr = expr[len(scheme) + 3 + len(bucket_name) + 1:]
-        for k in bucket.list(prefix=prefix):
-            if fnmatch(k.name, expr) or fnmatch(k.name, expr + '/part*'):
-                files.append(f'{scheme}://{bucket_name}/{k.name}')
+        for name in cls._list_keys(bucket, bucket_name, prefix):
+            if fnmatch(name, expr) or fnmatch(name, expr + '/part*'):
+                files.append(f'{scheme}://{bucket_name}/{name}')
         return files
 
+    @staticmethod
+    def _list_keys(bucket, bucket_name, prefix):
+        return listing_cache.get(
+            ('s3', bucket_name, prefix),
+            lambda: [k.name for k in bucket.list(prefix=prefix)],
+        )
+
     @classmethod
     def resolve_content(cls, expr):
         scheme, bucket_name, folder_path, pattern = parse_file_uri(expr)
@@ -87,36 +128,97 @@ class S3(FileSystem):
             validate=False
         )
         files = []
-        for k in bucket.list(prefix=folder_path):
-            if fnmatch(k.name, expr) or fnmatch(k.name, pattern_expr):
-                files.append(f'{scheme}://{bucket_name}/{k.name}')
+        for name in cls._list_keys(bucket, bucket_name, folder_path):
+            if fnmatch(name, expr) or fnmatch(name, pattern_expr):
+                files.append(f'{scheme}://{bucket_name}/{name}')
         return files
 
     def exists(self):
-        t = Tokenizer(self.file_name)
-        t.get_next('//')  # skip scheme
-        bucket_name = t.get_next('/')
-        key_name = t.get_next()
-        conn = self._get_conn()
-        bucket = conn.get_bucket(bucket_name, validate=False)
-        return (bucket.get_key(key_name)
-                or bucket.list(prefix=f'{key_name}/'))
+        bucket = self._get_conn().get_bucket(self.bucket_name, validate=False)
+        return (bucket.get_key(self.key_name)
+                or bucket.list(prefix=f'{self.key_name}/'))
+
+    def size(self):
+        return self.key.size
 
     def load(self):
         log.debug('Loading %s with size %s.', self.key.name, self.key.size)
-        return BytesIO(self.key.get_contents_as_string())
+        if self._ranges() is None:
+            return BytesIO(self.key.get_contents_as_string())
+        with self.load_stream() as stream:
+            return BytesIO(stream.read())
+
+    def load_stream(self):
+        return self.load_stream_from(0)
+
+    def load_stream_from(self, start):
+        log.debug('Streaming %s with size %s from %s.', self.key.name, self.key.size, start)
+        ranges = self._ranges(start)
+        if ranges is not None:
+            prefetch = Prefetch(depth=self.max_concurrency)
+            return reader(prefetch.map(self._get_range, ranges))
+
+        def chunks():
+            try:
+                yield from iter(lambda: self.key.read(CHUNK_SIZE), b'')
+            finally:
+                self.key.close()
+
+        stream = reader(chunks())
+        skip(stream, start)
+        return stream
+
+    def _ranges(self, start=0):
+        """Byte ranges of a ranged download or ``None`` for small objects."""
+        size = self.key.size
+        if not size or size - start <= self.part_size:
+            return None
+        return [(part_start, min(part_start + self.part_size, size) - 1)
+                for part_start in range(start, size, self.part_size)]
+
+    def _get_range(self, byte_range):
+        start, end = byte_range
+        headers = {'Range': f'bytes={start}-{end}'}
+        if self.key.etag:
+            # fail instead of mixing parts of different versions
+            headers['If-Match'] = self.key.etag
+        bucket = self._get_thread_conn().get_bucket(self.bucket_name, validate=False)
+        return bucket.new_key(self.key_name).get_contents_as_string(headers=headers)
 
     def load_text(self, encoding='utf8', encoding_errors='ignore'):
-        log.debug('Loading %s with size %s.', self.key.name, self.key.size)
-        return StringIO(
-            self.key.get_contents_as_string().decode(encoding, encoding_errors)
-        )
+        return StringIO(self.load().getvalue().decode(encoding, encoding_errors))
 
     def dump(self, stream):
-        log.debug('Dumping to %s.', self.key.name)
-        self.key.set_contents_from_file(stream)
+        log.debug('Dumping to %s.', self.key_name)
+        first_part = read_exactly(stream, self.part_size)
+        bucket = self._get_conn().get_bucket(self.bucket_name, validate=False)
+        if len(first_part) < self.part_size:
+            bucket.new_key(self.key_name).set_contents_from_file(BytesIO(first_part))
+        else:
+            parts = itertools.chain(
+                [first_part],
+                iter(lambda: read_exactly(stream, self.part_size), b''),
+            )
+            upload = bucket.initiate_multipart_upload(self.key_name)
+            try:
+                prefetch = Prefetch(depth=self.max_concurrency)
+                for _ in prefetch.map(partial(self._upload_part, upload.id), enumerate(parts, 1)):
+                    pass
+                upload.complete_upload()
+            except BaseException:
+                upload.cancel_upload()
+                raise
+
+        self._key = None
         return self
 
+    def _upload_part(self, upload_id, numbered_part):
+        part_num, data = numbered_part
+        upload = MultiPartUpload(self._get_thread_conn().get_bucket(self.bucket_name, validate=False))
+        upload.key_name = self.key_name
+        upload.id = upload_id
+        upload.upload_part_from_file(BytesIO(data), part_num)
+
     def make_public(self, recursive=False):
         self.key.make_public(recursive)
         return self
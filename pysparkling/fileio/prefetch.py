@@ -0,0 +1,179 @@
+"""Read inputs in background threads while the current one is processed."""
+from concurrent import futures
+import itertools
+import queue
+import threading
+
+from .streams import CHUNK_SIZE, reader
+
+_END = object()
+
+
+def read_ahead(stream, max_bytes, chunk_size=CHUNK_SIZE):
+    """Read a stream in a background thread.
+
+    Up to ``max_bytes`` are buffered ahead of the reader, so waiting for a
+    remote file system overlaps with processing the data that arrived
+    already. Closing the returned reader stops the thread and closes
+    ``stream``.
+
+    :param stream: Readable file-like object.
+    :param int max_bytes: Maximum number of bytes to buffer.
+    :param int chunk_size: Size of the reads from ``stream``.
+    :rtype: io.BufferedReader
+    """
+    return reader(_ReadAhead(stream, max_bytes, chunk_size))
+
+
+class _ReadAhead:
+    """Iterator over the chunks that a background thread reads."""
+
+    def __init__(self, stream, max_bytes, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._chunks = queue.Queue(max(1, max_bytes // chunk_size))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self):
+        try:
+            for chunk in iter(lambda: self._stream.read(self._chunk_size), b''):
+                if not self._put(chunk):
+                    return
+            self._put(_END)
+        except Exception as e:  # pylint: disable=broad-except
+            self._put(e)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop.is_set():
+            raise StopIteration
+        chunk = self._chunks.get()
+        if chunk is _END or isinstance(chunk, Exception):
+            # nothing follows, later calls must not wait for the queue
+            self._stop.set()
+            if chunk is _END:
+                raise StopIteration
+            raise chunk
+        return chunk
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._stream.close()
+
+
+class Prefetch:
+    """Settings to fetch the inputs of a partition ahead of time.
+
+    While a task parses one input, the next ``depth`` inputs of its
+    partition are opened in a thread pool and files on remote file systems
+    are read ahead into buffers. Local files are read directly.
+
+    :param int depth: Number of inputs that are fetched ahead. ``0``
+        fetches them one after another.
+    :param int max_bytes: Memory for read-ahead buffers per task. It is
+        shared by the input that is processed and the prefetched ones.
+        ``0`` disables reading ahead.
+
+    >>> from pysparkling.fileio.prefetch import Prefetch
+    >>> list(Prefetch(depth=2).flat_map(range, [1, 2, 3]))
+    [0, 0, 1, 0, 1, 2]
+    """
+
+    def __init__(self, depth=2, max_bytes=32 * 1024 * 1024):
+        self.depth = depth
+        self.max_bytes = max_bytes
+
+    @property
+    def read_ahead(self):
+        """Bytes to buffer ahead for every open input.
+
+        :rtype: int
+        """
+        return self.max_bytes // (self.depth + 1)
+
+    def map(self, fetch, items):
+        """Apply ``fetch`` to ``items`` with up to ``depth`` of them ahead.
+
+        Iterators returned by ``fetch`` are started in the background,
+        which opens the files of the typical generators that read them.
+        Iterators that are fetched but not consumed are closed.
+
+        :param fetch: Function that opens and reads an item.
+        :param items: Iterable of items, e.g. file names or input splits.
+        :returns: Iterator of the results of ``fetch`` in order.
+        """
+        if self.depth < 1:
+            yield from map(fetch, items)
+            return
+
+        pending = []
+        with futures.ThreadPoolExecutor(self.depth) as pool:
+            try:
+                for item in items:
+                    pending.append(pool.submit(_started, fetch, item))
+                    if len(pending) > self.depth:
+                        yield pending.pop(0).result()
+                while pending:
+                    yield pending.pop(0).result()
+            finally:
+                for future in pending:
+                    if not future.cancel():
+                        future.add_done_callback(_close_result)
+
+    def flat_map(self, fetch, items):
+        """Like :meth:`map` but chains the iterables returned by ``fetch``.
+
+        :returns: Iterator of the elements of all results.
+        """
+        return itertools.chain.from_iterable(self.map(fetch, items))
+
+
+def _started(fetch, item):
+    result = fetch(item)
+    if not hasattr(result, '__next__'):
+        return result
+
+    try:
+        first = next(result)
+    except StopIteration:
+        return iter(())
+    return _Started(first, result)
+
+
+def _close_result(future):
+    if future.exception() is None and hasattr(future.result(), 'close'):
+        future.result().close()
+
+
+class _Started:
+    """Iterator that was advanced by one element in the background."""
+
+    def __init__(self, first, iterator):
+        self._first = [first]
+        self._iterator = iterator
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._first:
+            return self._first.pop()
+        return next(self._iterator)
+
+    def close(self):
+        if hasattr(self._iterator, 'close'):
+            self._iterator.close()
@@ -0,0 +1,284 @@
+"""Adapters to pass data through codecs and file systems in chunks."""
+import io
+import re
+
+#: Size of the chunks that are read, encoded and compressed at once.
+CHUNK_SIZE = 64 * 1024
+
+_NEWLINE = re.compile(rb'\r\n|\r|\n')
+
+
+def iter_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Iterate over data in chunks of ``bytes``.
+
+    :param stream: A readable file-like object, ``bytes`` or an iterable
+        of ``bytes``.
+    :param int chunk_size: Size of the chunks read from file-like objects.
+    :rtype: iterator
+    """
+    if isinstance(stream, (bytes, bytearray, memoryview)):
+        if stream:
+            yield bytes(stream)
+    elif hasattr(stream, 'read'):
+        yield from iter(lambda: stream.read(chunk_size), b'')
+    else:
+        yield from stream
+
+
+def skip(stream, n):
+    """Advance a readable stream by ``n`` bytes.
+
+    Seeks if the stream supports it and reads otherwise.
+
+    :raises EOFError: if the stream ends before.
+    """
+    if stream.seekable():
+        stream.seek(n, io.SEEK_CUR)
+        return
+
+    while n:
+        skipped = len(stream.read(min(n, CHUNK_SIZE)))
+        if not skipped:
+            raise EOFError('Stream ended before the requested position.')
+        n -= skipped
+
+
+def read_exactly(stream, n):
+    """Read ``n`` bytes unless the stream ends before.
+
+    Unlike a single ``read(n)``, this also works for raw streams that
+    return fewer bytes than requested before the end.
+
+    :rtype: bytes
+    """
+    data = stream.read(n)
+    if len(data) == n or not data:
+        return data
+
+    parts = [data]
+    remaining = n - len(data)
+    while remaining:
+        part = stream.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
+
+
+def iter_byte_lines(stream, offset=0, chunk_size=CHUNK_SIZE):
+    """Iterate over the lines of a binary stream with their positions.
+
+    Lines end with ``\\n``, ``\\r`` or ``\\r\\n`` like for
+    ``bytes.splitlines()``.
+
+    :param stream: Readable binary file-like object.
+    :param int offset: Position of the stream in the file.
+    :returns: Iterator of ``(position, line)`` where ``line`` does not
+        contain the line separator.
+    """
+    buffer = b''
+    position = offset
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+
+        i = 0
+        for m in _NEWLINE.finditer(buffer):
+            if chunk and m.end() == len(buffer) and m.group() == b'\r':
+                # could be the first byte of \r\n
+                break
+            yield position + i, buffer[i:m.start()]
+            i = m.end()
+        position += i
+        buffer = buffer[i:]
+
+        if not chunk:
+            if buffer:
+                yield position, buffer
+            return
+
+
+def iter_mapped_lines(mapped, offset=0):
+    """Iterate over the lines of a memory-mapped region with their positions.
+
+    The same as :func:`iter_byte_lines` but the line separators are
+    searched directly in the buffer and only the lines are copied.
+
+    :param mapped: A :class:`mmap.mmap` or another bytes-like object.
+    :param int offset: Position to start at.
+    :returns: Iterator of ``(position, line)``.
+    """
+    position = offset
+    while True:
+        m = _NEWLINE.search(mapped, position)
+        if m is None:
+            break
+        yield position, mapped[position:m.start()]
+        position = m.end()
+
+    if position < len(mapped):
+        yield position, mapped[position:]
+
+
+class StreamWindow:
+    """Sliding window over a stream that is addressed by absolute positions.
+
+    Used to scan compressed files for block boundaries: data is read as
+    far as needed and dropped once it was processed.
+
+    :param stream: Readable binary file-like object.
+    :param int offset: Position of the stream in the file.
+    """
+
+    def __init__(self, stream, offset=0):
+        self.stream = stream
+        self.start = offset
+        self.data = bytearray()
+        self.eof = False
+
+    @property
+    def end(self):
+        """Position after the last byte in the window."""
+        return self.start + len(self.data)
+
+    def fill(self, end):
+        """Read until the window reaches ``end`` or the end of the stream.
+
+        :returns: Whether the window reaches ``end``.
+        :rtype: bool
+        """
+        while self.end < end and not self.eof:
+            chunk = self.stream.read(max(CHUNK_SIZE, end - self.end))
+            if not chunk:
+                self.eof = True
+            self.data += chunk
+        return self.end >= end
+
+    def get(self, start, end):
+        """The data from ``start`` to ``end``.
+
+        :rtype: bytes
+        """
+        return bytes(self.data[start - self.start:end - self.start])
+
+    def discard(self, before):
+        """Drop the data before position ``before``."""
+        before = min(before, self.end)
+        if before > self.start:
+            del self.data[:before - self.start]
+            self.start = before
+
+
+class ChunkReader(io.RawIOBase):
+    """Readable, non-seekable file-like object over an iterator of chunks.
+
+    The chunks are pulled from the iterator only when they are read, so
+    the data is never held in memory at once.
+
+    :param chunks: Iterable of ``bytes``.
+    """
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._chunk = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def close(self):
+        if not self.closed and hasattr(self._chunks, 'close'):
+            # run the cleanup of generators, e.g. closing their inputs
+            self._chunks.close()
+        super().close()
+
+    def readinto(self, b):
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
+def reader(chunks):
+    """Buffered :class:`ChunkReader`.
+
+    :param chunks: Iterable of ``bytes``.
+    :rtype: io.BufferedReader
+    """
+    return io.BufferedReader(ChunkReader(chunks), CHUNK_SIZE)
+
+
+def decoded_reader(stream, open_decoder):
+    """Reader over the output of a decoder that reads from ``stream``.
+
+    Closing the reader closes the decoder and ``stream``.
+
+    :param stream: Readable file-like object.
+    :param open_decoder: Function that takes ``stream`` and returns a
+        readable file-like object with the decoded data.
+    :rtype: io.BufferedReader
+    """
+    def chunks():
+        with stream, open_decoder(stream) as decoded:
+            yield from iter_chunks(decoded)
+
+    return reader(chunks())
+
+
+def iter_lines(stream, lineSep=None, chunk_size=CHUNK_SIZE):
+    """Iterate over the lines of a text stream.
+
+    :param stream: Readable text file object. Without ``lineSep``, it is
+        expected to translate newlines to ``\\n``.
+    :param str lineSep: Separator to split at. With ``None``, the lines
+        are the same as from ``str.splitlines()`` for the separators ``\\n``,
+        ``\\r`` and ``\\r\\n``. Otherwise they are the same as from
+        ``str.split(lineSep)``.
+    :returns: Iterator of lines without separators.
+    """
+    if lineSep is None:
+        for line in stream:
+            yield line[:-1] if line.endswith('\n') else line
+        return
+
+    rest = ''
+    for chunk in iter(lambda: stream.read(chunk_size), ''):
+        lines = (rest + chunk).split(lineSep)
+        rest = lines.pop()
+        yield from lines
+    yield rest
+
+
+class ChunkWriter(io.RawIOBase):
+    """Writable file-like object that collects everything written to it.
+
+    Compressors that only write to file objects write into this and the
+    output is taken out with :meth:`drain` after every input chunk.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        """Remove and return the data written since the last call.
+
+        :rtype: bytes
+        """
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
@@ -1,9 +1,9 @@
-from io import BytesIO, StringIO, TextIOWrapper
+import codecs
+from io import TextIOWrapper
 import logging
 
-from . import codec
 from .file import File
-from .fs.file_system import FileSystem
+from .streams import CHUNK_SIZE, iter_byte_lines, iter_lines, iter_mapped_lines, reader
 
 log = logging.getLogger(__name__)
 
@@ -14,29 +14,84 @@ class TextFile(File):
     :param file_name: Any text file name.
     """
 
-    def load(self, encoding='utf8', encoding_errors='ignore'):  # pylint: disable=arguments-differ
-        """Load the data from a file.
+    def load(self, encoding='utf8', encoding_errors='ignore', *,  # pylint: disable=arguments-differ,arguments-renamed
+             read_ahead=0, start=0):
+        """Open the file and decode it while it is read.
 
         :param str encoding: The character encoding of the file.
         :param str encoding_errors: How to handle encoding errors.
-        :rtype: io.StringIO
+        :param int read_ahead: (optional) See :meth:`File.load`.
+        :param int start: (optional) See :meth:`File.load`.
+        :rtype: io.TextIOWrapper
         """
-        # pylint: disable=comparison-with-callable
-        if isinstance(self.codec, codec.NoCodec) and \
-           self.fs.load_text != FileSystem.load_text:
-            stream = self.fs.load_text(encoding, encoding_errors)
-        else:
-            stream = self.fs.load()
-            stream = self.codec.decompress(stream)
-            stream = TextIOWrapper(stream, encoding, encoding_errors)
-        return stream
+        return TextIOWrapper(File.load(self, read_ahead, start), encoding, encoding_errors)
+
+    def lines(self, encoding='utf8', encoding_errors='ignore', lineSep=None, read_ahead=0):
+        """Iterate over the lines of the file.
+
+        Only a chunk of the file is in memory at any time. The file is
+        closed when the iterator is exhausted or closed.
+
+        :param str encoding: The character encoding of the file.
+        :param str encoding_errors: How to handle encoding errors.
+        :param str lineSep: (optional) Line separator. By default, lines
+            end with ``\\n``, ``\\r`` or ``\\r\\n``.
+        :param int read_ahead: (optional) See :meth:`File.load`.
+        :returns: Iterator of lines without line separators.
+        """
+        newline = None if lineSep is None else ''
+        with TextIOWrapper(File.load(self, read_ahead), encoding, encoding_errors, newline) as stream:
+            yield from iter_lines(stream, lineSep)
+
+    def lines_in_range(self, start, end=None, encoding='utf8', encoding_errors='ignore',
+                       read_ahead=0):
+        """Iterate over the lines that begin in a byte range.
+
+        Like Hadoop's line record reader, the line at ``start`` is skipped
+        unless ``start`` is at the beginning of the file (it belongs to the
+        previous range) and the lines beginning up to and including ``end``
+        are read completely. Adjacent ranges therefore produce every line
+        exactly once. Lines end with ``\\n``, ``\\r`` or ``\\r\\n``.
+
+        Ranges of compressed files that are
+        :attr:`~pysparkling.fileio.File.block_splittable` contain the lines
+        that begin in the blocks that begin in the range.
+
+        :param int start: Offset in the file.
+        :param int end: Offset in the file or ``None`` for the end.
+        :param str encoding: The character encoding of the file. It must
+            encode line separators as single bytes like ``utf8``.
+        :param str encoding_errors: How to handle encoding errors.
+        :param int read_ahead: (optional) See :meth:`File.load`.
+        :returns: Iterator of lines without line separators.
+        """
+        if (start or end is not None) and not self.splittable and self.block_splittable:
+            yield from _block_lines(self.load_blocks(start, end, read_ahead), start,
+                                    encoding, encoding_errors)
+            return
+
+        mapped = self.load_mmap()
+        if mapped is not None:
+            try:
+                yield from _decoded_lines(iter_mapped_lines(mapped, start), start, end,
+                                          encoding, encoding_errors)
+            finally:
+                mapped.close()
+            return
+
+        with File.load(self, read_ahead, start) as stream:
+            yield from _decoded_lines(iter_byte_lines(stream, start), start, end,
+                                      encoding, encoding_errors)
 
     def dump(self, stream=None, encoding='utf8', encoding_errors='ignore'):  # pylint: disable=arguments-differ
         """Writes a stream to a file.
 
+        The text is encoded, compressed and passed to the file system in
+        chunks, so it does not need to fit in memory.
+
         :param stream:
-            An ``io.StringIO`` instance. A ``str`` is also possible and
-            get converted to ``io.StringIO``.
+            An ``io.StringIO`` instance. A ``str`` or an iterable of ``str``
+            (e.g. a generator of lines) are also possible.
 
         :param encoding: (optional)
             The character encoding of the file.
@@ -44,14 +99,70 @@ class TextFile(File):
         :rtype: TextFile
         """
         if stream is None:
-            stream = StringIO()
+            stream = ''
 
-        if isinstance(stream, str):
-            stream = StringIO(stream)
-
-        stream = self.codec.compress(
-            BytesIO(stream.read().encode(encoding, encoding_errors))
-        )
-        self.fs.dump(stream)
+        chunks = encode_chunks(stream, encoding, encoding_errors)
+        self.fs.dump(reader(self.codec.compress_chunks(chunks)))
 
         return self
+
+
+def _decoded_lines(lines, start, end, encoding, encoding_errors):
+    if start:
+        next(lines, None)
+
+    for position, line in lines:
+        if end is not None and position > end:
+            break
+        yield line.decode(encoding, encoding_errors)
+
+
+def _block_lines(blocks, start, encoding, encoding_errors):
+    # The position of the first block after the range is only known once
+    # the blocks in the range are decompressed, which is before a line
+    # that begins after it is read.
+    range_end = []
+
+    def chunks():
+        position = 0
+        try:
+            for in_range, data in blocks:
+                if not in_range and not range_end:
+                    range_end.append(position)
+                yield data
+                position += len(data)
+        finally:
+            blocks.close()
+
+    with reader(chunks()) as stream:
+        lines = iter_byte_lines(stream)
+        if start:
+            next(lines, None)
+
+        for position, line in lines:
+            if range_end and position > range_end[0]:
+                break
+            yield line.decode(encoding, encoding_errors)
+
+
+def encode_chunks(stream, encoding='utf8', encoding_errors='ignore', chunk_size=CHUNK_SIZE):
+    """Encode text to ``bytes`` chunks of roughly ``chunk_size``.
+
+    :param stream: A ``str``, a readable text file object or an iterable
+        of ``str``.
+    :rtype: iterator
+    """
+    if isinstance(stream, str):
+        stream = [stream]
+    elif hasattr(stream, 'read'):
+        stream = iter(lambda: stream.read(chunk_size), '')
+
+    encoder = codecs.getincrementalencoder(encoding)(encoding_errors)
+    pieces, size = [], 0
+    for piece in stream:
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield encoder.encode(''.join(pieces))
+            pieces, size = [], 0
+    yield encoder.encode(''.join(pieces), final=True)
@@ -0,0 +1,212 @@
+"""Approximate results of jobs where only some partitions completed.
+
+The evaluators are ported from ``org.apache.spark.partial``: they are fed
+the outputs of the completed tasks and extrapolate a result for the whole
+dataset together with a confidence interval.
+"""
+import math
+
+from .statcounter import StatCounter
+
+__all__ = ['BoundedFloat', 'CountEvaluator', 'SumEvaluator', 'MeanEvaluator']
+
+
+class BoundedFloat(float):
+    """Bounded value as returned by approximate actions.
+
+    It is a float with the additional attributes ``confidence``, ``low`` and
+    ``high``, like in PySpark.
+
+    >>> from pysparkling.partial import BoundedFloat
+    >>> b = BoundedFloat(5.0, 0.95, 4.0, 6.0)
+    >>> b + 1, b.low, b.high
+    (6.0, 4.0, 6.0)
+    """
+
+    def __new__(cls, mean, confidence, low, high):
+        obj = float.__new__(cls, mean)
+        obj.confidence = confidence
+        obj.low = low
+        obj.high = high
+        return obj
+
+    def __reduce__(self):
+        return BoundedFloat, (float(self), self.confidence, self.low, self.high)
+
+
+def normal_quantile(p):
+    """Inverse of the standard normal cumulative distribution function.
+
+    >>> round(normal_quantile(0.975), 4)
+    1.96
+    """
+    lower, upper = -40.0, 40.0
+    for _ in range(100):
+        mid = (lower + upper) / 2.0
+        if 0.5 * (1.0 + math.erf(mid / math.sqrt(2.0))) < p:
+            lower = mid
+        else:
+            upper = mid
+    return (lower + upper) / 2.0
+
+
+def student_t_quantile(p, degrees_of_freedom):
+    """Inverse of the cumulative distribution function of Student's t.
+
+    Exact for one and two degrees of freedom and a Cornish-Fisher expansion
+    around the normal quantile otherwise.
+
+    >>> round(student_t_quantile(0.975, 10), 3)
+    2.228
+    """
+    if degrees_of_freedom == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if degrees_of_freedom == 2:
+        return (2.0 * p - 1.0) / math.sqrt(2.0 * p * (1.0 - p))
+
+    z = normal_quantile(p)
+    nu = float(degrees_of_freedom)
+    g1 = (z ** 3 + z) / 4.0
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96.0
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384.0
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5
+          - 1920 * z ** 3 - 945 * z) / 92160.0
+    return z + g1 / nu + g2 / nu ** 2 + g3 / nu ** 3 + g4 / nu ** 4
+
+
+def poisson_quantile(mean, p):
+    """Smallest k for which the Poisson cumulative distribution is >= p.
+
+    >>> poisson_quantile(4.0, 0.5)
+    4
+    """
+    if mean > 500.0:
+        # exp(-mean) underflows, the normal approximation is accurate here
+        return max(0, int(math.floor(mean + normal_quantile(p) * math.sqrt(mean))))
+
+    k = 0
+    pmf = math.exp(-mean)
+    cdf = pmf
+    while cdf < p:
+        k += 1
+        pmf *= mean / k
+        cdf += pmf
+    return k
+
+
+def _confidence_factor(confidence, count):
+    p = 1.0 - (1.0 - confidence) / 2.0
+    if count > 100:
+        return normal_quantile(p)
+    return student_t_quantile(p, count - 1)
+
+
+class CountEvaluator:
+    """Evaluates partial per-partition counts.
+
+    :param int total_outputs: number of partitions in the job
+    :param float confidence: confidence of the returned interval
+    """
+
+    def __init__(self, total_outputs, confidence):
+        self.total_outputs = total_outputs
+        self.confidence = confidence
+        self.outputs_merged = 0
+        self.sum = 0
+
+    def merge(self, task_result):
+        self.outputs_merged += 1
+        self.sum += task_result
+
+    def currentResult(self):
+        if self.outputs_merged == self.total_outputs:
+            return BoundedFloat(self.sum, 1.0, self.sum, self.sum)
+        if self.outputs_merged == 0 or self.sum == 0:
+            return BoundedFloat(0, 0.0, 0.0, float('inf'))
+
+        p = self.outputs_merged / self.total_outputs
+        remaining = self.sum * (1 - p) / p
+        low = poisson_quantile(remaining, (1 - self.confidence) / 2)
+        high = poisson_quantile(remaining, (1 + self.confidence) / 2)
+        return BoundedFloat(self.sum + remaining, self.confidence,
+                            self.sum + low, self.sum + high)
+
+
+class SumEvaluator:
+    """Evaluates partial per-partition :class:`StatCounter` s for a sum.
+
+    :param int total_outputs: number of partitions in the job
+    :param float confidence: confidence of the returned interval
+    """
+
+    def __init__(self, total_outputs, confidence):
+        self.total_outputs = total_outputs
+        self.confidence = confidence
+        self.outputs_merged = 0
+        self.counter = StatCounter()
+
+    def merge(self, task_result):
+        self.outputs_merged += 1
+        self.counter.mergeStats(task_result)
+
+    def currentResult(self):
+        counter = self.counter
+        if self.outputs_merged == self.total_outputs:
+            return BoundedFloat(counter.sum(), 1.0, counter.sum(), counter.sum())
+        if self.outputs_merged == 0 or counter.count() == 0:
+            return BoundedFloat(0, 0.0, float('-inf'), float('inf'))
+
+        p = self.outputs_merged / self.total_outputs
+        mean_estimate = counter.mean()
+        count_estimate = (counter.count() + 1 - p) / p
+        sum_estimate = mean_estimate * count_estimate
+
+        mean_var = counter.sampleVariance() / counter.count()
+        if math.isnan(mean_var) or counter.count() == 1:
+            return BoundedFloat(sum_estimate, self.confidence,
+                                float('-inf'), float('inf'))
+
+        count_var = (counter.count() + 1) * (1 - p) / (p * p)
+        sum_var = (mean_estimate * mean_estimate * count_var
+                   + count_estimate * count_estimate * mean_var
+                   + mean_var * count_var)
+        sum_stdev = math.sqrt(sum_var)
+        conf_factor = _confidence_factor(self.confidence, counter.count())
+        return BoundedFloat(sum_estimate, self.confidence,
+                            sum_estimate - conf_factor * sum_stdev,
+                            sum_estimate + conf_factor * sum_stdev)
+
+
+class MeanEvaluator:
+    """Evaluates partial per-partition :class:`StatCounter` s for a mean.
+
+    :param int total_outputs: number of partitions in the job
+    :param float confidence: confidence of the returned interval
+    """
+
+    def __init__(self, total_outputs, confidence):
+        self.total_outputs = total_outputs
+        self.confidence = confidence
+        self.outputs_merged = 0
+        self.counter = StatCounter()
+
+    def merge(self, task_result):
+        self.outputs_merged += 1
+        self.counter.mergeStats(task_result)
+
+    def currentResult(self):
+        counter = self.counter
+        if self.outputs_merged == self.total_outputs:
+            return BoundedFloat(counter.mean(), 1.0, counter.mean(), counter.mean())
+        if self.outputs_merged == 0 or counter.count() == 0:
+            return BoundedFloat(0, 0.0, float('-inf'), float('inf'))
+        if counter.count() == 1:
+            return BoundedFloat(counter.mean(), self.confidence,
+                                float('-inf'), float('inf'))
+
+        mean = counter.mean()
+        stdev = math.sqrt(counter.sampleVariance() / counter.count())
+        conf_factor = _confidence_factor(self.confidence, counter.count())
+        return BoundedFloat(mean, self.confidence,
+                            mean - conf_factor * stdev,
+                            mean + conf_factor * stdev)
@@ -19,3 +19,21 @@ class Partition:
             'index': self.index,
             '_x': self.x(),
         }
+
+
+class ZippedPartition(Partition):
+    def __init__(self, idx, partitions):
+        """Partition made of the partitions with the same index of several RDDs.
+
+        :param int idx: index of this partition
+        :param list partitions: the parent partitions
+        """
+        super().__init__([], idx)
+        self.partitions = list(partitions)
+
+    def __getstate__(self):
+        return {
+            'index': self.index,
+            '_x': [],
+            'partitions': self.partitions,
+        }
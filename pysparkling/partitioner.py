@@ -0,0 +1,93 @@
+"""Partitioners describe how the keys of a pair RDD map to partitions."""
+import bisect
+
+__all__ = ['Partitioner', 'RangePartitioner']
+
+
+class Partitioner:
+    """Assigns keys to partitions with a (hash) function.
+
+    :param int numPartitions: number of partitions
+    :param partitionFunc: function that maps a key to an integer
+
+    >>> from pysparkling.partitioner import Partitioner
+    >>> p = Partitioner(3, lambda k: k)
+    >>> [p.getPartition(k) for k in range(5)]
+    [0, 1, 2, 0, 1]
+    """
+
+    def __init__(self, numPartitions, partitionFunc):
+        self.numPartitions = numPartitions
+        self.partitionFunc = partitionFunc
+
+    def __eq__(self, other):
+        return (isinstance(other, Partitioner)
+                and not isinstance(other, RangePartitioner)
+                and self.numPartitions == other.numPartitions
+                and self.partitionFunc == other.partitionFunc)
+
+    def __hash__(self):
+        return hash((type(self), self.numPartitions, self.partitionFunc))
+
+    def getPartition(self, k):
+        """Index of the partition of the key k."""
+        return self.partitionFunc(k) % self.numPartitions
+
+    def __call__(self, k):
+        return self.getPartition(k)
+
+
+class RangePartitioner(Partitioner):
+    """Assigns sortable keys to partitions of contiguous ranges.
+
+    Partition ``i`` contains the keys that are greater than ``bounds[i - 1]``
+    and smaller or equal to ``bounds[i]``, or the reverse for descending
+    order.
+
+    :param int numPartitions: number of partitions
+    :param list bounds: sorted upper bounds of all but the last partition
+    :param bool ascending: order of the partitions
+
+    >>> from pysparkling.partitioner import RangePartitioner
+    >>> p = RangePartitioner(3, [2, 5])
+    >>> [p.getPartition(k) for k in range(8)]
+    [0, 0, 0, 1, 1, 1, 2, 2]
+    >>> p = RangePartitioner(3, [2, 5], ascending=False)
+    >>> [p(k) for k in range(8)]
+    [2, 2, 2, 1, 1, 1, 0, 0]
+    """
+
+    def __init__(self, numPartitions, bounds, ascending=True):
+        super().__init__(numPartitions, None)
+        self.bounds = list(bounds)
+        self.ascending = ascending
+
+    @classmethod
+    def from_sorted_keys(cls, keys, numPartitions, ascending=True):
+        """Create a partitioner that splits sorted keys into similar ranges.
+
+        :param list keys: keys sorted in the given order
+        """
+        bounds = []
+        for i in range(1, numPartitions):
+            if not keys:
+                break
+            bound = keys[min(len(keys) - 1, i * len(keys) // numPartitions)]
+            if not bounds or bounds[-1] != bound:
+                bounds.append(bound)
+        if not ascending:
+            bounds.reverse()
+        return cls(numPartitions, bounds, ascending)
+
+    def __eq__(self, other):
+        return (isinstance(other, RangePartitioner)
+                and self.numPartitions == other.numPartitions
+                and self.bounds == other.bounds
+                and self.ascending == other.ascending)
+
+    def __hash__(self):
+        return hash((type(self), self.numPartitions, tuple(self.bounds), self.ascending))
+
+    def getPartition(self, k):
+        p = bisect.bisect_left(self.bounds, k)
+        return p if self.ascending else len(self.bounds) - p
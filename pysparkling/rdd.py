@@ -3,25 +3,28 @@ from builtins import range, zip
 from collections import defaultdict
 import copy
 import functools
-import io
+import heapq
 import itertools
 import logging
 import math
 from operator import itemgetter
 import os
-import pickle
 import random
+import shlex
 import subprocess
 import sys
-
-try:
-    import numpy
-except ImportError:
-    numpy = None
+import threading
 
 from . import fileio
 from .exceptions import ContextIsLockedException, FileAlreadyExistsException
-from .samplers import BernoulliSampler, BernoulliSamplerPerKey, PoissonSampler, PoissonSamplerPerKey
+from .fileio.framed_pickle import dump_batches
+from .hyperloglog import HyperLogLog
+from .partial import CountEvaluator, MeanEvaluator, SumEvaluator
+from .partition import ZippedPartition
+from .partitioner import Partitioner, RangePartitioner
+from .samplers import (
+    BernoulliSampler, BernoulliSamplerPerKey, PoissonSampler, PoissonSamplerPerKey, RandomState, RangeSampler
+)
 from .statcounter import StatCounter
 from .utils import portable_hash
 
@@ -49,6 +52,9 @@ class RDD:
     :param Context ctx:
         An instance of the applicable :class:`Context`.
 
+    The attribute ``partitioner`` is the :class:`~pysparkling.partitioner.Partitioner`
+    that describes how the keys of this RDD are distributed over its
+    partitions or `None` if that is unknown.
     """
 
     def __init__(self, partitions, ctx):
@@ -56,6 +62,7 @@ class RDD:
             raise ContextIsLockedException
         self._p = list(partitions)
         self.context = ctx
+        self.partitioner = None
         self._name = None
         self._rdd_id = ctx.newRddId()
 
@@ -74,6 +81,9 @@ class RDD:
     def partitions(self):
         return self._p
 
+    def _is_copartitioned(self, other):
+        return self.partitioner is not None and self.partitioner == other.partitioner
+
     #
     # Public API
     # ----------
@@ -122,11 +132,54 @@ class RDD:
         )
 
     def treeAggregate(self, zeroValue, seqOp, combOp, depth=2):
-        """same internal behaviour as :func:`~pysparkling.RDD.aggregate()`
+        """aggregate in a multi-level tree pattern
+
+        Same result as :func:`~pysparkling.RDD.aggregate()`, but the partial
+        results of the partitions are combined in rounds of tasks before the
+        final combination on the driver.
+
+        :param zeroValue: The initial value of the aggregation.
+        :param seqOp: Combines the current state with a new value.
+        :param combOp: Combines two outputs of seqOp.
+        :param int depth: suggested depth of the tree (default: 2)
+        :returns: Output of ``combOp`` operations.
+
 
-        :param depth: Not used.
+        Example:
+
+        >>> from pysparkling import Context
+        >>> from operator import add
+        >>> rdd = Context().parallelize([-5, -4, -3, -2, -1, 1, 2, 3, 4], 10)
+        >>> rdd.treeAggregate(0, add, add)
+        -5
+        >>> rdd.treeAggregate(0, add, add, 1)
+        -5
+        >>> rdd.treeAggregate(0, add, add, 5)
+        -5
         """
-        return self.aggregate(zeroValue, seqOp, combOp)
+        if depth < 1:
+            raise ValueError(f'Depth cannot be smaller than 1 but got {depth}.')
+
+        def aggregate_partition(tc, i, x):
+            yield functools.reduce(seqOp, x, copy.deepcopy(zeroValue))
+
+        def combine_partition(tc, i, x):
+            yield functools.reduce(combOp, x, copy.deepcopy(zeroValue))
+
+        partially_aggregated = MapPartitionsRDD(self, aggregate_partition)
+        num_partitions = partially_aggregated.getNumPartitions()
+        scale = max(int(math.ceil(num_partitions ** (1.0 / depth))), 2)
+        while num_partitions > scale + num_partitions / scale:
+            num_partitions = int(num_partitions / scale)
+            # the partials of a round are combined in the tasks of the next one,
+            # only the last round is collected
+            partially_aggregated = MapPartitionsRDD(
+                CoalescedRDD(partially_aggregated, num_partitions),
+                combine_partition,
+            )
+
+        return functools.reduce(combOp, partially_aggregated.collect(),
+                                copy.deepcopy(zeroValue))
 
     def aggregateByKey(self, zeroValue, seqFunc, combFunc, numPartitions=None):
         """aggregate by key
@@ -354,8 +407,20 @@ class RDD:
         ...  for k, v in sorted(a.cogroup(b).collect())
         ... ]
         [('house', [[1], [3]]), ('tree', [[], [2]])]
+
+        If both RDDs are partitioned in the same way, the groups are formed
+        within the partitions without moving data:
+
+        >>> a2, b2 = a.partitionBy(2), b.partitionBy(2)
+        >>> a2.cogroup(b2).partitioner == a2.partitioner
+        True
+        >>> sorted(a2.cogroup(b2).collect())
+        [('house', [[1], [3]]), ('tree', [[2], []])]
         """
 
+        if self._is_copartitioned(other):
+            return ZippedPartitionsRDD([self, other], cogroup_partitions)
+
         d_self = defaultdict(list, self.groupByKey().collect())
         d_other = defaultdict(list, other.groupByKey().collect())
         return self.context.parallelize([
@@ -411,22 +476,54 @@ class RDD:
         return self.context.runJob(self, lambda tc, i: sum(1 for _ in i),
                                    resultHandler=sum)
 
-    def countApprox(self):
-        """same as :func:`~pysparkling.RDD.count()`
+    def countApprox(self, timeout=None, confidence=0.95):
+        """approximate number of entries in this dataset
 
+        Counts the partitions that complete within ``timeout`` and
+        extrapolates to the whole dataset.
+
+        :param timeout: Time in milliseconds. `None` waits for all partitions.
+        :param float confidence: Confidence of the estimate.
         :rtype: int
+
+
+        Example:
+
+        >>> from pysparkling import Context
+        >>> Context().parallelize(range(1000), 10).countApprox(1000)
+        1000
         """
-        return self.count()
+        return int(self.context.runApproximateJob(
+            self,
+            lambda tc, i: sum(1 for _ in i),
+            CountEvaluator(self.getNumPartitions(), confidence),
+            timeout,
+        ))
+
+    def countApproxDistinct(self, relativeSD=0.05):
+        """return the approximate number of distinct values
 
-    def countApproxDistinct(self):
-        """return the number of distinct values
+        Every partition is summarized in a
+        :class:`~pysparkling.hyperloglog.HyperLogLog` sketch and the sketches
+        are merged on the driver.
 
+        :param float relativeSD: Relative accuracy. Smaller values use more
+            memory.
         :rtype: int
 
-        .. note::
-            The operation is currently implemented as a local and exact operation.
+
+        Example:
+
+        >>> from pysparkling import Context
+        >>> n = Context().parallelize(range(1000), 3).map(str).countApproxDistinct()
+        >>> 900 < n < 1100
+        True
         """
-        return len(set(self.toLocalIterator()))
+        return self.aggregate(
+            HyperLogLog(relativeSD),
+            lambda a, b: a.add(b),
+            lambda a, b: a.merge(b),
+        ).cardinality()
 
     def countByKey(self):
         """returns a `dict` containing the count for every key
@@ -530,12 +627,13 @@ class RDD:
             resultHandler=lambda l: next(itertools.chain.from_iterable(l)),
         )
 
-    def flatMap(self, f, preservesPartitioning=True):
+    def flatMap(self, f, preservesPartitioning=False):
         """map followed by flatten
 
         :param f: The map function.
-        :param preservesPartitioning: (optional) Preserve the partitioning of
-            the original RDD. Default True.
+        :param preservesPartitioning: (optional) Whether ``f`` keeps the keys
+            so that the partitioner of the original RDD still applies.
+            Default False.
         :rtype: RDD
 
 
@@ -816,6 +914,11 @@ class RDD:
         [(1, (1, 3))]
         """
 
+        if self._is_copartitioned(other):
+            return self.cogroup(other).flatMapValues(
+                lambda vs: [(v_self, v_other) for v_self in vs[0] for v_other in vs[1]]
+            )
+
         if numPartitions is None:
             numPartitions = self.getNumPartitions()
 
@@ -877,6 +980,13 @@ class RDD:
         [(0, (1, None)), (1, (1, 3))]
         """
 
+        if self._is_copartitioned(other):
+            return self.cogroup(other).flatMapValues(
+                lambda vs: [(v_self, v_other)
+                            for v_self in vs[0]
+                            for v_other in (vs[1] or [None])]
+            )
+
         d_other = other.groupByKey().collectAsMap()
 
         return self.groupByKey().flatMap(lambda kv: [
@@ -955,8 +1065,20 @@ class RDD:
         >>> from pysparkling import Context
         >>> Context().parallelize([(0, 1), (1, 1), (1, 3)]).lookup(1)
         [1, 3]
+
+        If the RDD has a partitioner, only the partition that can contain
+        the key is computed.
         """
-        return self.filter(lambda x: x[0] == key).values().collect()
+        if self.partitioner is None:
+            return self.filter(lambda x: x[0] == key).values().collect()
+
+        partition = self.partitions()[self.partitioner.getPartition(key)]
+        return self.context.runJob(
+            self,
+            lambda tc, x: [kv[1] for kv in x if kv[0] == key],
+            partitions=[partition],
+            resultHandler=unit_collect,
+        )
 
     def map(self, f):
         """map
@@ -974,13 +1096,15 @@ class RDD:
         return MapPartitionsRDD(
             self,
             MapF(f),
-            preservesPartitioning=True,
         ).setName(f'{self.name()}:{f}')
 
     def mapPartitions(self, f, preservesPartitioning=False):
         """map partitions
 
         :param f: map function for partitions
+        :param preservesPartitioning: (optional) Whether ``f`` keeps the keys
+            so that the partitioner of the original RDD still applies.
+            Default False.
         :rtype: RDD
 
 
@@ -1003,6 +1127,9 @@ class RDD:
         """map partitions with index
 
         :param f: map function for (index, partition)
+        :param preservesPartitioning: (optional) Whether ``f`` keeps the keys
+            so that the partitioner of the original RDD still applies.
+            Default False.
         :rtype: RDD
 
 
@@ -1058,12 +1185,29 @@ class RDD:
         """
         return self.stats().mean()
 
-    def meanApprox(self):
-        """same as :func:`~pysparkling.RDD.mean()`
+    def meanApprox(self, timeout=None, confidence=0.95):
+        """approximate mean of this dataset
 
-        :rtype: float
+        Uses the partitions that complete within ``timeout``.
+
+        :param timeout: Time in milliseconds. `None` waits for all partitions.
+        :param float confidence: Confidence of the bounds.
+        :rtype: BoundedFloat
+
+
+        Example:
+
+        >>> from pysparkling import Context
+        >>> r = Context().parallelize(range(1000), 10).meanApprox(1000)
+        >>> r, r.low, r.high
+        (499.5, 499.5, 499.5)
         """
-        return self.mean()
+        return self.context.runApproximateJob(
+            self,
+            lambda tc, i: StatCounter(i),
+            MeanEvaluator(self.getNumPartitions(), confidence),
+            timeout,
+        )
 
     def min(self):
         """returns the minimum element"""
@@ -1104,12 +1248,17 @@ class RDD:
         if partitionFunc is None:
             partitionFunc = _hash
 
+        partitioner = Partitioner(numPartitions, partitionFunc)
+        if self.partitioner == partitioner:
+            return self
+
         new_partitions = [[] for _ in range(numPartitions)]
         for key_value in self.toLocalIterator():
-            idx = partitionFunc(key_value[0]) % numPartitions
-            new_partitions[idx].append(key_value)
+            new_partitions[partitioner(key_value[0])].append(key_value)
 
-        return self.context._parallelize_partitions(new_partitions)
+        rdd = self.context._parallelize_partitions(new_partitions)
+        rdd.partitioner = partitioner
+        return rdd
 
     def persist(self, storageLevel=None):
         """Cache the results of computed partitions.
@@ -1128,11 +1277,19 @@ class RDD:
         """
         return self
 
-    def pipe(self, command, env=None):
-        """Run a command with the elements in the dataset as argument.
+    def pipe(self, command, env=None, checkCode=False):
+        """Pipe the elements of every partition through an external command.
+
+        One process is started per partition. The elements are written to
+        its stdin, one per line, and the lines of its stdout are the elements
+        of the resulting RDD. The partition is computed lazily and streamed,
+        so large partitions are never held in memory.
 
         :param command: Command line command to run.
-        :param dict env: environment variables
+        :param dict env: environment variables in addition to the ones of
+            the current process
+        :param bool checkCode: whether to raise a ``RuntimeError`` when the
+            command exits with a non-zero code
         :rtype: RDD
 
         .. warning::
@@ -1142,29 +1299,28 @@ class RDD:
         Example:
 
         >>> from pysparkling import Context
-        >>> piped = Context().parallelize(['0', 'hello', 'world']).pipe('echo')
-        >>> b'hello' in piped.collect()[1]
-        True
+        >>> Context().parallelize(['hello', 'world'], 2).pipe('cat').collect()
+        ['hello', 'world']
+        >>> Context().parallelize(['b', 'a', 'c']).pipe('sort').collect()
+        ['a', 'b', 'c']
         """
-        if env is None:
-            env = {}
-
-        return self.context.parallelize(subprocess.check_output(
-            [command] + x if isinstance(x, list) else [command, x]
-        ) for x in self.collect())
+        return MapPartitionsRDD(
+            self,
+            PipeF(command, env, checkCode),
+        ).setName(f'{self.name()}:pipe({command})')
 
     def randomSplit(self, weights, seed=None):
         """Split the RDD into a few RDDs according to the given weights.
 
+        Every split is a lazily sampled view of this RDD. All splits use the
+        same per-partition random number sequence, so together they are
+        disjoint and complete.
+
         :param list[float] weights: relative lengths of the resulting RDDs
         :param int seed: seed for random number generator
         :returns: a list of RDDs
         :rtype: list
 
-        .. note::
-            Creating the new RDDs is currently implemented as a local
-            operation.
-
 
         Example:
 
@@ -1173,21 +1329,24 @@ class RDD:
         >>> rdd1, rdd2 = rdd.randomSplit([2, 3], seed=42)
         >>> (rdd1.count(), rdd2.count())
         (199, 301)
+        >>> sorted(rdd1.union(rdd2).collect()) == list(range(500))
+        True
         """
-        sum_weights = sum(weights)
-        boundaries = [0]
+        sum_weights = float(sum(weights))
+        boundaries = [0.0]
         for w in weights:
             boundaries.append(boundaries[-1] + w / sum_weights)
-        random.seed(seed)
+        # protect the last split against rounding errors in the sum
+        boundaries[-1] = 1.0
 
-        lists = [[] for _ in weights]
-        for e in self.toLocalIterator():
-            r = random.random()
-            for i, (lb, ub) in enumerate(zip(boundaries[:-1], boundaries[1:])):
-                if lb <= r < ub:
-                    lists[i].append(e)
+        if seed is None:
+            seed = random.randint(0, 2 ** 31)
 
-        return [self.context.parallelize(l) for l in lists]
+        return [
+            PartitionwiseSampledRDD(
+                self, RangeSampler(lb, ub), preservesPartitioning=True, seed=seed)
+            for lb, ub in zip(boundaries[:-1], boundaries[1:])
+        ]
 
     def reduce(self, f):
         """reduce
@@ -1269,9 +1428,13 @@ class RDD:
         return dict(self.reduceByKey(f).collect())
 
     def treeReduce(self, f, depth=2):
-        """same internal behaviour as :func:`~pysparkling.RDD.reduce()`
+        """reduce in a multi-level tree pattern
 
-        :param depth: Not used.
+        Same result as :func:`~pysparkling.RDD.reduce()`. See
+        :func:`~pysparkling.RDD.treeAggregate()`.
+
+        :param f: A commutative and associative binary operator.
+        :param int depth: suggested depth of the tree (default: 2)
 
         >>> from pysparkling import Context
         >>> from operator import add
@@ -1287,7 +1450,20 @@ class RDD:
         >>> rdd.treeReduce(add, 10)
         -5
         """
-        return self.reduce(f)
+        # the second entry indicates whether this is the dummy zero value
+        zero_value = (None, True)
+
+        def op(x, y):
+            if x[1]:
+                return y
+            if y[1]:
+                return x
+            return f(x[0], y[0]), False
+
+        reduced = self.map(lambda x: (x, False)).treeAggregate(zero_value, op, op, depth)
+        if reduced[1]:
+            raise ValueError("Can not reduce() empty RDD")
+        return reduced[0]
 
     def repartition(self, numPartitions):
         """repartition
@@ -1339,7 +1515,7 @@ class RDD:
 
         return (self
                 .partitionBy(numPartitions, partitionFunc)
-                .mapPartitions(partition_sort))
+                .mapPartitions(partition_sort, preservesPartitioning=True))
 
     def rightOuterJoin(self, other, numPartitions=None):
         """right outer join
@@ -1362,6 +1538,13 @@ class RDD:
         [(1, (1, 3)), (2, (None, 1))]
         """
 
+        if self._is_copartitioned(other):
+            return self.cogroup(other).flatMapValues(
+                lambda vs: [(v_self, v_other)
+                            for v_other in vs[1]
+                            for v_self in (vs[0] or [None])]
+            )
+
         d_self = self.groupByKey().collectAsMap()
 
         return other.groupByKey().flatMap(lambda kv: [
@@ -1482,6 +1665,13 @@ class RDD:
     def saveAsPickleFile(self, path, batchSize=10):
         """save as pickle file
 
+        Every partition is written as a sequence of length-framed pickled
+        batches, so it is never held in memory as a whole and
+        :func:`Context.pickleFile` can read it back batch by batch.
+
+        :param path: Destination of the pickle file.
+        :param int batchSize: Number of records per pickled batch. ``0``
+            chooses the batch size automatically.
         :returns: ``self``
         :rtype: RDD
 
@@ -1507,27 +1697,24 @@ class RDD:
                 f'Output {path} already exists.'
             )
 
-        codec_suffix = ''
-        if path.endswith(tuple('.' + ending
-                               for endings, _ in fileio.codec.FILE_ENDINGS
-                               for ending in endings)):
-            codec_suffix = path[path.rfind('.'):]
+        codec_suffix = fileio.codec.get_path_suffix(path)
 
-        def _map(path, obj):
-            stream = io.BytesIO()
-            pickle.dump(obj, stream)
-            stream.seek(0)
-            fileio.File(path).dump(stream)
+        def write_partition(file_name, data):
+            fileio.File(file_name).dump(dump_batches(data, batchSize))
 
         if self.getNumPartitions() == 1:
-            _map(path, self.collect())
+            self.context.runJob(
+                self,
+                lambda tc, x: write_partition(path, x),
+                resultHandler=list,
+            )
             return self
 
         self.context.runJob(
             self,
-            lambda tc, x: _map(
+            lambda tc, x: write_partition(
                 os.path.join(path, f'part-{tc.partitionId():05d}{codec_suffix}'),
-                list(x),
+                x,
             ),
             resultHandler=list,
         )
@@ -1537,44 +1724,62 @@ class RDD:
     def saveAsTextFile(self, path, compressionCodecClass=None):
         """save as text file
 
-        If the RDD has many partitions, the contents will be stored directly
-        in the given path. If the RDD has more partitions, the data of the
-        partitions are stored in individual files under ``path/part-00000`` and
-        so on and once all partitions are written, the file ``path/_SUCCESS``
-        is written last.
+        If the RDD has a single partition and no compression codec is given,
+        the contents will be stored directly in the given path. Otherwise, the
+        data of the partitions are stored in individual files under
+        ``path/part-00000`` and so on and once all partitions are written, the
+        file ``path/_SUCCESS`` is written last.
+
+        Every partition is encoded, compressed and written as a stream by the
+        task that computes it.
 
         :param path: Destination of the text file.
-        :param compressionCodecClass: Not used.
+        :param compressionCodecClass: (optional)
+            A Hadoop codec class name like
+            ``org.apache.hadoop.io.compress.GzipCodec``, a short name like
+            ``zstd`` or a :class:`pysparkling.fileio.codec.Codec` subclass.
+            The part files
+            get the file ending of the codec.
         :returns: ``self``
         :rtype: RDD
+
+
+        Example:
+
+        >>> from pysparkling import Context
+        >>> from tempfile import NamedTemporaryFile
+        >>> tmpFile = NamedTemporaryFile(delete=True)
+        >>> tmpFile.close()
+        >>> _ = Context().parallelize(range(5), 2).saveAsTextFile(
+        ...     tmpFile.name, 'org.apache.hadoop.io.compress.GzipCodec')
+        >>> sorted(Context().textFile(tmpFile.name + '/part-*.gz').collect())
+        ['0', '1', '2', '3', '4']
         """
         if fileio.TextFile(path).exists():
             raise FileAlreadyExistsException(f'Output {path} already exists.')
 
-        def to_stringio(data):
-            stringio = io.StringIO()
-            for line in data:
-                stringio.write(f'{line}\n')
-            stringio.seek(0)
-            return stringio
+        if compressionCodecClass is not None:
+            codec_suffix = fileio.codec.get_codec_suffix(compressionCodecClass)
+        else:
+            codec_suffix = fileio.codec.get_path_suffix(path)
 
-        # fast single-file write for single partition RDDs
-        if self.getNumPartitions() == 1:
-            fileio.TextFile(path).dump(to_stringio(self.collect()))
-            return self
+        def write_partition(file_name, data):
+            fileio.TextFile(file_name).dump(f'{line}\n' for line in data)
 
-        codec_suffix = ''
-        if path.endswith(tuple('.' + ending
-                               for endings, _ in fileio.codec.FILE_ENDINGS
-                               for ending in endings)):
-            codec_suffix = path[path.rfind('.'):]
+        # single-file write for single partition RDDs
+        if self.getNumPartitions() == 1 and compressionCodecClass is None:
+            self.context.runJob(
+                self,
+                lambda tc, x: write_partition(path, x),
+                resultHandler=list,
+            )
+            return self
 
         self.context.runJob(
-            self.mapPartitions(to_stringio),
-            lambda tc, stringio: (
-                fileio.TextFile(
-                    os.path.join(path, f'part-{tc.partitionId():05d}{codec_suffix}')
-                ).dump(stringio)
+            self,
+            lambda tc, x: write_partition(
+                os.path.join(path, f'part-{tc.partitionId():05d}{codec_suffix}'),
+                x,
             ),
             resultHandler=list,
         )
@@ -1624,14 +1829,17 @@ class RDD:
             numPartitions,
         )
 
-    def sortByKey(self, ascending=True, numPartitions=None,
-                  keyfunc=itemgetter(0)):
+    def sortByKey(self, ascending=True, numPartitions=None, keyfunc=None):
         """sort by key
 
+        Without a ``keyfunc``, the result has a
+        :class:`~pysparkling.partitioner.RangePartitioner`.
+
         :param ascending: Sort order.
         :param int numPartitions: `None` means the output will
             have the same number of partitions as the input.
-        :param keyfunc: Returns the value that will be sorted.
+        :param keyfunc: Returns the value that will be sorted. `None` sorts
+            by the key of the (key, value) pairs.
         :rtype: RDD
 
         .. note::
@@ -1654,7 +1862,23 @@ class RDD:
         >>> rdd.sortByKey(ascending=False).collect()[0][1] == 'a'
         True
         """
-        return self.sortBy(keyfunc, ascending, numPartitions)
+        if keyfunc is not None:
+            return self.sortBy(keyfunc, ascending, numPartitions)
+
+        if numPartitions is None:
+            numPartitions = self.getNumPartitions()
+
+        data = sorted(self.collect(), key=itemgetter(0), reverse=not ascending)
+        partitioner = RangePartitioner.from_sorted_keys(
+            [key_value[0] for key_value in data], numPartitions, ascending)
+
+        new_partitions = [[] for _ in range(numPartitions)]
+        for key_value in data:
+            new_partitions[partitioner(key_value[0])].append(key_value)
+
+        rdd = self.context._parallelize_partitions(new_partitions)
+        rdd.partitioner = partitioner
+        return rdd
 
     def stats(self):
         """stats
@@ -1746,10 +1970,30 @@ class RDD:
         return self.context.runJob(self, lambda tc, x: sum(x),
                                    resultHandler=sum)
 
-    def sumApprox(self):
-        """same as :func:`~pysparkling.RDD.sum()`
+    def sumApprox(self, timeout=None, confidence=0.95):
+        """approximate sum of the elements
+
+        Sums the partitions that complete within ``timeout`` and extrapolates
+        to the whole dataset.
+
+        :param timeout: Time in milliseconds. `None` waits for all partitions.
+        :param float confidence: Confidence of the bounds.
+        :rtype: BoundedFloat
+
+
+        Example:
+
+        >>> from pysparkling import Context
+        >>> r = Context().parallelize(range(1000), 10).sumApprox(1000)
+        >>> r, r.confidence
+        (499500.0, 1.0)
         """
-        return self.sum()
+        return self.context.runApproximateJob(
+            self,
+            lambda tc, i: StatCounter(i),
+            SumEvaluator(self.getNumPartitions(), confidence),
+            timeout,
+        )
 
     def take(self, n):
         """Take n elements and return them in a list.
@@ -1920,7 +2164,12 @@ class RDD:
         >>> Context().parallelize([10, 1, 2, 9, 3, 4, 5, 6, 7], 2).takeOrdered(6, key=lambda x: -x)
         [10, 9, 7, 6, 5, 4]
         """
-        return self.sortBy(key).take(n)
+        return self.context.runJob(
+            self,
+            lambda tc, i: heapq.nsmallest(n, i, key=key),
+            resultHandler=lambda l: heapq.nsmallest(
+                n, itertools.chain.from_iterable(l), key=key),
+        )
 
     def toLocalIterator(self):
         """Returns an iterator over the dataset.
@@ -1951,15 +2200,15 @@ class RDD:
         >>> r = Context().parallelize([4, 9, 7, 3, 2, 5], 3)
         >>> r.top(2)
         [9, 7]
+        >>> r.top(2, key=lambda x: -x)
+        [2, 3]
         """
-
-        def unit(x):
-            return x
-
-        if key is None:
-            key = unit
-
-        return self.sortBy(key, ascending=False).take(num)
+        return self.context.runJob(
+            self,
+            lambda tc, i: heapq.nlargest(num, i, key=key),
+            resultHandler=lambda l: heapq.nlargest(
+                num, itertools.chain.from_iterable(l), key=key),
+        )
 
     def union(self, other):
         """union
@@ -2060,7 +2309,6 @@ class RDD:
             lambda tc, i, x: (
                 (xx, e * num_p + tc.partition_id) for e, xx in enumerate(x)
             ),
-            preservesPartitioning=True,
         )
 
 
@@ -2077,6 +2325,7 @@ class MapPartitionsRDD(RDD):
         self._name = f'{prev.name()}:{f}'
         self.f = f
         self.preservesPartitioning = preservesPartitioning
+        self.partitioner = prev.partitioner if preservesPartitioning else None
 
     def compute(self, split, task_context):
         return self.f(task_context, split.index,
@@ -2093,7 +2342,7 @@ class PartitionwiseSampledRDD(RDD):
 
         :param RDD prev: previous RDD
         :param sampler: a sampler
-        :param bool preservesPartitioning: preserve partitioning (not used)
+        :param bool preservesPartitioning: preserve partitioning
         :param int seed: random number generator seed (can be None)
         """
         RDD.__init__(self, prev.partitions(), prev.context)
@@ -2104,16 +2353,15 @@ class PartitionwiseSampledRDD(RDD):
         self.prev = prev
         self.sampler = sampler
         self.preservesPartitioning = preservesPartitioning
+        self.partitioner = prev.partitioner if preservesPartitioning else None
         self.seed = seed
 
     def compute(self, split, task_context):
-        random.seed(self.seed + split.index)
-        if numpy is not None:
-            numpy.random.seed(self.seed + split.index)
+        random_state = RandomState(self.seed + split.index)
         return (
             x
             for x in self.prev.compute(split, task_context._create_child())
-            for _ in range(self.sampler(x))
+            for _ in range(self.sampler(x, random_state))
         )
 
     def partitions(self):
@@ -2128,6 +2376,7 @@ class PersistedRDD(RDD):
         """
         RDD.__init__(self, prev.partitions(), prev.context)
         self.prev = prev
+        self.partitioner = prev.partitioner
         self.storageLevel = storageLevel
         self._cache_manager = None
         self._cid = None
@@ -2156,6 +2405,57 @@ class PersistedRDD(RDD):
         return unpersisted_rdd
 
 
+class ZippedPartitionsRDD(RDD):
+    def __init__(self, rdds, f):
+        """Combines the partitions with the same index of co-partitioned RDDs.
+
+        ``f`` is a function with the signature
+        ``(task_context, partition index, list of iterators over elements)``.
+        The partitioner of the first RDD is preserved.
+
+        :param list rdds: RDDs with the same number of partitions
+        :param f: function to apply to the zipped partitions
+        """
+        RDD.__init__(self, [
+            ZippedPartition(i, ps)
+            for i, ps in enumerate(zip(*(rdd.partitions() for rdd in rdds)))
+        ], rdds[0].context)
+        self.rdds = rdds
+        self.f = f
+        self.partitioner = rdds[0].partitioner
+
+    def compute(self, split, task_context):
+        return self.f(task_context, split.index, [
+            rdd.compute(p, task_context._create_child())
+            for rdd, p in zip(self.rdds, split.partitions)
+        ])
+
+
+class CoalescedRDD(RDD):
+    def __init__(self, prev, numPartitions):
+        """Groups the partitions of an RDD without collecting them.
+
+        The parent partition with index ``i`` is computed in the task of the
+        partition ``i % numPartitions``.
+
+        :param RDD prev: previous RDD
+        :param int numPartitions: number of partitions of this RDD
+        """
+        parent_partitions = prev.partitions()
+        numPartitions = min(numPartitions, len(parent_partitions))
+        RDD.__init__(self, [
+            ZippedPartition(i, parent_partitions[i::numPartitions])
+            for i in range(numPartitions)
+        ], prev.context)
+        self.prev = prev
+
+    def compute(self, split, task_context):
+        return itertools.chain.from_iterable(
+            self.prev.compute(p, task_context._create_child())
+            for p in split.partitions
+        )
+
+
 class EmptyRDD(RDD):
     def __init__(self, context):
         RDD.__init__(self, [], context)
@@ -2171,6 +2471,70 @@ class MapF:
         return (self.f(xx) for xx in x)
 
 
+class PipeF:
+    def __init__(self, command, env, check_code):
+        self.command = command
+        self.env = env
+        self.check_code = check_code
+
+    def __call__(self, tc, i, x):
+        env = dict(os.environ, **self.env) if self.env else None
+        # Not in a with statement: the process outlives this call as it is
+        # consumed lazily, it is killed and reaped in the finally clause
+        # below and its stdin is closed by the writer thread.
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            shlex.split(self.command), env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+        writer_errors = []
+
+        def write_elements(stdin):
+            # runs in a separate thread so that a full stdout buffer of the
+            # process can not deadlock writing to its stdin
+            try:
+                for e in x:
+                    stdin.write(f'{e}'.rstrip('\n').encode('utf8') + b'\n')
+            except BrokenPipeError:
+                log.debug('Command %s closed its stdin early.', self.command)
+            except Exception as e:  # pylint: disable=broad-except
+                writer_errors.append(e)
+            finally:
+                try:
+                    stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        writer = threading.Thread(target=write_elements, args=(process.stdin,))
+        writer.daemon = True
+        writer.start()
+
+        try:
+            for line in iter(process.stdout.readline, b''):
+                yield line.rstrip(b'\n').decode('utf8')
+            writer.join()
+            process.wait()
+            if writer_errors:
+                raise writer_errors[0]
+            if self.check_code and process.returncode:
+                raise RuntimeError(
+                    f'Pipe function `{self.command}` exited with error code {process.returncode}'
+                )
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+def cogroup_partitions(tc, i, iterators):
+    groups = defaultdict(lambda: ([], []))
+    for side, x in enumerate(iterators):
+        for k, v in x:
+            groups[k][side].append(v)
+    return ((k, [vs[0], vs[1]]) for k, vs in groups.items())
+
+
 def unit_map(task_context, elements):
     return list(elements)
 
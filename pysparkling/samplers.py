@@ -7,7 +7,29 @@ except ImportError:
     numpy = None
 
 
-def pysparkling_poisson(lambda_):
+class RandomState:
+    """Random number generators of one partition
+
+    Samplers draw from the generators of the partition they sample instead
+    of the global ones, so partitions computed concurrently do not share
+    a sequence.
+
+    :param int seed: seed of the generators
+    """
+
+    def __init__(self, seed):
+        self.random = random.Random(seed).random
+        # RandomState is missing from the members of numpy.random known to pylint
+        self.numpy = (numpy.random.RandomState(seed % 2 ** 32)  # pylint: disable=no-member
+                      if numpy is not None else None)
+
+    def poisson(self, lambda_):
+        if self.numpy is not None:
+            return self.numpy.poisson(lambda_)
+        return pysparkling_poisson(lambda_, self.random)
+
+
+def pysparkling_poisson(lambda_, rand=random.random):
     if lambda_ == 0.0:
         return 0
 
@@ -15,48 +37,51 @@ def pysparkling_poisson(lambda_):
     exp_neg_lambda = math.exp(-lambda_)
     prod = 1.0
     while True:
-        prod *= random.random()
+        prod *= rand()
         if prod > exp_neg_lambda:
             n += 1
         else:
             return n
 
 
-def poisson(lambda_):
-    if numpy is not None:
-        return numpy.random.poisson(lambda_)
-    return pysparkling_poisson(lambda_)
-
-
 class BernoulliSampler:
     def __init__(self, expectation):
         self.expectation = expectation
 
-    def __call__(self, sample):
-        return 1 if random.random() < self.expectation else 0
+    def __call__(self, sample, random_state):
+        return 1 if random_state.random() < self.expectation else 0
+
+
+class RangeSampler:
+    def __init__(self, lower_bound, upper_bound):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+
+    def __call__(self, sample, random_state):
+        return 1 if self.lower_bound <= random_state.random() < self.upper_bound else 0
 
 
 class PoissonSampler:
     def __init__(self, expectation):
         self.expectation = expectation
 
-    def __call__(self, sample):
-        return poisson(self.expectation)
+    def __call__(self, sample, random_state):
+        return random_state.poisson(self.expectation)
 
 
 class BernoulliSamplerPerKey:
     def __init__(self, expectations):
         self.expectations = expectations
 
-    def __call__(self, sample):
+    def __call__(self, sample, random_state):
         key = sample[0]
-        return 1 if random.random() < self.expectations.get(key, 0.0) else 0
+        return 1 if random_state.random() < self.expectations.get(key, 0.0) else 0
 
 
 class PoissonSamplerPerKey:
     def __init__(self, expectations):
         self.expectations = expectations
 
-    def __call__(self, sample):
+    def __call__(self, sample, random_state):
         key = sample[0]
-        return poisson(self.expectations.get(key, 0.0))
+        return random_state.poisson(self.expectations.get(key, 0.0))
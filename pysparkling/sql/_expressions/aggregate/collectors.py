@@ -1,3 +1,4 @@
+from ....hyperloglog import HyperLogLog
 from .aggregations import Aggregation
 
 
@@ -147,19 +148,22 @@ class CountDistinct(Aggregation):
 class ApproxCountDistinct(Aggregation):
     pretty_name = "approx_count_distinct"
 
-    def __init__(self, column):
+    def __init__(self, column, rsd=None):
         super().__init__(column)
         self.column = column
-        self.items = set()
+        self.rsd = rsd.get_literal_value() if rsd is not None else 0.05
+        self.sketch = HyperLogLog(self.rsd)
 
     def merge(self, row, schema):
-        self.items.add(self.column.eval(row, schema))
+        value = self.column.eval(row, schema)
+        if value is not None:
+            self.sketch.add(value)
 
     def mergeStats(self, other, schema):
-        self.items += other.items
+        self.sketch.merge(other.sketch)
 
     def eval(self, row, schema):
-        return len(self.items)
+        return self.sketch.cardinality()
 
     def args(self):
         return (self.column,)
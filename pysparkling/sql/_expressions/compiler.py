@@ -0,0 +1,399 @@
+"""
+Compilation of bound column expressions to Python functions
+
+Interpreting a column calls ``eval`` on every node of its expression tree
+for every row. Once a column is bound to a schema, the supported nodes of
+its tree are translated to the source of a single function that reads the
+fields by position. Nodes that are not supported are evaluated by the
+generated function with their own ``eval``.
+"""
+from copy import deepcopy
+from functools import lru_cache
+
+from .expressions import Expression
+from .fields import FieldAsExpression
+from .literals import Literal
+from .mappers import CaseWhen, Concat, Length, Lower, Otherwise, Upper
+from .operators import (
+    Add, Alias, And, BitwiseAnd, BitwiseNot, BitwiseOr, BitwiseXor, Cast, Contains, Divide, EqNullSafe, Equal,
+    GreaterThan, GreaterThanOrEqual, Invert, IsIn, IsNotNull, IsNull, LessThan, LessThanOrEqual, Minus, Mod, Negate,
+    Or, Pow, Substring, Time, UnaryPositive
+)
+from .strings import StringLTrim, StringRTrim, StringTrim
+
+NUMBERS = (int, float)
+
+# Operations that return None if an operand is None and that only
+# apply to operands of the same type or to numbers
+NULL_SAFE_OPERATIONS = {
+    Add: "{0} + {1}",
+    Minus: "{0} - {1}",
+    Time: "{0} * {1}",
+    Divide: "{0} / {1} if {1} != 0 else None",
+    Mod: "{0} % {1}",
+    Pow: "float({0} ** {1})",
+}
+
+# Operations that return None if an operand is None and that cast
+# operands of different types
+TYPE_SAFE_OPERATIONS = {
+    Equal: "{0} == {1}",
+    LessThan: "{0} < {1}",
+    LessThanOrEqual: "{0} <= {1}",
+    GreaterThan: "{0} > {1}",
+    GreaterThanOrEqual: "{0} >= {1}",
+    And: "{0} and {1}",
+    Or: "{0} or {1}",
+}
+
+BINARY_OPERATIONS = {
+    BitwiseOr: "{0} | {1}",
+    BitwiseAnd: "{0} & {1}",
+    BitwiseXor: "{0} ^ {1}",
+    EqNullSafe: "{0} == {1}",
+}
+
+UNARY_OPERATIONS = {
+    Negate: "- {0}",
+    UnaryPositive: "{0}",
+    Invert: "None if {0} is None else not {0}",
+    BitwiseNot: "~{0}",
+    IsNull: "{0} is None",
+    IsNotNull: "{0} is not None",
+    Length: "len(str({0}))",
+    Lower: "str({0}).lower()",
+    Upper: "str({0}).upper()",
+    StringTrim: "{0}.strip()",
+    StringLTrim: "{0}.lstrip()",
+    StringRTrim: "{0}.rstrip()",
+}
+
+# Names of the ExpressionCompiler methods that compile each type of node,
+# other nodes are evaluated with their own eval
+NODE_COMPILERS = {
+    FieldAsExpression: "compile_field_expression",
+    Literal: "compile_literal",
+    Alias: "compile_alias",
+    CaseWhen: "compile_case_when_without_default",
+    Otherwise: "compile_otherwise",
+    Cast: "compile_cast",
+    IsIn: "compile_is_in",
+    Contains: "compile_contains",
+    Substring: "compile_substring",
+    Concat: "compile_concat",
+    **{node_type: "compile_unary_operation" for node_type in UNARY_OPERATIONS},
+    **{node_type: "compile_binary_operation" for node_type in BINARY_OPERATIONS},
+    **{node_type: "compile_numeric_operation" for node_type in NULL_SAFE_OPERATIONS},
+    **{node_type: "compile_comparison" for node_type in TYPE_SAFE_OPERATIONS},
+}
+
+# CASE WHEN branches are nested in the generated code,
+# Python limits the indentation level of a source to 100
+MAX_DEPTH = 64
+
+
+class CompiledColumn:
+    """
+    Evaluate a column on rows of the schema it is bound to
+
+    The function is generated the first time the column is evaluated.
+    """
+    __slots__ = ("column", "schema", "function")
+
+    def __init__(self, column, schema):
+        self.column = column
+        self.schema = schema
+        self.function = self.compile_and_eval
+
+    def compile_and_eval(self, row):
+        function = compile_expression(self.column.expr, self.schema)
+        if function is None:
+            # Nothing to compile, the column is interpreted
+            self.column.compiled = None
+            return self.column.expr.eval(row, self.schema)
+        self.function = function
+        return function(row)
+
+    def __deepcopy__(self, memo):
+        # The generated function uses the nodes of the original expression
+        return CompiledColumn(deepcopy(self.column, memo), self.schema)
+
+    def __reduce__(self):
+        return CompiledColumn, (self.column, self.schema)
+
+
+def compile_expression(expr, schema):
+    """
+    Return a function that evaluates expr on a row of schema
+
+    None is returned when expr itself is not supported.
+    """
+    compiler = ExpressionCompiler(schema)
+    result = compiler.compile(expr)
+    if not compiler.compiled_nodes:
+        return None
+    factory = function_factory(compiler.source(result))
+    return factory(schema, *compiler.constants)
+
+
+def compile_batch_expression(expr, schema):
+    """
+    Return a CompiledBatchExpression that evaluates expr on the columns of rows of schema
+
+    None is returned when a node of expr is not supported.
+    """
+    compiler = BatchExpressionCompiler(schema)
+    try:
+        result = compiler.compile(expr)
+    except UnsupportedExpression:
+        return None
+    return CompiledBatchExpression(compiler.source(result), schema, compiler.constants)
+
+
+class CompiledBatchExpression:
+    """
+    Evaluate an expression on lists of column values
+
+    It is pickled as its source and constants as the generated
+    function cannot be pickled.
+    """
+    __slots__ = ("source", "schema", "constants", "function")
+
+    def __init__(self, source, schema, constants):
+        self.source = source
+        self.schema = schema
+        self.constants = constants
+        self.function = function_factory(source)(schema, *constants)
+
+    def __call__(self, columns, size):
+        return self.function(columns, size)
+
+    def __reduce__(self):
+        return CompiledBatchExpression, (self.source, self.schema, self.constants)
+
+
+@lru_cache(256)
+def function_factory(source):
+    """
+    Return the function defined by source that creates evaluation functions
+
+    The source of an expression only depends on its shape and on the positions
+    of its fields: expressions that only differ by their literals share it.
+    """
+    namespace = {"NUMBERS": NUMBERS}
+    # pylint: disable=exec-used
+    exec(compile(source, "<compiled expression>", "exec"), namespace)
+    return namespace["make"]
+
+
+class UnsupportedExpression(Exception):
+    pass
+
+
+class ExpressionCompiler:
+    def __init__(self, schema):
+        self.schema = schema
+        self.constants = []
+        self.non_null = set()
+        self.lines = []
+        self.depth = 2
+        self.variables = 0
+        self.compiled_nodes = 0
+
+    def source(self, result):
+        parameters = "".join(f", c{i}" for i in range(len(self.constants)))
+        return "\n".join([
+            f"def make(schema{parameters}):",
+            "    def compiled(row):",
+            *self.lines,
+            f"        return {result}",
+            "    return compiled",
+        ])
+
+    def emit(self, line):
+        self.lines.append("    " * self.depth + line)
+
+    def constant(self, value):
+        name = f"c{len(self.constants)}"
+        self.constants.append(value)
+        if value is not None:
+            self.non_null.add(name)
+        return name
+
+    def variable(self):
+        name = f"v{self.variables}"
+        self.variables += 1
+        return name
+
+    def assign(self, code):
+        name = self.variable()
+        self.emit(f"{name} = {code}")
+        return name
+
+    def compile(self, node):
+        """
+        Emit the code that evaluates node and return the name that holds its value
+
+        node is either an Expression or a Column
+        """
+        if not isinstance(node, Expression):
+            if isinstance(node.expr, Expression):
+                return self.compile(node.expr)
+            return self.compile_field(node, node.binding)
+
+        method = NODE_COMPILERS.get(type(node), "compile_fallback")
+        return getattr(self, method)(node)
+
+    def compile_field_expression(self, node):
+        return self.compile_field(node, node.binding)
+
+    def compile_literal(self, node):
+        self.compiled_nodes += 1
+        return self.constant(node.value)
+
+    def compile_alias(self, node):
+        return self.compile(node.expr)
+
+    def compile_unary_operation(self, node):
+        self.compiled_nodes += 1
+        return self.assign(UNARY_OPERATIONS[type(node)].format(self.compile(node.column)))
+
+    def compile_binary_operation(self, node):
+        self.compiled_nodes += 1
+        value_1 = self.compile(node.arg1)
+        value_2 = self.compile(node.arg2)
+        return self.assign(BINARY_OPERATIONS[type(node)].format(value_1, value_2))
+
+    def compile_numeric_operation(self, node):
+        return self.compile_null_safe_operation(
+            node,
+            NULL_SAFE_OPERATIONS[type(node)],
+            "{0}.__class__ is {1}.__class__ or (isinstance({0}, NUMBERS) and isinstance({1}, NUMBERS))"
+        )
+
+    def compile_comparison(self, node):
+        return self.compile_null_safe_operation(
+            node,
+            TYPE_SAFE_OPERATIONS[type(node)],
+            "{0}.__class__ is {1}.__class__"
+        )
+
+    def compile_case_when_without_default(self, node):
+        return self.compile_case_when(node, None)
+
+    def compile_otherwise(self, node):
+        return self.compile_case_when(node, node.default)
+
+    def compile_cast(self, node):
+        self.compiled_nodes += 1
+        return self.assign(f"{self.constant(node.caster)}({self.compile(node.column)})")
+
+    def compile_is_in(self, node):
+        self.compiled_nodes += 1
+        return self.assign(f"{self.compile(node.arg1)} in {self.constant(node.cols)}")
+
+    def compile_contains(self, node):
+        self.compiled_nodes += 1
+        value = self.compile(node.value)
+        return self.assign(f"{value} in {self.compile(node.expr)}")
+
+    def compile_substring(self, node):
+        self.compiled_nodes += 1
+        start = self.constant(node.start - 1)
+        end = self.constant(node.start - 1 + node.length)
+        return self.assign(f"str({self.compile(node.expr)})[{start}:{end}]")
+
+    def compile_concat(self, node):
+        self.compiled_nodes += 1
+        values = [f"str({self.compile(column)})" for column in node.columns]
+        return self.assign(" + ".join(values) or '""')
+
+    def compile_fallback(self, node):
+        return self.assign(f"{self.constant(node)}.eval(row, schema)")
+
+    def compile_field(self, node, binding):
+        if binding is not None and binding.schema is self.schema:
+            self.compiled_nodes += 1
+            return self.assign(f"row[{binding.position}]")
+        return self.compile_fallback(node)
+
+    def compile_null_safe_operation(self, node, operation, same_types):
+        self.compiled_nodes += 1
+        value_1 = self.compile(node.arg1)
+        value_2 = self.compile(node.arg2)
+        result = self.variable()
+        nullables = [f"{value} is None" for value in (value_1, value_2) if value not in self.non_null]
+        if nullables:
+            self.emit(f"if {' or '.join(nullables)}:")
+            self.emit(f"    {result} = None")
+            self.emit(f"elif {same_types.format(value_1, value_2)}:")
+        else:
+            self.emit(f"if {same_types.format(value_1, value_2)}:")
+        self.emit(f"    {result} = {operation.format(value_1, value_2)}")
+        self.emit("else:")
+        # Casts and type errors are handled by the expression
+        self.emit(f"    {result} = {self.constant(node)}.safe_operation({value_1}, {value_2})")
+        return result
+
+    def compile_case_when(self, node, default):
+        if self.depth + len(node.conditions) > MAX_DEPTH:
+            return self.compile_fallback(node)
+
+        self.compiled_nodes += 1
+        result = self.variable()
+        depth = self.depth
+        for condition, value in zip(node.conditions, node.values):
+            self.emit(f"if {self.compile(condition)}:")
+            self.depth += 1
+            self.emit(f"{result} = {self.compile(value)}")
+            self.depth -= 1
+            self.emit("else:")
+            self.depth += 1
+        self.emit(f"{result} = {'None' if default is None else self.compile(default)}")
+        self.depth = depth
+        return result
+
+
+class BatchExpressionCompiler(ExpressionCompiler):
+    """
+    Generate a function that loops once over the columns used by an expression
+
+    Expressions with nodes that cannot be compiled are not supported.
+    """
+
+    def __init__(self, schema):
+        super().__init__(schema)
+        self.depth = 3
+        self.fields = {}
+
+    def source(self, result):
+        parameters = "".join(f", c{i}" for i in range(len(self.constants)))
+        if not self.fields:
+            loop = "for _ in range(size):"
+        elif len(self.fields) == 1:
+            position, name = next(iter(self.fields.items()))
+            loop = f"for {name} in columns[{position}]:"
+        else:
+            names = ", ".join(self.fields.values())
+            columns = ", ".join(f"columns[{position}]" for position in self.fields)
+            loop = f"for {names} in zip({columns}):"
+        return "\n".join([
+            f"def make(schema{parameters}):",
+            "    def compiled(columns, size):",
+            "        result = []",
+            "        append = result.append",
+            f"        {loop}",
+            *self.lines,
+            f"            append({result})",
+            "        return result",
+            "    return compiled",
+        ])
+
+    def compile_fallback(self, node):
+        raise UnsupportedExpression(node)
+
+    def compile_field(self, node, binding):
+        if binding is None or binding.schema is not self.schema:
+            raise UnsupportedExpression(node)
+        self.compiled_nodes += 1
+        return self.fields.setdefault(binding.position, f"f{binding.position}")
@@ -152,6 +152,30 @@ class Expression(metaclass=RegisteredExpressions):
             elif isinstance(child, (list, set, tuple)):
                 Expression.children_pre_evaluation_schema(child, schema)
 
+    def bind(self, schema):
+        pass
+
+    def recursive_bind(self, schema):
+        """
+        Resolve the columns used by this expression to their position in the schema
+        against which it will be evaluated, once per plan instead of once per row
+        """
+        self.bind(schema)
+        self.children_bind(self.children, schema)
+
+    @staticmethod
+    def children_bind(children, schema):
+        # pylint: disable=import-outside-toplevel, cyclic-import
+        from ..column import Column
+
+        for child in children:
+            if isinstance(child, Expression):
+                child.recursive_bind(schema)
+            elif isinstance(child, Column):
+                child.bind(schema)
+            elif isinstance(child, (list, set, tuple)):
+                Expression.children_bind(child, schema)
+
     def get_literal_value(self):
         raise AnalysisException(f"Expecting a Literal, but got {type(self)}: {self}")
 
@@ -198,8 +222,9 @@ class TypeSafeBinaryOperation(BinaryOperation):
     """
 
     def eval(self, row, schema):
-        value_1 = self.arg1.eval(row, schema)
-        value_2 = self.arg2.eval(row, schema)
+        return self.safe_operation(self.arg1.eval(row, schema), self.arg2.eval(row, schema))
+
+    def safe_operation(self, value_1, value_2):
         if value_1 is None or value_2 is None:
             return None
 
@@ -242,8 +267,9 @@ class NullSafeBinaryOperation(BinaryOperation):
     """
 
     def eval(self, row, schema):
-        value_1 = self.arg1.eval(row, schema)
-        value_2 = self.arg2.eval(row, schema)
+        return self.safe_operation(self.arg1.eval(row, schema), self.arg2.eval(row, schema))
+
+    def safe_operation(self, value_1, value_2):
         if value_1 is None or value_2 is None:
             return None
 
@@ -7,8 +7,15 @@ class FieldAsExpression(Expression):
     def __init__(self, field):
         super().__init__()
         self.field = field
+        self.binding = None
+
+    def bind(self, schema):
+        self.binding = bind_position(schema, self.field)
 
     def eval(self, row, schema):
+        binding = self.binding
+        if binding is not None and binding.schema is schema:
+            return row[binding.position]
         return row[find_position_in_schema(schema, self.field)]
 
     def __str__(self):
@@ -21,6 +28,36 @@ class FieldAsExpression(Expression):
         return (self.field,)
 
 
+class SchemaBinding:
+    """
+    Position of a column in the schema of a plan
+
+    It is resolved once when the plan is built instead of for every row.
+    Copies of an expression, e.g. of aggregations for every group, are
+    evaluated against the same schema and share its binding.
+    """
+    __slots__ = ("schema", "position")
+
+    def __init__(self, schema, position):
+        self.schema = schema
+        self.position = position
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def bind_position(schema, expr):
+    """
+    Return the SchemaBinding of expr in schema or None if expr cannot be found in it
+
+    References that cannot be resolved fail when they are evaluated
+    """
+    try:
+        return SchemaBinding(schema, find_position_in_schema(schema, expr))
+    except (AnalysisException, NotImplementedError):
+        return None
+
+
 def find_position_in_schema(schema, expr):
     if isinstance(expr, str):
         show_id = False
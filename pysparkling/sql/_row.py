@@ -1,4 +1,5 @@
 # This is such an important import, I try to make it NOT be depending on ANYTHING else...
+from functools import lru_cache
 
 
 def row_from_keyed_values(keyed_values, metadata=None):
@@ -28,10 +29,75 @@ def create_row(fields, values, metadata=None):
     :type metadata: Optional[dict]
     :return: pysparkling.sql.Row
     """
-    new_row = tuple.__new__(Row, values)
-    new_row.__fields__ = tuple(fields)
-    new_row.set_metadata(metadata)
-    return new_row
+    return tuple.__new__(row_class(tuple(fields), metadata), values)
+
+
+def row_class(fields, metadata=None):
+    """
+    Return the Row subclass of the rows with these fields and metadata
+
+    The field names, their positions and the metadata are stored once in
+    this class instead of in every row: rows have no __dict__ and fields
+    are looked up by name in constant time.
+
+    :type fields: tuple
+    :type metadata: Optional[dict]
+    :return: type
+    """
+    if metadata is None:
+        return _cached_row_class(fields, None)
+    try:
+        return _cached_row_class(fields, _MetadataKey(metadata))
+    except TypeError:
+        # Metadata values that cannot be converted to a hashable key
+        return _new_row_class(fields, metadata)
+
+
+@lru_cache(1024)
+def _cached_row_class(fields, metadata_key):
+    return _new_row_class(fields, None if metadata_key is None else dict(metadata_key.metadata))
+
+
+class _MetadataKey:
+    """
+    Compare and hash metadata by value, with lists, tuples, sets and
+    dicts in its values converted to hashable values of the same type
+    """
+    __slots__ = ("metadata", "key", "hash")
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.key = _hashable(metadata)
+        self.hash = hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, _MetadataKey) and self.key == other.key
+
+    def __hash__(self):
+        return self.hash
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return type(value), tuple((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(value)
+    return value
+
+
+def _new_row_class(fields, metadata):
+    field_indices = {}
+    for i, field in enumerate(fields):
+        # Like tuple.index, duplicated names resolve to their first position
+        field_indices.setdefault(field, i)
+    return type("Row", (Row,), {
+        "__slots__": (),
+        "__fields__": fields,
+        "_field_indices": field_indices,
+        "_metadata": metadata,
+    })
 
 
 class Row(tuple):
@@ -74,6 +140,8 @@ class Row(tuple):
     >>> Person("Alice", 11)
     Row(name='Alice', age=11)
     """
+    __slots__ = ()
+    _field_indices = {}
     _metadata = None
 
     def __new__(cls, *args, **kwargs):
@@ -83,10 +151,7 @@ class Row(tuple):
         if kwargs:
             # create row objects
             names = sorted(kwargs.keys())
-            row = tuple.__new__(cls, [kwargs[n] for n in names])
-            row.__fields__ = names
-            row.__from_dict__ = True
-            return row
+            return create_row(names, [kwargs[n] for n in names])
 
         # create row class or objects
         return tuple.__new__(cls, args)
@@ -123,7 +188,7 @@ class Row(tuple):
 
     def __contains__(self, item):
         if hasattr(self, "__fields__"):
-            return item in self.__fields__
+            return item in self._field_indices
         return super().__contains__(item)
 
     # let object acts like class
@@ -138,37 +203,32 @@ class Row(tuple):
         if isinstance(item, (int, slice)):
             return super().__getitem__(item)
         try:
-            # it will be slow when it has many fields,
-            # but this will not be used in normal cases
-            idx = self.__fields__.index(item)
-            return super().__getitem__(idx)
-        except IndexError as e:
-            raise KeyError(item) from e
-        except ValueError as e:
+            idx = self._field_indices[item]
+        except KeyError as e:
             raise ValueError(item) from e
+        return super().__getitem__(idx)
 
     def __getattr__(self, item):
         if item.startswith("__"):
             raise AttributeError(item)
         try:
-            # it will be slow when it has many fields,
-            # but this will not be used in normal cases
-            idx = self.__fields__.index(item)
-            return self[idx]
-        except IndexError as e:
-            raise AttributeError(item) from e
-        except ValueError as e:
+            idx = self._field_indices[item]
+        except KeyError as e:
             raise AttributeError(item) from e
+        return super().__getitem__(idx)
 
     def __setattr__(self, key, value):
-        if key not in ('__fields__', "__from_dict__", "_metadata"):
-            raise Exception("Row is read-only")
-        self.__dict__[key] = value
+        raise Exception("Row is read-only")
 
     def __reduce__(self):
-        """Returns a tuple so Python knows how to pickle Row."""
+        """
+        Returns a tuple so Python knows how to pickle Row.
+
+        Fields and metadata are shared by the rows of a schema,
+        pickle only writes them once for all the rows it serializes.
+        """
         if hasattr(self, "__fields__"):
-            return create_row, (self.__fields__, tuple(self))
+            return create_row, (self.__fields__, tuple(self), self._metadata)
         return tuple.__reduce__(self)
 
     def __repr__(self):
@@ -181,24 +241,18 @@ class Row(tuple):
     def set_grouping(self, grouping):
         # This method is specific to Pysparkling and should not be used by
         # user of the library who wants compatibility with PySpark
-        if self._metadata is None:
-            self.set_metadata({})
-        self._metadata["grouping"] = grouping
-        return self
+        return self.set_metadata(dict(self._metadata or {}, grouping=grouping))
 
     def set_input_file_name(self, input_file_name):
         # This method is specific to Pysparkling and should not be used by
         # user of the library who wants compatibility with PySpark
-        if self._metadata is None:
-            self.set_metadata({})
-        self._metadata["input_file_name"] = input_file_name
-        return self
+        return self.set_metadata(dict(self._metadata or {}, input_file_name=input_file_name))
 
     def set_metadata(self, metadata):
         # This method is specific to Pysparkling and should not be used by
         # user of the library who wants compatibility with PySpark
-        self._metadata = metadata
-        return self
+        # Metadata is stored with the fields of the row: a copy of the row is returned
+        return create_row(self.__fields__, self, metadata)
 
     def get_metadata(self):
         # This method is specific to Pysparkling and should not be used by
@@ -1,6 +1,8 @@
 from collections import namedtuple
+from functools import reduce
 import math
 import numbers
+from operator import add
 
 from ._row import row_from_keyed_values
 from .column import parse
@@ -62,6 +64,36 @@ class ColumnStatHelper:
                 self.update_sample(value)
         return self
 
+    def merge_values(self, values):
+        """
+        Update count, min, max and sum with the values of a batch of rows
+
+        Unlike merge, moments and percentiles are not updated:
+        this is only used by aggregations that do not read them.
+        """
+        values = [value for value in values if value is not None]
+        if not values:
+            return self
+
+        if self.count != 0:
+            self.min_value = min(self.min_value, *values)
+            self.max_value = max(self.max_value, *values)
+        else:
+            self.min_value = min(values)
+            self.max_value = max(values)
+
+        try:
+            # Values are added in order to get the same rounding as merge
+            self.sum_of_values = reduce(add, values, self.sum_of_values)
+        except TypeError:
+            self.sum_of_values = None
+            self.m2 = None
+            self.m3 = None
+            self.m4 = None
+
+        self.count += len(values)
+        return self
+
     def update_counters(self, value):
         if self.count != 0:
             self.min_value = min(self.min_value, value)
@@ -134,6 +166,11 @@ class ColumnStatHelper:
         self.compressed = False
 
     def compress(self):
+        if not self.sampled:
+            # No numeric values
+            self.compressed = True
+            return
+
         merge_threshold = self.merge_threshold()
 
         reverse_compressed_sample = []
@@ -1,5 +1,6 @@
+from ._expressions.compiler import CompiledColumn
 from ._expressions.expressions import Expression
-from ._expressions.fields import find_position_in_schema
+from ._expressions.fields import bind_position, find_position_in_schema
 from ._expressions.literals import Literal
 from ._expressions.mappers import CaseWhen, StarOperator
 from ._expressions.operators import (
@@ -33,6 +34,8 @@ class Column:
 
     def __init__(self, expr):
         self.expr = expr
+        self.binding = None
+        self.compiled = None
 
     # arithmetic operators
     def __neg__(self):
@@ -593,8 +596,14 @@ class Column:
 
     def eval(self, row, schema):
         if isinstance(self.expr, Expression):
+            compiled = self.compiled
+            if compiled is not None and compiled.schema is schema:
+                return compiled.function(row)
             return self.expr.eval(row, schema)
 
+        binding = self.binding
+        if binding is not None and binding.schema is schema:
+            return row[binding.position]
         return row[self.find_position_in_schema(schema)]
 
     def find_fields_in_schema(self, schema):
@@ -651,6 +660,21 @@ class Column:
             self.expr.recursive_initialize(partition_index)
         return self
 
+    def bind(self, schema):
+        """
+        Resolve the columns used by this column to their position in schema
+
+        This is done when a plan is built, evaluations against the same
+        schema object then access rows by position and expressions are
+        compiled to a single function.
+        """
+        if isinstance(self.expr, Expression):
+            self.expr.recursive_bind(schema)
+            self.compiled = CompiledColumn(self, schema)
+        else:
+            self.binding = bind_position(schema, self.expr)
+        return self
+
     def with_pre_evaluation_schema(self, pre_evaluation_schema):
         if isinstance(self.expr, Expression):
             self.expr.recursive_pre_evaluation_schema(pre_evaluation_schema)
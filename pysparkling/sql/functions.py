@@ -226,9 +226,7 @@ def approx_count_distinct(e, rsd=0.05):
     |                      10|
     +------------------------+
     """
-    # NB: This function returns the exact number of distinct values in pysparkling
-    # as it does not rely on HyperLogLogPlusPlus or another estimator
-    return col(ApproxCountDistinct(column=parse(e)))
+    return col(ApproxCountDistinct(column=parse(e), rsd=lit(rsd)))
 
 
 def avg(e):
@@ -0,0 +1,193 @@
+"""
+Columnar execution of DataFrame operations
+
+Partitions can be processed as ColumnBatch: rows that share a Row class
+stored as one list of values per column. Projections, filters and simple
+aggregations whose expressions can be compiled are evaluated on whole
+columns, rows are only created again when an operation needs them.
+"""
+from itertools import compress, groupby, islice
+
+from .._expressions.aggregate.stat_aggregations import Avg, Count, Max, Min, Sum
+from .._expressions.compiler import compile_batch_expression
+from .._expressions.fields import FieldAsExpression
+from .._expressions.mappers import StarOperator
+from .._expressions.operators import Alias
+from .._row import row_class
+from ..column import Column
+
+SIMPLE_AGGREGATIONS = (Count, Max, Min, Sum, Avg)
+
+
+class ColumnBatch:
+    """
+    Rows of a partition stored as a list of values per column
+
+    All these rows are instances of cls, they are created again by rows().
+    """
+    __slots__ = ("row_class", "columns", "size")
+
+    def __init__(self, cls, columns, size):
+        self.row_class = cls
+        self.columns = columns
+        self.size = size
+
+    @property
+    def metadata(self):
+        return getattr(self.row_class, "_metadata", None)
+
+    def rows(self):
+        new_row = tuple.__new__
+        cls = self.row_class
+        if not self.columns:
+            return [new_row(cls, ()) for _ in range(self.size)]
+        return [new_row(cls, values) for values in zip(*self.columns)]
+
+
+class BatchField:
+    """
+    Return the values of a column of the batch as they are
+    """
+    __slots__ = ("position",)
+
+    def __init__(self, position):
+        self.position = position
+
+    def __call__(self, columns, size):
+        return columns[self.position]
+
+
+def to_batches(rows, batch_size):
+    """
+    Group consecutive rows of the same class in ColumnBatch of at most batch_size rows
+    """
+    for cls, same_class_rows in groupby(rows, key=type):
+        while True:
+            chunk = list(islice(same_class_rows, batch_size))
+            if not chunk:
+                break
+            yield ColumnBatch(cls, list(map(list, zip(*chunk))), len(chunk))
+
+
+def to_rows(batches):
+    for batch in batches:
+        yield from batch.rows()
+
+
+def batch_evaluator(col, schema):
+    """
+    Return a function that evaluates col on the columns of a batch of rows of schema
+
+    None is returned if col cannot be evaluated on batches.
+    """
+    node = col
+    while isinstance(node, (Column, Alias)):
+        if not isinstance(node.expr, (Column, Alias, FieldAsExpression)):
+            break
+        node = node.expr
+    binding = getattr(node, "binding", None)
+    if isinstance(node, (Column, FieldAsExpression)) and binding is not None and binding.schema is schema:
+        return BatchField(binding.position)
+    return compile_batch_expression(col, schema)
+
+
+def batch_projection(cols, schema):
+    """
+    Return a function that selects cols from a ColumnBatch of rows of schema
+
+    None is returned if one of the columns cannot be evaluated on batches.
+    """
+    names = []
+    evaluators = []
+    for col in cols:
+        if isinstance(col.expr, StarOperator):
+            schema_names = [field.name for field in schema.fields]
+            # Like StarOperator.eval, duplicated names are resolved to their first position
+            evaluators += [BatchField(schema_names.index(name)) for name in schema_names]
+            names += schema_names
+            continue
+        if col.may_output_multiple_cols or col.may_output_multiple_rows:
+            return None
+        evaluator = batch_evaluator(col, schema)
+        if evaluator is None:
+            return None
+        evaluators.append(evaluator)
+        names += [field.name for field in col.output_fields(schema)]
+
+    names = tuple(names)
+
+    def project(batch):
+        return ColumnBatch(
+            row_class(names, batch.metadata),
+            [evaluate(batch.columns, batch.size) for evaluate in evaluators],
+            batch.size
+        )
+
+    return project
+
+
+def batch_filter(condition, schema):
+    """
+    Return a function that keeps the rows of a ColumnBatch of rows of schema
+    for which condition is true
+
+    None is returned if condition cannot be evaluated on batches.
+    """
+    if condition.may_output_multiple_cols or condition.may_output_multiple_rows:
+        return None
+    evaluator = batch_evaluator(condition, schema)
+    if evaluator is None:
+        return None
+
+    def apply_filter(batch):
+        mask = evaluator(batch.columns, batch.size)
+        if batch.columns:
+            columns = [list(compress(column, mask)) for column in batch.columns]
+            size = len(columns[0])
+        else:
+            columns = []
+            size = sum(1 for keep in mask if keep)
+        return ColumnBatch(batch.row_class, columns, size)
+
+    return apply_filter
+
+
+def simple_aggregation(stat):
+    """
+    Return the aggregation computed by stat if it can be computed on batches, None otherwise
+    """
+    node = stat
+    while isinstance(node, (Column, Alias)):
+        node = node.expr
+    if type(node) in SIMPLE_AGGREGATIONS:
+        return node
+    return None
+
+
+def batch_aggregation(grouping_cols, stats, schema):
+    """
+    Return the evaluators of the grouping columns and of the values
+    aggregated by stats on batches of rows of schema
+
+    None is returned if they cannot be evaluated on batches.
+    """
+    grouping_evaluators = []
+    for col in grouping_cols:
+        if col.may_output_multiple_cols or col.may_output_multiple_rows:
+            return None
+        evaluator = batch_evaluator(col, schema)
+        if evaluator is None:
+            return None
+        grouping_evaluators.append(evaluator)
+
+    value_evaluators = []
+    for stat in stats:
+        aggregation = simple_aggregation(stat)
+        if aggregation is None:
+            return None
+        evaluator = batch_evaluator(aggregation.column, schema)
+        if evaluator is None:
+            return None
+        value_evaluators.append(evaluator)
+
+    return grouping_evaluators, value_evaluators
@@ -1,11 +1,10 @@
 from functools import partial
 import itertools
 
-from ....fileio import TextFile
 from ..._casts import get_caster
 from ..._schema_utils import infer_schema_from_rdd
 from ...internal_utils.options import Options
-from ...internal_utils.readers.utils import guess_schema_from_strings, resolve_partitions
+from ...internal_utils.readers.utils import guess_schema_from_strings, read_records, resolve_partitions
 from ...types import create_row, StringType, StructField, StructType
 
 
@@ -30,13 +29,12 @@ class CSVReader:
 
         partitions, partition_schema = resolve_partitions(paths)
 
-        rdd_filenames = sc.parallelize(sorted(partitions.keys()), len(partitions))
-        rdd = rdd_filenames.flatMap(partial(
-            parse_csv_file,
+        rdd = read_records(sc, partitions, self.options, partial(
+            parse_csv_records,
             partitions,
             partition_schema,
             self.schema,
-            self.options
+            self.options,
         ))
 
         if self.schema is not None:
@@ -73,27 +71,21 @@ class CSVReader:
         )
 
 
-def parse_csv_file(partitions, partition_schema, schema, options, file_name):
-    f_content = TextFile(file_name).load(encoding=options.encoding).read()
-    records = (f_content.split(options.lineSep)
-               if options.lineSep is not None
-               else f_content.splitlines())
+def parse_csv_records(partitions, partition_schema, schema, options, file_name, *, input_name, records):
     if options.header == "true":
-        header = records[0].split(options.sep)
-        records = records[1:]
+        first_record = next(records, None)
+        if first_record is None:
+            return
+        header = first_record.split(options.sep)
     else:
         header = None
 
     null_value = ""
-    rows = []
     for record in records:
         row = csv_record_to_row(
             record, options, schema, header, null_value, partition_schema, partitions[file_name]
         )
-        row.set_input_file_name(file_name)
-        rows.append(row)
-
-    return rows
+        yield row.set_input_file_name(input_name)
 
 
 def csv_record_to_row(record, options, schema=None, header=None,
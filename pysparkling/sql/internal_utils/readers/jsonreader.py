@@ -6,7 +6,7 @@ from ..._casts import get_struct_caster
 from ..._row import create_row, row_from_keyed_values
 from ..._schema_utils import infer_schema_from_rdd
 from ...internal_utils.options import Options
-from ...internal_utils.readers.utils import get_records, resolve_partitions
+from ...internal_utils.readers.utils import read_records, resolve_partitions
 from ...types import StructType
 
 
@@ -44,13 +44,12 @@ class JSONReader:
 
         partitions, partition_schema = resolve_partitions(paths)
 
-        rdd_filenames = sc.parallelize(sorted(partitions.keys()), len(partitions))
-        rdd = rdd_filenames.flatMap(partial(
-            parse_json_file,
+        rdd = read_records(sc, partitions, self.options, partial(
+            parse_json_records,
             partitions,
             partition_schema,
             self.schema,
-            self.options
+            self.options,
         ))
 
         inferred_schema = infer_schema_from_rdd(rdd)
@@ -84,15 +83,11 @@ class JSONReader:
         )
 
 
-def parse_json_file(partitions, partition_schema, schema, options, file_name):
-    records = get_records(file_name, options.linesep, options.encoding)
-    rows = []
+def parse_json_records(partitions, partition_schema, schema, options, file_name, *, input_name, records):
     for record in records:
         partition = partitions[file_name]
         row = parse_record(record, schema, partition, partition_schema, options)
-        row.set_input_file_name(file_name)
-        rows.append(row)
-    return rows
+        yield row.set_input_file_name(input_name)
 
 
 def parse_record(record, schema, partition, partition_schema, options):
@@ -1,9 +1,8 @@
 from functools import partial
 import itertools
 
-from ....fileio import TextFile
 from ...internal_utils.options import Options
-from ...internal_utils.readers.utils import resolve_partitions
+from ...internal_utils.readers.utils import read_records, resolve_partitions
 from ...types import create_row, StringType, StructField, StructType
 
 
@@ -28,13 +27,12 @@ class TextReader:
 
         partitions, partition_schema = resolve_partitions(paths)
 
-        rdd_filenames = sc.parallelize(sorted(partitions.keys()), len(partitions))
-        rdd = rdd_filenames.flatMap(partial(
-            parse_text_file,
+        rdd = read_records(sc, partitions, self.options, partial(
+            parse_text_records,
             partitions,
             partition_schema,
             self.schema,
-            self.options
+            self.options,
         ))
 
         if partition_schema:
@@ -55,19 +53,10 @@ class TextReader:
         )
 
 
-def parse_text_file(partitions, partition_schema, schema, options, file_name):
-    f_content = TextFile(file_name).load(encoding=options.encoding).read()
-    records = (f_content.split(options.lineSep)
-               if options.lineSep is not None
-               else f_content.splitlines())
-
-    rows = []
+def parse_text_records(partitions, partition_schema, schema, options, file_name, *, input_name, records):
     for record in records:
         row = text_record_to_row(record, options, schema, partition_schema, partitions[file_name])
-        row.set_input_file_name(file_name)
-        rows.append(row)
-
-    return rows
+        yield row.set_input_file_name(input_name)
 
 
 def text_record_to_row(record, options, schema, partition_schema, partition):
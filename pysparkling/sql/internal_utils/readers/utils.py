@@ -1,4 +1,9 @@
+from functools import partial
+from io import TextIOWrapper
+
+from ....context import archive_splits, iter_archive_split
 from ....fileio import File, TextFile
+from ....fileio.streams import iter_lines
 from ..._casts import get_caster
 from ..._row import row_from_keyed_values
 from ...types import DecimalType, DoubleType, IntegerType, LongType, StringType, StructField, StructType, TimestampType
@@ -107,7 +112,52 @@ def guess_type_from_values_as_string(values, options):
     )
 
 
-def get_records(f_name, linesep, encoding):
-    f_content = TextFile(f_name).load(encoding=encoding).read()
-    records = f_content.split(linesep) if linesep is not None else f_content.splitlines()
-    return records
+def get_records(f_name, linesep, encoding, read_ahead=0):
+    return TextFile(f_name).lines(encoding=encoding, lineSep=linesep, read_ahead=read_ahead)
+
+
+def read_records(sc, partitions, options, parse_records):
+    """Create an RDD with the rows parsed from the lines of the input files.
+
+    Every file is a partition. With the option ``archiveMembers``, the
+    files in tar and zip archives are read separately and are grouped into
+    ``minPartitions`` partitions of similar size if that option is set.
+
+    :param sc: The :class:`~pysparkling.Context`.
+    :param dict partitions: Partition rows by file name as returned by
+        :func:`resolve_partitions`.
+    :param Options options: Reader options.
+    :param parse_records: Function that takes the file name and the
+        keyword arguments ``input_name``, the name of the input (the file or
+        the archive member), and ``records``, an iterator of lines, and
+        returns the rows.
+    :rtype: RDD
+    """
+    if str(options.get('archiveMembers', False)).lower() == 'true':
+        min_partitions = options.get('minPartitions')
+        splits = archive_splits(sorted(partitions.keys()),
+                                int(min_partitions) if min_partitions else None)
+        return sc.parallelize(splits, len(splits)).flatMap(
+            partial(parse_archive_split, options, parse_records)
+        )
+
+    rdd_filenames = sc.parallelize(sorted(partitions.keys()), len(partitions))
+    return rdd_filenames.mapPartitions(partial(sc._prefetch.flat_map, partial(
+        parse_file,
+        options,
+        parse_records,
+        read_ahead=sc._prefetch.read_ahead,
+    )))
+
+
+def parse_file(options, parse_records, file_name, read_ahead=0):
+    records = get_records(file_name, options.get('lineSep'), options.get('encoding'), read_ahead)
+    return parse_records(file_name, input_name=file_name, records=records)
+
+
+def parse_archive_split(options, parse_records, split):
+    line_sep = options.get('lineSep')
+    newline = None if line_sep is None else ''
+    for file_name, input_name, stream in iter_archive_split(split):
+        with TextIOWrapper(stream, options.get('encoding'), 'ignore', newline) as text:
+            yield from parse_records(file_name, input_name=input_name, records=iter_lines(text, line_sep))
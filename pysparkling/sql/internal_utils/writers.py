@@ -1,9 +1,12 @@
 import collections
 import csv
+import io
 import json
 import os
 import shutil
 
+from ...fileio import File
+from ...fileio.codec import get_codec_suffix, get_path_suffix
 from ...utils import portable_hash
 from .._casts import cast_to_string
 from .._expressions.aggregate.aggregations import Aggregation
@@ -12,7 +15,7 @@ from .._json import get_json_encoder
 from ..functions import col
 from ..internal_utils.options import Options
 from ..internal_utils.readwrite import to_option_stored_value
-from ..types import Row
+from ..types import create_row
 from ..utils import AnalysisException
 
 
@@ -89,9 +92,7 @@ class WriteInFolder(Aggregation):
     def merge(self, row, schema):
         row_value = self.column.eval(row, schema)
         if self.ref_value is None:
-            ref_value = Row(*row_value)
-            ref_value.__fields__ = schema.names
-            self.ref_value = ref_value
+            self.ref_value = create_row(schema.names, row_value)
         self.items.append(
             self.writer.preformat(row_value, schema)
         )
@@ -150,7 +151,11 @@ class DataWriter:
 
     @property
     def compression(self):
-        return None
+        """File ending of the codec of the ``compression`` option or ``""``."""
+        compression = self.options.get("compression")
+        if compression is None or compression.lower() in ("none", "uncompressed"):
+            return ""
+        return get_codec_suffix(compression)
 
     @property
     def encoding(self):
@@ -192,7 +197,6 @@ class DataWriter:
 class CSVWriter(DataWriter):
     def check_options(self):
         unsupported_options = {
-            "compression",
             "encoding",
             "chartoescapequoteescaping",
             "escape",
@@ -291,19 +295,18 @@ class CSVWriter(DataWriter):
         file_path = "/".join(
             [output_path]
             + partition_parts
-            + [f"part-00000-{portable_hash(ref_value)}.csv"]
+            + [f"part-00000-{portable_hash(ref_value)}.csv{self.compression}"]
         )
 
         # pylint: disable=W0511
         # todo: Add support of:
         #  - all files systems (not only local)
-        #  - compression
         #  - encoding
         #  - charToEscapeQuoteEscaping
         #  - escape
         #  - escapeQuotes
 
-        with open(file_path, "w") as f:
+        def write_rows(f):
             writer = csv.writer(
                 f,
                 delimiter=self.sep,
@@ -314,6 +317,8 @@ class CSVWriter(DataWriter):
             if self.header:
                 writer.writerow(schema.names)
             writer.writerows(items)
+
+        write_local_file(file_path, "w", write_rows)
         return len(items)
 
 
@@ -327,7 +332,6 @@ class JSONWriter(DataWriter):
 
     def check_options(self):
         unsupported_options = {
-            "compression",
             "encoding",
             "chartoescapequoteescaping",
             "escape",
@@ -363,11 +367,30 @@ class JSONWriter(DataWriter):
             for col_name in self.partitioning_col_names
         ]
         partition_folder: str = "/".join([output_path] + partition_parts)
-        file_path = f"{partition_folder}/part-00000-{portable_hash(ref_value)}.json"
+        file_path = f"{partition_folder}/part-00000-{portable_hash(ref_value)}.json{self.compression}"
 
         if not os.path.exists(partition_folder):
             os.makedirs(partition_folder)
 
-        with open(file_path, "a") as f:
-            f.writelines(items)
+        write_local_file(file_path, "a", lambda f: f.writelines(items))
         return len(items)
+
+
+def write_local_file(file_path, mode, write):
+    """
+    Call write with a text file object that writes to file_path
+
+    The text is compressed if the file ending has a codec. Compressed
+    files that are appended to contain several streams, e.g. gzip members
+    or zstd frames, which are read as one.
+    """
+    if not get_path_suffix(file_path):
+        with open(file_path, mode) as f:
+            write(f)
+        return
+
+    text = io.StringIO()
+    write(text)
+    compressed = File(file_path).codec.compress_chunks([text.getvalue().encode("utf-8")])
+    with open(file_path, mode + "b") as f:
+        f.writelines(compressed)
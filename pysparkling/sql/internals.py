@@ -14,6 +14,9 @@ from ._statcounter import CovarianceCounter, RowStatHelper
 from ._utils import format_cell, merge_rows, merge_rows_joined_on_values, pad_cell, str_half_width
 from .column import parse
 from .functions import array, collect_set, count, lit, map_from_arrays, rand, struct
+from .internal_utils.batches import (
+    batch_aggregation, batch_filter, batch_projection, simple_aggregation, to_batches, to_rows
+)
 from .internal_utils.column import resolve_column
 from .internal_utils.joins import (
     CROSS_JOIN, FULL_JOIN, INNER_JOIN, LEFT_ANTI_JOIN, LEFT_JOIN, LEFT_SEMI_JOIN, RIGHT_JOIN
@@ -73,6 +76,11 @@ class FieldIdGenerator:
 
 
 class DataFrameInternal:
+    # Projections, filters and simple aggregations are computed on batches of
+    # this number of rows stored by column when their expressions support it.
+    # None disables columnar execution.
+    batch_size = 4096
+
     def __init__(self, sc, rdd, cols=None, convert_to_row=False, schema=None):
         """
         :type rdd: RDD
@@ -84,6 +92,7 @@ class DataFrameInternal:
 
         self._sc = sc
         self._rdd = rdd
+        self._batches = None
         if schema is None and convert_to_row is False:
             raise NotImplementedError(
                 "Schema cannot be None when creating DataFrameInternal from another. "
@@ -111,6 +120,25 @@ class DataFrameInternal:
             schema=schema
         )
 
+    def _with_batches(self, batches, schema):
+        """
+        Return a DataFrameInternal computed by column batches
+
+        Its rows are only created from these batches if they are needed,
+        i.e. unless the next operations support columnar execution.
+        """
+        df = self._with_rdd(batches.mapPartitions(to_rows), schema)
+        df._batches = batches
+        return df
+
+    def batches(self):
+        """
+        Return an RDD of the ColumnBatch of this DataFrame
+        """
+        if self._batches is not None:
+            return self._batches
+        return self._rdd.mapPartitions(partial(to_batches, batch_size=self.batch_size))
+
     def rdd(self):
         return self._rdd
 
@@ -126,6 +154,8 @@ class DataFrameInternal:
         return DataFrameInternal(sc, rdd, ["id"], True)
 
     def count(self):
+        if self._batches is not None:
+            return self._batches.map(lambda batch: batch.size).sum()
         return self._rdd.count()
 
     def collect(self):
@@ -195,6 +225,9 @@ class DataFrameInternal:
         )
 
     def repartition(self, numPartitions, cols):
+        for col in cols:
+            col.bind(self.bound_schema)
+
         def partitioner(row):
             return sum(hash(c.eval(row, self.bound_schema)) for c in cols)
 
@@ -310,10 +343,7 @@ class DataFrameInternal:
             array(*map(lit, fractions.values()))
         )
 
-        return self._with_rdd(
-            self.filter(rand(seed) < fractions_as_col[col]),
-            self.bound_schema
-        )
+        return self.filter(rand(seed) < fractions_as_col[col])
 
     def toJSON(self, use_unicode):
         """
@@ -355,6 +385,15 @@ class DataFrameInternal:
             df_as_group = InternalGroupedDataFrame(self, [])
             return df_as_group.agg(exprs)
 
+        for col in cols:
+            col.bind(self.bound_schema)
+
+        new_schema = get_schema_from_cols(cols, self.bound_schema)
+
+        projection = batch_projection(cols, self.bound_schema) if self.batch_size else None
+        if projection is not None:
+            return self._with_batches(self.batches().map(projection), new_schema)
+
         def select_mapper(partition_index, partition):
             # Initialize non deterministic functions so that they are reproducible
             initialized_cols = [col.initialize(partition_index) for col in cols]
@@ -374,7 +413,6 @@ class DataFrameInternal:
                 generators[0] if generators else None
             )
 
-        new_schema = get_schema_from_cols(cols, self.bound_schema)
         return self._with_rdd(
             self._rdd.mapPartitionsWithIndex(select_mapper),
             schema=new_schema
@@ -419,7 +457,14 @@ class DataFrameInternal:
         raise NotImplementedError("Pysparkling does not currently support DF.selectExpr")
 
     def filter(self, condition):
-        condition = parse(condition)
+        condition = parse(condition).bind(self.bound_schema)
+
+        row_filter = batch_filter(condition, self.bound_schema) if self.batch_size else None
+        if row_filter is not None:
+            return self._with_batches(
+                self.batches().map(row_filter).filter(lambda batch: batch.size),
+                self.bound_schema
+            )
 
         def mapper(partition_index, partition):
             initialized_condition = condition.initialize(partition_index)
@@ -981,26 +1026,17 @@ class InternalGroupedDataFrame:
         self.pivot_values = pivot_values
 
     def agg(self, stats):
+        for col in itertools.chain(self.grouping_cols, stats, [self.pivot_col]):
+            if col is not None:
+                col.bind(self.jdf.bound_schema)
+
         grouping_schema = StructType([
             field
             for col in self.grouping_cols
             for field in col.find_fields_in_schema(self.jdf.bound_schema)
         ])
 
-        aggregated_stats = self.jdf.aggregate(
-            GroupedStats(self.grouping_cols,
-                         stats,
-                         pivot_col=self.pivot_col,
-                         pivot_values=self.pivot_values),
-            lambda grouped_stats, row: grouped_stats.merge(
-                row,
-                self.jdf.bound_schema
-            ),
-            lambda grouped_stats_1, grouped_stats_2: grouped_stats_1.mergeStats(
-                grouped_stats_2,
-                self.jdf.bound_schema
-            )
-        )
+        aggregated_stats = self.aggregate_stats(stats)
 
         data = []
         all_stats = self.add_subtotals(aggregated_stats)
@@ -1062,6 +1098,39 @@ class InternalGroupedDataFrame:
         # noinspection PyProtectedMember
         return self.jdf._with_rdd(self.jdf._sc.parallelize(data), schema=new_schema)
 
+    def aggregate_stats(self, stats):
+        zero_value = GroupedStats(self.grouping_cols,
+                                  stats,
+                                  pivot_col=self.pivot_col,
+                                  pivot_values=self.pivot_values)
+
+        def merge_stats(grouped_stats_1, grouped_stats_2):
+            return grouped_stats_1.mergeStats(grouped_stats_2, self.jdf.bound_schema)
+
+        evaluators = None
+        if self.jdf.batch_size and self.pivot_col is None:
+            evaluators = batch_aggregation(self.grouping_cols, stats, self.jdf.bound_schema)
+        if evaluators is not None:
+            grouping_evaluators, value_evaluators = evaluators
+            return self.jdf.batches().aggregate(
+                zero_value,
+                lambda grouped_stats, batch: grouped_stats.merge_batch(
+                    batch,
+                    grouping_evaluators,
+                    value_evaluators
+                ),
+                merge_stats
+            )
+
+        return self.jdf.aggregate(
+            zero_value,
+            lambda grouped_stats, row: grouped_stats.merge(
+                row,
+                self.jdf.bound_schema
+            ),
+            merge_stats
+        )
+
     def add_subtotals(self, aggregated_stats):
         """
 
@@ -1153,8 +1222,7 @@ class GroupedStats:
             # The order is not used when initialized directly
             self.group_keys = list(groups.keys())
 
-    def merge(self, row, schema):
-        group_key = tuple(col.eval(row, schema) for col in self.grouping_cols)
+    def get_group_stats(self, group_key):
         if group_key not in self.groups:
             group_stats = {
                 pivot_value: [deepcopy(stat) for stat in self.stats]
@@ -1162,8 +1230,12 @@ class GroupedStats:
             }
             self.groups[group_key] = group_stats
             self.group_keys.append(group_key)
-        else:
-            group_stats = self.groups[group_key]
+            return group_stats
+        return self.groups[group_key]
+
+    def merge(self, row, schema):
+        group_key = tuple(col.eval(row, schema) for col in self.grouping_cols)
+        group_stats = self.get_group_stats(group_key)
 
         pivot_value = self.pivot_col.eval(row, schema) if self.pivot_col is not None else None
         if pivot_value in self.pivot_values:
@@ -1172,6 +1244,43 @@ class GroupedStats:
 
         return self
 
+    def merge_batch(self, batch, grouping_evaluators, value_evaluators):
+        """
+        Merge the rows of a ColumnBatch into simple aggregations without pivot
+
+        Only Count, Min, Max, Sum and Avg are merged: the batches update
+        the count, min, max and sum of their stat helpers but neither the
+        moments nor the percentiles that other aggregations read.
+
+        :type batch: ColumnBatch
+        """
+        aggregations = [simple_aggregation(stat) for stat in self.stats]
+        if None in aggregations or self.pivot_col is not None:
+            raise ValueError(
+                f"Batches cannot be merged into {', '.join(str(stat) for stat in self.stats)}"
+            )
+
+        if not batch.size:
+            return self
+
+        values = [evaluate(batch.columns, batch.size) for evaluate in value_evaluators]
+        if grouping_evaluators:
+            groups = {}
+            group_keys = zip(*(evaluate(batch.columns, batch.size) for evaluate in grouping_evaluators))
+            for i, group_key in enumerate(group_keys):
+                groups.setdefault(group_key, []).append(i)
+        else:
+            groups = {(): None}
+
+        for group_key, indices in groups.items():
+            group_stats = self.get_group_stats(group_key)[None]
+            for stat, stat_values in zip(group_stats, values):
+                if indices is not None:
+                    stat_values = [stat_values[i] for i in indices]
+                simple_aggregation(stat).stat_helper.merge_values(stat_values)
+
+        return self
+
     def mergeStats(self, other, schema):
         for group_key in other.group_keys:
             if group_key not in self.group_keys:
@@ -0,0 +1,96 @@
+from copy import deepcopy
+from unittest import TestCase
+
+from pysparkling.sql import functions as F
+from pysparkling.sql._expressions.compiler import compile_expression, function_factory
+from pysparkling.sql._row import Row
+from pysparkling.sql.types import IntegerType, StringType, StructField, StructType
+from pysparkling.sql.utils import AnalysisException
+
+
+class ExpressionCompilerTests(TestCase):
+    schema = StructType([
+        StructField("a", IntegerType()),
+        StructField("b", IntegerType()),
+        StructField("c", StringType()),
+    ])
+    rows = [
+        Row(a=1, b=2, c="x"),
+        Row(a=4, b=None, c=" y "),
+        Row(a=None, b=0, c="xyz"),
+    ]
+
+    def assert_compiled_like_interpreted(self, col):
+        col.bind(self.schema)
+        function = compile_expression(col.expr, self.schema)
+        self.assertIsNotNone(function)
+        for row in self.rows:
+            self.assertEqual(function(row), col.expr.eval(row, self.schema))
+            self.assertEqual(col.eval(row, self.schema), col.expr.eval(row, self.schema))
+
+    def test_arithmetic(self):
+        self.assert_compiled_like_interpreted((F.col("a") + F.col("b")) * 2 - F.col("a") % 3)
+        self.assert_compiled_like_interpreted(F.col("a") / F.col("b"))
+        self.assert_compiled_like_interpreted(F.pow(F.col("b"), 2))
+
+    def test_comparisons(self):
+        self.assert_compiled_like_interpreted((F.col("a") > 1) & (F.col("b") <= 2))
+        self.assert_compiled_like_interpreted(~(F.col("a") == "4") | F.col("b").isNull())
+        self.assert_compiled_like_interpreted(F.col("a").isin(1, 4))
+
+    def test_case_when(self):
+        self.assert_compiled_like_interpreted(
+            F.when(F.col("a") > 3, F.upper(F.col("c")))
+            .when(F.col("b").isNull(), "missing")
+            .otherwise(F.concat(F.col("c"), F.lit("!")))
+        )
+        self.assert_compiled_like_interpreted(F.when(F.col("a") == 1, F.col("b")))
+
+    def test_strings(self):
+        self.assert_compiled_like_interpreted(F.lower(F.trim(F.col("c"))))
+        self.assert_compiled_like_interpreted(F.length(F.col("c")) + F.col("c").substr(2, 1).isNull())
+
+    def test_type_mismatch_is_raised_by_the_expression(self):
+        col = F.col("c") - F.col("a")
+        col.bind(self.schema)
+        with self.assertRaisesRegex(AnalysisException, "data type mismatch"):
+            col.eval(self.rows[0], self.schema)
+
+    def test_unbound_schema_is_interpreted(self):
+        col = F.col("a") + 1
+        col.bind(self.schema)
+        other_schema = StructType([StructField("z", IntegerType()), *self.schema.fields])
+        self.assertEqual(col.eval(Row("z", "a", "b", "c")(0, 1, 2, "x"), other_schema), 2)
+
+    def test_unsupported_nodes_are_interpreted(self):
+        col = F.abs(F.col("a") - 3) + 1
+        col.bind(self.schema)
+        self.assertEqual(col.eval(self.rows[0], self.schema), 3)
+
+        col = F.abs(F.col("a"))
+        col.bind(self.schema)
+        self.assertIsNone(compile_expression(col.expr, self.schema))
+        self.assertEqual(col.eval(self.rows[0], self.schema), 1)
+        self.assertIsNone(col.compiled)
+
+    def test_code_is_shared_by_expressions_of_the_same_shape(self):
+        first = F.col("b") * 17 + F.col("a")
+        second = F.col("b") * 19 + F.col("a")
+        first.bind(self.schema)
+        second.bind(self.schema)
+
+        self.assertEqual(first.eval(self.rows[0], self.schema), 35)
+        hits = function_factory.cache_info().hits
+        self.assertEqual(second.eval(self.rows[0], self.schema), 39)
+        self.assertEqual(function_factory.cache_info().hits, hits + 1)
+
+    def test_copies_compile_their_own_nodes(self):
+        col = F.col("a") * 2
+        col.bind(self.schema)
+        col.eval(self.rows[0], self.schema)
+
+        copy = deepcopy(col)
+        self.assertIsNot(copy.compiled, col.compiled)
+        self.assertIs(copy.compiled.column, copy)
+        self.assertIs(copy.compiled.schema, self.schema)
+        self.assertEqual(copy.eval(self.rows[1], self.schema), 8)
@@ -1,6 +1,9 @@
 import pytest
 
+from pysparkling.sql import functions as F
 from pysparkling.sql import SparkSession
+from pysparkling.sql.functions import approx_count_distinct, col
+from pysparkling.sql.internals import DataFrameInternal
 
 
 @pytest.fixture(name='spark')
@@ -44,3 +47,63 @@ def test_df_show(df, capsys):
 """).lstrip()
 
     assert captured.out == expected
+
+
+def test_approx_count_distinct_over_partitions(df):
+    result = df.repartition(3).select(
+        approx_count_distinct('salary').alias('salaries'),
+        approx_count_distinct('gender', 0.01).alias('genders'),
+    ).collect()
+
+    assert result[0].salaries == 3
+    assert result[0].genders == 2
+
+
+def test_bound_column_reused_on_another_schema(df):
+    salary = col('salary')
+    first = df.select(salary).collect()
+    assert salary.binding.position == 5
+
+    reordered = df.select('salary', 'firstname')
+    second = reordered.filter(salary > 3000).select('firstname').collect()
+
+    assert [row.salary for row in first] == [3000, 4000, 4000, 4000, -1]
+    assert [row.firstname for row in second] == ['Michael', 'Robert', 'Maria']
+
+
+def run_queries(df):
+    adults = df.filter(col('dob') < '2000-01-01')
+    return [
+        adults.select('firstname', (col('salary') * 2 + 1).alias('double_salary')).collect(),
+        df.withColumn('is_woman', col('gender') == 'F').filter('is_woman').collect(),
+        df.groupBy('gender').agg(
+            F.sum('salary'), F.avg('salary'), F.min('lastname'), F.max('salary'), F.count('*')
+        ).orderBy('gender').collect(),
+        adults.agg(F.count('middlename'), F.sum(F.when(col('salary') > 3500, 1).otherwise(0))).collect(),
+        adults.count(),
+        df.groupBy('gender').agg(
+            F.sum('salary'), F.stddev('salary'), F.skewness('salary'), F.kurtosis('salary')
+        ).orderBy('gender').collect(),
+        df.summary('count', 'mean', 'stddev', 'min', '25%', '50%', '75%', 'max').collect(),
+    ]
+
+
+def test_columnar_execution_matches_rows(df, monkeypatch):
+    columnar_results = run_queries(df.repartition(2))
+
+    monkeypatch.setattr(DataFrameInternal, 'batch_size', None)
+    assert run_queries(df.repartition(2)) == columnar_results
+
+
+def test_columnar_execution_only_creates_rows_when_needed(df):
+    selected = df.select('firstname', (col('salary') + 1).alias('salary')).filter(col('salary') > 3500)
+
+    # noinspection PyProtectedMember
+    assert selected._jdf._batches is not None
+    assert selected.count() == 3
+    assert [row.firstname for row in selected.collect()] == ['Michael', 'Robert', 'Maria']
+
+    exploded = selected.select(F.explode(F.array('salary')))
+    # noinspection PyProtectedMember
+    assert exploded._jdf._batches is None
+    assert exploded.count() == 3
@@ -1,5 +1,8 @@
 import datetime
+import io
 import os
+import tarfile
+import tempfile
 from unittest import TestCase
 
 from pysparkling import Context, Row
@@ -134,3 +137,23 @@ class DataFrameReaderTests(TestCase):
                  city='San Francisco', state='CA', fundedDate=datetime.date(2006, 12, 1),
                  raisedAmt=8500000, raisedCurrency='USD', round='b')]
         )
+
+    def test_csv_read_archive_members(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "data.tar.gz")
+            with tarfile.open(archive, "w:gz") as tar:
+                for i in range(3):
+                    content = f"a,b\n{i},{i * 10}\n{i + 1},{i * 10 + 1}\n".encode()
+                    info = tarfile.TarInfo(f"part-{i}.csv")
+                    info.size = len(content)
+                    tar.addfile(info, io.BytesIO(content))
+
+            df = (spark.read
+                  .option("archiveMembers", "true")
+                  .option("minPartitions", "2")
+                  .csv(archive, header=True))
+            self.assertEqual(df.rdd.getNumPartitions(), 2)
+            self.assertEqual(
+                sorted(r.asDict()["a"] for r in df.collect()),
+                ["0", "1", "1", "2", "2", "3"]
+            )
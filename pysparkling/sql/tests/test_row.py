@@ -0,0 +1,60 @@
+import pickle
+from unittest import TestCase
+
+from pysparkling.sql._row import create_row, row_class
+from pysparkling.sql.types import Row
+
+
+class RowTests(TestCase):
+    def test_rows_of_a_schema_share_their_fields(self):
+        first = create_row(["name", "age"], ["Alice", 11])
+        second = create_row(("name", "age"), ["Bob", 12])
+
+        self.assertIs(type(first), type(second))
+        self.assertIsInstance(first, Row)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertEqual((second.name, second["age"]), ("Bob", 12))
+
+    def test_field_lookup(self):
+        row = create_row(["a", "b", "a"], [1, 2, 3])
+
+        self.assertEqual(row.a, 1)
+        self.assertEqual(row["b"], 2)
+        self.assertIn("b", row)
+        self.assertNotIn("c", row)
+        with self.assertRaises(ValueError):
+            row["c"]  # pylint: disable=pointless-statement
+        with self.assertRaises(AttributeError):
+            row.c  # pylint: disable=pointless-statement
+
+    def test_row_is_read_only(self):
+        row = Row(a=1)
+        with self.assertRaisesRegex(Exception, "read-only"):
+            row.a = 2
+
+    def test_metadata_returns_a_new_row(self):
+        row = create_row(["a"], [1])
+        with_file_name = row.set_input_file_name("part-0.csv").set_grouping((True,))
+
+        self.assertIsNone(row.get_metadata())
+        self.assertEqual(with_file_name, row)
+        self.assertEqual(with_file_name.get_metadata(), {"input_file_name": "part-0.csv", "grouping": (True,)})
+        self.assertIs(type(with_file_name), row_class(("a",), {"input_file_name": "part-0.csv", "grouping": (True,)}))
+
+    def test_unhashable_metadata(self):
+        row = create_row(["a"], [1], metadata={"grouping": [True]})
+        self.assertEqual(row.get_metadata(), {"grouping": [True]})
+        self.assertIs(type(row), type(create_row(["a"], [2], metadata={"grouping": [True]})))
+        self.assertIsNot(type(row), type(create_row(["a"], [2], metadata={"grouping": (True,)})))
+
+    def test_pickle_writes_fields_once(self):
+        fields = [f"field_with_a_long_name_{i}" for i in range(10)]
+        rows = [create_row(fields, range(i, i + 10), {"input_file_name": "f.csv"}) for i in range(100)]
+
+        data = pickle.dumps(rows)
+        self.assertEqual(data.count(b"field_with_a_long_name_0"), 1)
+
+        unpickled = pickle.loads(data)
+        self.assertEqual(unpickled, rows)
+        self.assertEqual(unpickled[-1].field_with_a_long_name_9, 108)
+        self.assertEqual(unpickled[-1].get_metadata(), {"input_file_name": "f.csv"})
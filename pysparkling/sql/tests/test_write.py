@@ -1,4 +1,6 @@
 import datetime
+import glob
+import gzip
 import os
 import shutil
 from unittest import TestCase
@@ -114,6 +116,19 @@ class DataFrameWriterTests(TestCase):
             }
         )
 
+    def test_write_to_json_with_compression(self):
+        df = spark.createDataFrame(
+            [Row(age=2, name='Alice'),
+             Row(age=5, name='Bob')]
+        )
+        df.write.json(".tmp/wonderland/", compression="gzip")
+        file_path, = glob.glob(".tmp/wonderland/part-00000-*.json.gz")
+        with gzip.open(file_path, "rt") as f:
+            self.assertEqual(
+                f.readlines(),
+                ['{"age":2,"name":"Alice"}\n', '{"age":5,"name":"Bob"}\n']
+            )
+
     def test_write_nested_rows_to_json(self):
         df = spark.createDataFrame([
             Row(age=2, name='Alice', animals=[
@@ -0,0 +1,101 @@
+import logging
+
+import pytest
+
+from pysparkling import Context
+from pysparkling.fileio import File, TextFile
+from pysparkling.fileio.fs import gs
+
+
+class InMemoryBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = None
+
+    @property
+    def size(self):
+        data = self.bucket.objects.get(self.name)
+        return None if data is None else len(data)
+
+    def download_as_string(self):
+        return self.bucket.objects[self.name]
+
+    def download_to_file(self, file_obj, client=None, start=None, end=None):
+        self.bucket.ranges.append((start, end))
+        file_obj.write(self.bucket.objects[self.name][start:end + 1])
+
+    def upload_from_file(self, file_obj, content_type=None):
+        self.bucket.upload_chunk_sizes.append(self.chunk_size)
+        self.bucket.objects[self.name] = file_obj.read()
+
+
+class InMemoryBucket:
+    def __init__(self):
+        self.objects = {}
+        self.ranges = []
+        self.upload_chunk_sizes = []
+
+    def get_blob(self, blob_name):
+        return InMemoryBlob(self, blob_name) if blob_name in self.objects else None
+
+    def blob(self, blob_name):
+        return InMemoryBlob(self, blob_name)
+
+    def list_blobs(self, prefix=None):
+        return [InMemoryBlob(self, name) for name in sorted(self.objects) if name.startswith(prefix or '')]
+
+
+class InMemoryClient:
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def get_bucket(self, bucket_name):
+        return self.bucket
+
+
+@pytest.fixture(name='bucket')
+def fixture_bucket(monkeypatch):
+    b = InMemoryBucket()
+    # the client is never created, gcloud does not need to be installed
+    monkeypatch.setattr(gs, 'storage', object())
+    monkeypatch.setitem(gs.GS._clients, 'project', InMemoryClient(b))
+    monkeypatch.setattr(gs.GS, 'chunk_size', 1000)
+    return b
+
+
+def test_ranged_download(bucket):
+    data = bytes(range(256)) * 20
+    File('gs://project:bucket/data.bin').dump(data)
+    assert bucket.objects['data.bin'] == data
+    assert bucket.upload_chunk_sizes == [1000]
+
+    with File('gs://project:bucket/data.bin').load() as stream:
+        assert stream.read() == data
+    assert bucket.ranges == [(i, min(i + 1000, len(data)) - 1) for i in range(0, len(data), 1000)]
+
+
+def test_split_textFile(bucket):
+    lines = [f'line {i}' for i in range(1000)]
+    TextFile('gs://project:bucket/lines.txt').dump('\n'.join(lines))
+    rdd = Context().textFile('gs://project:bucket/lines.txt', minPartitions=3)
+    assert rdd.collect() == lines
+    # every split starts with a range request at its offset
+    starts = [start for start, _ in bucket.ranges]
+    assert 2963 in starts and 5926 in starts
+    assert all(end - start < 1000 for start, end in bucket.ranges)
+
+
+def test_download_without_ranges(bucket, monkeypatch, caplog):
+    def download_to_file(self, file_obj, client=None):
+        file_obj.write(self.bucket.objects[self.name])
+
+    monkeypatch.setattr(InMemoryBlob, 'download_to_file', download_to_file)
+    data = bytes(range(256)) * 20
+    File('gs://project:bucket/data.bin').dump(data)
+
+    with caplog.at_level(logging.WARNING, logger=gs.__name__):
+        with File('gs://project:bucket/data.bin').load() as stream:
+            assert stream.read() == data
+    assert 'cannot download ranges' in caplog.text
+    assert not bucket.ranges
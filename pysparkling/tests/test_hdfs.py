@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+
+import pytest
+
+from pysparkling import Context
+from pysparkling.fileio import File, TextFile
+from pysparkling.fileio.fs import Hdfs
+
+pytest.importorskip('hdfs')
+
+
+class InMemoryHdfsClient:
+    def __init__(self):
+        self.files = {}
+        self.reads = []
+
+    @contextmanager
+    def read(self, hdfs_path, offset=0, chunk_size=0):
+        self.reads.append((hdfs_path, offset))
+        data = self.files[hdfs_path][offset:]
+        yield (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+
+    def write(self, hdfs_path, data=None):
+        self.files[hdfs_path] = b''.join(data)
+
+    def list(self, hdfs_path, status=False):
+        return [(path[len(hdfs_path):], self.status(path))
+                for path in sorted(self.files) if path.startswith(hdfs_path)]
+
+    def status(self, hdfs_path):
+        return {'length': len(self.files[hdfs_path]), 'type': 'FILE'}
+
+
+@pytest.fixture(name='client')
+def fixture_client(monkeypatch):
+    c = InMemoryHdfsClient()
+    monkeypatch.setitem(Hdfs._conn, 'localhost__50070', c)
+    return c
+
+
+def test_streaming_roundtrip(client):
+    data = bytes(range(256)) * 1000
+    File('hdfs://localhost/data.bin').dump(data)
+    with File('hdfs://localhost/data.bin').load() as stream:
+        assert stream.read() == data
+
+
+def test_split_textFile(client):
+    lines = [f'line {i}' for i in range(1000)]
+    TextFile('hdfs://localhost/lines.txt').dump('\n'.join(lines))
+    rdd = Context().textFile('hdfs://localhost/lines.txt', minPartitions=3)
+    assert rdd.collect() == lines
+    assert sorted(offset for _, offset in client.reads) == [0, 2963, 5926]
@@ -0,0 +1,85 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import socketserver
+import threading
+
+import pytest
+
+from pysparkling import Context
+from pysparkling.fileio import File
+
+pytest.importorskip('requests')
+
+CONTENT = '\n'.join(f'line {i}' for i in range(1000)).encode()
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer is only available from Python 3.7 on
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clients = set()
+        self.ranges = []
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_HEAD(self):
+        self.server.clients.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(CONTENT)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.clients.add(self.client_address)
+        body = CONTENT
+        byte_range = self.headers.get('Range')
+        if byte_range:
+            self.server.ranges.append(byte_range)
+            start = int(byte_range[len('bytes='):].split('-')[0])
+            body = CONTENT[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(name='server')
+def fixture_server():
+    s = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    thread = threading.Thread(target=s.serve_forever, daemon=True)
+    thread.start()
+    yield s
+    s.shutdown()
+    s.server_close()
+
+
+def test_range_requests(server):
+    url = f'http://127.0.0.1:{server.server_port}/data.txt'
+    with File(url).load(start=100) as stream:
+        assert stream.read() == CONTENT[100:]
+    assert server.ranges == ['bytes=100-']
+
+
+def test_split_http_textFile(server):
+    url = f'http://127.0.0.1:{server.server_port}/data.txt'
+    rdd = Context().textFile(url, minPartitions=3)
+    assert rdd.getNumPartitions() == 3
+    assert rdd.collect() == CONTENT.decode().split('\n')
+    assert len(server.ranges) == 2
+
+
+def test_connection_reuse(server):
+    url = f'http://127.0.0.1:{server.server_port}/data.txt'
+    for _ in range(5):
+        with File(url).load() as stream:
+            assert stream.read() == CONTENT
+    assert len(server.clients) == 1
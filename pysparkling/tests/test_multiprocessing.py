@@ -97,6 +97,21 @@ class ThreadPool(unittest.TestCase, LazyTestInjection):
         r = self.sc.parallelize([1, 3, 4]).map(math.sqrt).collect()
         self.assertIn(2, r)
 
+    def test_sumApprox_timeout(self):
+        def slow_partition(i, x):
+            if i >= 4:
+                time.sleep(2.0)
+            return x
+
+        rdd = self.sc.parallelize([1.0] * 80, 8).mapPartitionsWithIndex(slow_partition)
+
+        start = time.time()
+        r = rdd.sumApprox(500)
+        self.assertLess(time.time() - start, 1.5)
+        self.assertEqual(r.confidence, 0.95)
+        self.assertLess(r.low, 80.0)
+        self.assertGreater(r.high, 80.0)
+
 
 class ProcessPool(unittest.TestCase):  # cannot work here: LazyTestInjection):
     def setUp(self):
@@ -124,6 +139,13 @@ class ProcessPool(unittest.TestCase):  # cannot work here: LazyTestInjection):
              .collect())
         self.assertIn((4, 2), r)
 
+    def test_copartitioned_cogroup(self):
+        a = self.sc.parallelize([(i % 5, i) for i in range(20)]).partitionBy(3)
+        b = self.sc.parallelize([(i % 7, -i) for i in range(20)]).partitionBy(3)
+        r = dict(a.cogroup(b).mapValues(lambda vs: (len(vs[0]), len(vs[1]))).collect())
+        self.assertEqual(r[4], (4, 3))
+        self.assertEqual(r[6], (0, 2))
+
     def test_cache(self):
         to_check = list(range(5))
         r = self.sc.parallelize(to_check, 3)
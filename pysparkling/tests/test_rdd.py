@@ -1,4 +1,5 @@
 from operator import add
+import time
 import unittest
 
 from pysparkling import Context
@@ -253,6 +254,143 @@ class RDDTest(unittest.TestCase):
         for k, v in expected_group:
             self.assertEqual(grouped_dict[k], v)
 
+    def test_top_and_takeOrdered(self):
+        data = [7, 3, 9, 1, 8, 2, 6, 4, 5, 0]
+        rdd = self.context.parallelize(data, 15)
+
+        self.assertEqual(rdd.top(3), [9, 8, 7])
+        self.assertEqual(rdd.takeOrdered(3), [0, 1, 2])
+        self.assertEqual(rdd.top(3, key=lambda x: -x), [0, 1, 2])
+        self.assertEqual(rdd.takeOrdered(3, key=lambda x: -x), [9, 8, 7])
+        self.assertEqual(rdd.takeOrdered(20), sorted(data))
+        self.assertEqual(self.context.parallelize([], 3).top(2), [])
+
+    def test_countApproxDistinct(self):
+        rdd = self.context.parallelize([i % 500 for i in range(5000)], 8)
+
+        n = rdd.countApproxDistinct(relativeSD=0.01)
+        self.assertTrue(480 < n < 520)
+        self.assertRaises(ValueError, rdd.countApproxDistinct, 0.5)
+
+    def test_approx_actions_with_timeout(self):
+        def slow_partition(i, x):
+            time.sleep(0.2)
+            return x
+
+        rdd = self.context.parallelize(range(100), 10).mapPartitionsWithIndex(slow_partition)
+
+        start = time.time()
+        r = rdd.meanApprox(300)
+        self.assertLess(time.time() - start, 1.0)
+        self.assertLess(r.confidence, 1.0)
+        self.assertLess(r.low, r)
+        self.assertLess(r, r.high)
+
+        self.assertLess(rdd.countApprox(300), 1000)
+        self.assertEqual(rdd.countApprox(), 100)
+        self.assertEqual(rdd.sumApprox(), 4950)
+
+    def test_treeAggregate(self):
+        rdd = self.context.parallelize(range(1000), 100)
+
+        def seqOp(x, y):
+            return x[0] + y, x[1] + 1
+
+        def combOp(x, y):
+            return x[0] + y[0], x[1] + y[1]
+
+        for depth in (1, 2, 3, 10):
+            self.assertEqual(rdd.treeAggregate((0, 0), seqOp, combOp, depth), (499500, 1000))
+        self.assertRaises(ValueError, rdd.treeAggregate, (0, 0), seqOp, combOp, 0)
+
+    def test_treeAggregate_runs_one_job(self):
+        rdd = self.context.parallelize(range(1000), 100)
+        jobs = []
+        run_job = self.context.runJob
+
+        def count_jobs(*args, **kwargs):
+            jobs.append(args[0])
+            return run_job(*args, **kwargs)
+
+        self.context.runJob = count_jobs
+        self.assertEqual(rdd.treeAggregate(0, add, add, 3), 499500)
+        self.assertEqual(len(jobs), 1)
+        self.assertLess(jobs[0].getNumPartitions(), 100)
+
+    def test_treeReduce_empty(self):
+        rdd = self.context.parallelize([], 10)
+        self.assertRaises(ValueError, rdd.treeReduce, add)
+
+    def test_partitioner_preserved(self):
+        rdd = self.context.parallelize([(i % 10, i) for i in range(100)]).partitionBy(4)
+        self.assertEqual(rdd.partitioner.numPartitions, 4)
+        self.assertEqual(rdd.mapValues(str).filter(bool).partitioner, rdd.partitioner)
+        self.assertIsNone(rdd.map(lambda kv: (kv[1], kv[0])).partitioner)
+        self.assertIs(rdd.partitionBy(4), rdd)
+
+    def test_lookup_computes_one_partition(self):
+        computed = []
+
+        def track(i, x):
+            computed.append(i)
+            return x
+
+        rdd = (self.context.parallelize([(i % 10, i) for i in range(100)])
+               .partitionBy(4)
+               .mapPartitionsWithIndex(track, preservesPartitioning=True))
+
+        self.assertEqual(sorted(rdd.lookup(3)), list(range(3, 100, 10)))
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(rdd.lookup(42), [])
+
+    def test_lookup_range_partitioned(self):
+        rdd = self.context.parallelize([(i % 10, i) for i in range(100)], 3)
+        for ascending in (True, False):
+            sorted_rdd = rdd.sortByKey(ascending=ascending, numPartitions=4)
+            self.assertEqual(sorted_rdd.getNumPartitions(), 4)
+            self.assertEqual(sorted_rdd.keys().collect(),
+                             sorted(rdd.keys().collect(), reverse=not ascending))
+            self.assertEqual(sorted(sorted_rdd.lookup(7)), list(range(7, 100, 10)))
+            resorted = rdd.sortByKey(ascending=ascending, numPartitions=4)
+            self.assertIsNot(resorted.partitioner, sorted_rdd.partitioner)
+            self.assertEqual(len({resorted.partitioner, sorted_rdd.partitioner}), 1)
+
+    def test_copartitioned_join(self):
+        x = self.context.parallelize([('a', 1), ('b', 2), ('b', 3), ('c', 4)]).partitionBy(3)
+        y = self.context.parallelize([('b', 5), ('c', 6), ('c', 7), ('d', 8)]).partitionBy(3)
+
+        self.assertEqual(len({x.partitioner, y.partitioner}), 1)
+        joined = x.join(y)
+        self.assertEqual(joined.partitioner, x.partitioner)
+        self.assertEqual(sorted(joined.collect()), [
+            ('b', (2, 5)), ('b', (3, 5)), ('c', (4, 6)), ('c', (4, 7)),
+        ])
+        self.assertEqual(sorted(x.leftOuterJoin(y).collect()), [
+            ('a', (1, None)), ('b', (2, 5)), ('b', (3, 5)), ('c', (4, 6)), ('c', (4, 7)),
+        ])
+        self.assertEqual(sorted(x.rightOuterJoin(y).collect()), [
+            ('b', (2, 5)), ('b', (3, 5)), ('c', (4, 6)), ('c', (4, 7)), ('d', (None, 8)),
+        ])
+        self.assertEqual(sorted(x.fullOuterJoin(y).collect()), [
+            ('a', (1, None)), ('b', (2, 5)), ('b', (3, 5)), ('c', (4, 6)), ('c', (4, 7)),
+            ('d', (None, 8)),
+        ])
+
+    def test_pipe(self):
+        rdd = self.context.parallelize(range(10000), 3)
+        self.assertEqual(rdd.pipe('cat').map(int).collect(), list(range(10000)))
+        self.assertEqual(rdd.pipe('wc -l').collect(), ['3333', '3333', '3334'])
+
+    def test_pipe_env(self):
+        rdd = self.context.parallelize(['a'])
+        self.assertEqual(rdd.pipe('sh -c "echo $PIPE_TEST"', env={'PIPE_TEST': 'b'}).collect(), ['b'])
+
+    def test_pipe_checkCode(self):
+        context = Context(max_retries=1)
+        self.assertEqual(context.parallelize(['a']).pipe('false').collect(), [])
+        with self.assertRaises(RuntimeError):
+            context.parallelize(['a']).pipe('false', checkCode=True).collect()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,10 @@
 import os
+import tempfile
 
 import pytest
 
 from pysparkling.fileio import File
+from pysparkling.fileio.fs import listing, Local
 
 CURRENT_FILE_LOCATION = __file__
 
@@ -54,6 +56,73 @@ def test_local_2():
     assert filenames == [CURRENT_FILE_LOCATION]
 
 
+def _make_tree(root, paths):
+    for p in paths:
+        path = os.path.join(root, *p.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf8') as f:
+            f.write(p)
+
+
+def test_local_pruning(monkeypatch):
+    with tempfile.TemporaryDirectory() as root:
+        _make_tree(root, [
+            'logs/2024-01/a.gz', 'logs/2024-01/deep/b.gz', 'logs/2024-02/c.gz',
+            'logs/2023-12/d.gz', 'logs/2023-12/deep/e.gz',
+            'data/part-00000', 'data/part-00001', 'data/_SUCCESS',
+        ])
+
+        listed = []
+        list_dir = Local._list_dir
+        monkeypatch.setattr(Local, '_list_dir', staticmethod(lambda p: listed.append(p) or list_dir(p)))
+
+        filenames = File.resolve_filenames(os.path.join(root, 'logs', '2024-0?', '*.gz'))
+        assert sorted(os.path.relpath(f, root) for f in filenames) == [
+            os.path.join('logs', '2024-01', 'a.gz'),
+            os.path.join('logs', '2024-01', 'deep', 'b.gz'),
+            os.path.join('logs', '2024-02', 'c.gz'),
+        ]
+        assert not any('2023' in p for p in listed)
+
+        for expr in ('data', 'dat?'):
+            filenames = File.resolve_filenames(os.path.join(root, expr))
+            assert sorted(os.path.basename(f) for f in filenames) == ['part-00000', 'part-00001']
+
+        content = File.get_content([os.path.join(root, 'logs', '2023-*')])
+        assert sorted(os.path.basename(f) for f in content) == ['d.gz', 'e.gz']
+
+
+def test_local_symlink_loop():
+    with tempfile.TemporaryDirectory() as root:
+        _make_tree(root, ['data/a.txt', 'data/sub/b.txt'])
+        try:
+            os.symlink(os.path.join(root, 'data'), os.path.join(root, 'data', 'sub', 'loop'))
+        except (OSError, NotImplementedError):
+            pytest.skip('symbolic links are not supported')
+
+        expected = [os.path.join('data', 'a.txt'), os.path.join('data', 'sub', 'b.txt')]
+        filenames = File.resolve_filenames(os.path.join(root, 'data', '*.txt'))
+        assert sorted(os.path.relpath(f, root) for f in filenames) == expected
+        content = File.get_content([os.path.join(root, 'data')])
+        assert sorted(os.path.relpath(f, root) for f in content) == expected
+
+
+def test_listing_cache():
+    cache = listing.listing_cache
+    with tempfile.TemporaryDirectory() as root:
+        _make_tree(root, ['a.txt'])
+        try:
+            cache.ttl = 60
+            assert len(File.resolve_filenames(os.path.join(root, '*.txt'))) == 1
+            _make_tree(root, ['b.txt'])
+            assert len(File.resolve_filenames(os.path.join(root, '*.txt'))) == 1
+            cache.invalidate()
+            assert len(File.resolve_filenames(os.path.join(root, '*.txt'))) == 2
+        finally:
+            cache.ttl = None
+            cache.invalidate()
+
+
 @pytest.mark.skipif(not os.getenv('AWS_ACCESS_KEY_ID'), reason='no AWS env')
 def test_s3_1():
     filenames = File.resolve_filenames(
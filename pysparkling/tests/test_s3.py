@@ -0,0 +1,149 @@
+from hashlib import md5
+import io
+import threading
+
+import pytest
+
+from pysparkling import Context
+from pysparkling.fileio import File, TextFile
+from pysparkling.fileio.fs import S3
+
+pytest.importorskip('boto')
+
+
+class InMemoryS3Key:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self._stream = None
+
+    @property
+    def size(self):
+        data = self.bucket.objects.get(self.name)
+        return None if data is None else len(data)
+
+    @property
+    def etag(self):
+        data = self.bucket.objects.get(self.name)
+        return None if data is None else f'"{md5(data).hexdigest()}"'
+
+    def get_contents_as_string(self, headers=None):
+        data = self.bucket.objects[self.name]
+        if not headers or 'Range' not in headers:
+            return data
+
+        self.bucket.ranged_gets.append(headers)
+        assert headers.get('If-Match', self.etag) == self.etag
+        start, end = headers['Range'][len('bytes='):].split('-')
+        return data[int(start):int(end) + 1]
+
+    def read(self, size):
+        if self._stream is None:
+            self._stream = io.BytesIO(self.bucket.objects[self.name])
+        return self._stream.read(size)
+
+    def close(self):
+        self._stream = None
+
+    def set_contents_from_file(self, fp, query_args=None, **kwargs):
+        data = fp.read()
+        if query_args is None:
+            self.bucket.objects[self.name] = data
+            return
+
+        args = dict(arg.split('=') for arg in query_args.split('&'))
+        with self.bucket.lock:
+            self.bucket.uploads[args['uploadId']][int(args['partNumber'])] = data
+
+
+class InMemoryMultiPartUpload:
+    def __init__(self, bucket, key_name, upload_id):
+        self.bucket = bucket
+        self.key_name = key_name
+        self.id = upload_id
+
+    def complete_upload(self):
+        parts = self.bucket.uploads.pop(self.id)
+        self.bucket.objects[self.key_name] = b''.join(parts[n] for n in sorted(parts))
+        self.bucket.completed_uploads += 1
+
+    def cancel_upload(self):
+        self.bucket.uploads.pop(self.id)
+
+
+class InMemoryS3Bucket:
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.lock = threading.Lock()
+        self.ranged_gets = []
+        self.completed_uploads = 0
+        self.key_lookups = 0
+
+    def get_key(self, name):
+        self.key_lookups += 1
+        return InMemoryS3Key(self, name) if name in self.objects else None
+
+    def new_key(self, name):
+        return InMemoryS3Key(self, name)
+
+    def list(self, prefix=''):
+        return [InMemoryS3Key(self, name) for name in sorted(self.objects) if name.startswith(prefix)]
+
+    def initiate_multipart_upload(self, key_name):
+        upload_id = str(len(self.uploads) + self.completed_uploads)
+        self.uploads[upload_id] = {}
+        return InMemoryMultiPartUpload(self, key_name, upload_id)
+
+
+class InMemoryS3Connection:
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def get_bucket(self, bucket_name, validate=True):
+        return self.bucket
+
+
+@pytest.fixture(name='bucket')
+def fixture_bucket(monkeypatch):
+    b = InMemoryS3Bucket()
+    conn = InMemoryS3Connection(b)
+    monkeypatch.setattr(S3, '_get_conn', classmethod(lambda cls: conn))
+    monkeypatch.setattr(S3, '_get_thread_conn', classmethod(lambda cls: conn))
+    monkeypatch.setattr(S3, 'part_size', 10)
+    monkeypatch.setattr(S3, 'max_concurrency', 3)
+    return b
+
+
+def test_lazy_key(bucket):
+    f = File('s3://bucket/data.bin')
+    assert bucket.key_lookups == 0
+    assert not f.size()
+    assert bucket.key_lookups == 1
+
+
+def test_multipart_upload_and_ranged_download(bucket):
+    data = bytes(range(95))
+    File('s3://bucket/data.bin').dump(data)
+    assert bucket.completed_uploads == 1
+    assert bucket.objects['data.bin'] == data
+
+    with File('s3://bucket/data.bin').load() as stream:
+        assert stream.read() == data
+    assert len(bucket.ranged_gets) == 10
+    assert all('If-Match' in headers for headers in bucket.ranged_gets)
+
+
+def test_small_objects(bucket):
+    File('s3://bucket/small.bin').dump(b'small')
+    assert bucket.completed_uploads == 0
+
+    with File('s3://bucket/small.bin').load() as stream:
+        assert stream.read() == b'small'
+    assert not bucket.ranged_gets
+
+
+def test_textFile(bucket):
+    lines = [f'line {i}' for i in range(50)]
+    TextFile('s3://bucket/lines.txt').dump('\n'.join(lines))
+    assert Context().textFile('s3://bucket/lines.txt', minPartitions=2).collect() == lines
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 import pysparkling
@@ -10,6 +11,30 @@ def test_trivial_sample():
     assert sampled == [97, 164, 294, 695, 807, 864, 911]
 
 
+def test_randomSplit_disjoint_and_complete():
+    rdd = pysparkling.Context().parallelize(range(1000), 7)
+    splits = rdd.randomSplit([1, 2, 3], seed=3)
+    assert [s.getNumPartitions() for s in splits] == [7, 7, 7]
+
+    elements = [e for s in splits for e in s.collect()]
+    assert sorted(elements) == list(range(1000))
+
+    # recomputing a split yields the same elements
+    assert splits[1].collect() == splits[1].collect()
+
+
+def test_randomSplit_with_thread_pool():
+    with ThreadPoolExecutor(4) as pool:
+        rdd = pysparkling.Context(pool=pool).parallelize(range(200000), 8)
+        splits = rdd.randomSplit([1, 1], seed=1)
+        counts = [s.count() for s in splits]
+        assert sum(counts) == 200000
+        assert [s.count() for s in splits] == counts
+
+        elements = [e for s in splits for e in s.collect()]
+        assert sorted(elements) == list(range(200000))
+
+
 if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG)
     test_trivial_sample()
@@ -1,21 +1,45 @@
+import bz2
+import gzip
+import io
 import logging
 import os
 import pickle
 import random
+import struct
 import sys
+import tarfile
 import tempfile
 import unittest
+import zipfile
+import zlib
 
 import pytest
 
 from pysparkling import Context
-from pysparkling.fileio import File
+from pysparkling.context import archive_splits
+from pysparkling.fileio import File, TextFile
+from pysparkling.fileio.codec import Zip
+from pysparkling.fileio.prefetch import Prefetch, read_ahead
+from pysparkling.fileio.streams import reader
 
 try:
     import py7zlib
 except ImportError:
     py7zlib = None
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4
+except ImportError:
+    lz4 = None
+
+ZSTD = pytest.param('.zst', marks=pytest.mark.skipif(zstandard is None, reason='zstandard not installed'))
+LZ4 = pytest.param('.lz4', marks=pytest.mark.skipif(lz4 is None, reason='lz4 not installed'))
+
 AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
 S3_TEST_PATH = os.getenv('S3_TEST_PATH')
 OAUTH2_CLIENT_ID = os.getenv('OAUTH2_CLIENT_ID')
@@ -227,6 +251,186 @@ def test_saveAsTextFile_lzma():
     assert '5' in read_rdd.collect()
 
 
+def test_saveAsTextFile_compressionCodecClass():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(10)).saveAsTextFile(
+            name, 'org.apache.hadoop.io.compress.BZip2Codec')
+        assert os.path.isfile(name + '/part-00000.bz2')
+        read_rdd = Context().textFile(name)
+        assert read_rdd.collect() == [str(i) for i in range(10)]
+
+
+def test_saveAsTextFile_suffix():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(10), 2).saveAsTextFile(name + '.bz2')
+        assert os.path.isfile(name + '.bz2/part-00001.bz2')
+        read_rdd = Context().textFile(name + '.bz2')
+        assert read_rdd.collect() == [str(i) for i in range(10)]
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz', '.bz2', '.lzma', '.zip', '.tar', '.tar.gz', ZSTD, LZ4])
+def test_dump_chunks(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        lines = [f'line {i}\n' for i in range(100000)]
+        File(name + suffix).dump(line.encode() for line in lines)
+        with File(name + suffix).load() as stream:
+            assert stream.read() == ''.join(lines).encode()
+
+
+def test_TextFile_load_positional_encoding():
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'latin1.txt')
+        with open(file_name, 'wb') as f:
+            f.write('caf\xe9'.encode('latin1'))
+
+        with TextFile(file_name).load('latin1') as stream:
+            assert stream.read() == 'caf\xe9'
+        with TextFile(file_name).load('ascii', 'replace') as stream:
+            assert stream.read() == 'caf\ufffd'
+
+
+@pytest.mark.parametrize('content', ['', 'a', 'a\nb', 'a\r\nb\rc\n', 'a;;b;', '\n\nx\n\n'])
+@pytest.mark.parametrize('lineSep', [None, ';', '\r\n'])
+def test_lines(content, lineSep):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        TextFile(name + '.gz').dump(content)
+        expected = content.splitlines() if lineSep is None else content.split(lineSep)
+        assert list(TextFile(name + '.gz').lines(lineSep=lineSep)) == expected
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.bz2', '.lzma', '.zip', '.tar', '.tar.gz', '.tar.bz2', ZSTD, LZ4])
+def test_decompress_stream_unseekable(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        data = b''.join(b'%d\n' % i for i in range(50000))
+        f = File(name + suffix).dump(data)
+        with open(f.file_name, 'rb') as raw:
+            unseekable = reader(iter(lambda: raw.read(1000), b''))
+            with f.codec.decompress_stream(unseekable) as stream:
+                assert stream.read() == data
+        assert unseekable.closed
+
+
+def test_zip_members_closed_early():
+    with tempfile.TemporaryDirectory() as directory:
+        members = _write_archives(os.path.join(directory, 'archive'))
+        with open(os.path.join(directory, 'archive.zip'), 'rb') as raw:
+            unseekable = reader(iter(lambda: raw.read(1000), b''))
+            extracted = Zip().iter_members(unseekable, list(members))
+            name, member = next(extracted)
+            assert member.read().decode() == members[name]
+            extracted.close()
+        assert unseekable.closed
+
+
+def test_read_ahead():
+    data = bytes(range(256)) * 1000
+    with read_ahead(io.BytesIO(data), 1000, chunk_size=100) as stream:
+        assert stream.read() == data
+
+
+def test_prefetch_closes_unconsumed():
+    closed = []
+
+    def fetch(n):
+        try:
+            yield from range(n)
+        finally:
+            closed.append(n)
+
+    results = Prefetch(depth=2).map(fetch, [1, 2, 3, 4])
+    assert list(next(results)) == [0]
+    results.close()
+    assert sorted(closed) == [1, 2, 3]
+
+
+def test_textFile_prefetch():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(30), 6).saveAsTextFile(name)
+
+        context = Context(prefetch=Prefetch(depth=2))
+        rdd = context.textFile(name + '/part-*').coalesce(1)
+        assert sorted(rdd.map(int).collect()) == list(range(30))
+
+
+@pytest.mark.parametrize('content', ['a\nbb\n\nccc', 'a\r\nb\r\n\r\nc\r\n', 'a\rb\r\rc', '\n\n'])
+def test_lines_in_range(content):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        f = TextFile(name).dump(content)
+        for cut in range(1, len(content) + 1):
+            lines = list(f.lines_in_range(0, cut)) + list(f.lines_in_range(cut))
+            assert lines == content.splitlines(), cut
+
+
+def test_textFile_byte_ranges():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        lines = [f'line {i} ' + 'x' * (i % 37) for i in range(10000)]
+        TextFile(name).dump('\r\n'.join(lines))
+        rdd = Context().textFile(name, minPartitions=7)
+        assert rdd.getNumPartitions() == 7
+        assert rdd.collect() == lines
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz'])
+def test_binaryRecords_fixed_length(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        File(name + suffix).dump(b'abcdefghij' * 100 + b'xyz')
+        records = Context().binaryRecords(name + suffix, recordLength=5).collect()
+        assert records[:2] == [b'abcde', b'fghij']
+        assert len(records) == 201 and records[-1] == b'xyz'
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz'])
+def test_binaryRecords_variable_length(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        records = [b'x' * (i % 13) for i in range(100000)]
+        File(name + suffix).dump(struct.pack('<H', len(r)) + r for r in records)
+        assert Context().binaryRecords(name + suffix, recordLength='<H').collect() == records
+
+
+def test_textFile_empty():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        TextFile(name).dump('')
+        assert Context().textFile(name).collect() == []
+        assert Context().binaryRecords(name, recordLength=5).collect() == []
+
+
+@pytest.mark.parametrize('batchSize', [0, 1, 10])
+def test_pickleFile_batches(batchSize):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(1000)).saveAsPickleFile(name, batchSize)
+        assert Context().pickleFile(name).collect() == list(range(1000))
+
+
+def test_pickleFile_minPartitions():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(1000)).saveAsPickleFile(name, 7)
+        rdd = Context().pickleFile(name, minPartitions=4)
+        assert rdd.getNumPartitions() == 4
+        assert rdd.collect() == list(range(1000))
+        assert all(rdd.glom().map(len).collect())
+
+
+def test_pickleFile_gz_partitions():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        Context().parallelize(range(100), 3).saveAsPickleFile(name + '.gz')
+        rdd = Context().pickleFile(name + '.gz/part*', minPartitions=6)
+        assert sorted(rdd.collect()) == list(range(100))
+
+
 @unittest.skipIf(py7zlib is None,
                  'py7zlib import failed, is pylzma installed?')
 def test_read_7z():
@@ -287,6 +491,105 @@ def test_local_regex_read():
     assert len(d) == 10
 
 
+def _write_archives(name):
+    members = {f'part-{i}.txt': ''.join(f'{i}-{j}\n' for j in range(10 * (i + 1))) for i in range(4)}
+    with tarfile.open(name + '.tar.gz', 'w:gz') as tar:
+        for member, content in members.items():
+            info = tarfile.TarInfo(member)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content.encode()))
+    with zipfile.ZipFile(name + '.zip', 'w') as z:
+        for member, content in members.items():
+            z.writestr(member, content)
+    return members
+
+
+@pytest.mark.parametrize('suffix', ['.tar.gz', '.zip'])
+def test_archive_members(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        members = _write_archives(name)
+
+        f = File(name + suffix)
+        assert f.members() == [(member, len(content)) for member, content in members.items()]
+        assert File(name).members() is None
+
+        files = Context().binaryFiles(name + suffix, archiveMembers=True)
+        assert files.getNumPartitions() == 4
+        assert files.collect() == [
+            (f'{f.file_name}/{member}', content.encode()) for member, content in members.items()
+        ]
+
+        lines = Context().textFile(name + suffix, minPartitions=2, archiveMembers=True)
+        assert lines.getNumPartitions() == 2
+        assert sorted(lines.collect()) == sorted(''.join(members.values()).splitlines())
+        # largest first into the smaller partition: part-3 and part-0, part-2 and part-1
+        assert [len(p) for p in lines.glom().collect()] == [50, 50]
+
+
+def test_archive_splits():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        _write_archives(name)
+        TextFile(name + '.txt').dump('x' * 100)
+
+        splits = archive_splits([name + '.tar.gz', name + '.txt'], minPartitions=3)
+        assert splits == [
+            [(name + '.tar.gz', ['part-0.txt', 'part-2.txt'])],
+            [(name + '.tar.gz', ['part-1.txt']), (name + '.txt', None)],
+            [(name + '.tar.gz', ['part-3.txt'])],
+        ]
+
+
+def _bgzf_block(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    header = (b'\x1f\x8b\x08\x04' + b'\0' * 6 + struct.pack('<H', 6)
+              + b'BC' + struct.pack('<HH', 2, 18 + len(compressed) + 8 - 1))
+    return header + compressed + struct.pack('<II', zlib.crc32(data), len(data))
+
+
+@pytest.mark.parametrize('suffix', ['.bz2', '.bgzf.gz'])
+def test_textFile_compressed_blocks(suffix):
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        lines = [f'line {i} ' + 'x' * (i % 37) for i in range(40000)]
+        data = '\r\n'.join(lines).encode()
+        with open(name + suffix, 'wb') as f:
+            if suffix == '.bz2':
+                # 100 kB blocks
+                f.write(bz2.compress(data, 1))
+            else:
+                f.writelines(_bgzf_block(data[i:i + 65000]) for i in range(0, len(data), 65000))
+                f.write(_bgzf_block(b''))
+
+        assert File(name + suffix).block_splittable
+        rdd = Context().textFile(name + suffix, minPartitions=5)
+        assert rdd.getNumPartitions() == 5
+        assert all(rdd.glom().collect())
+        assert rdd.collect() == lines
+
+
+def test_textFile_gzip_members_index():
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, 'data')
+        lines = [f'line {i}' for i in range(50000)]
+        data = '\n'.join(lines).encode()
+        with open(name + '.gz', 'wb') as f:
+            f.writelines(gzip.compress(data[i:i + 50000]) for i in range(0, len(data), 50000))
+
+        f = File(name + '.gz')
+        assert not f.block_splittable
+        assert len(f.build_block_index()) == len(range(0, len(data), 50000))
+        assert os.path.isfile(f.block_index_name)
+
+        f = File(name + '.gz')
+        assert f.block_splittable
+        rdd = Context().textFile(f.file_name, minPartitions=4)
+        assert all(rdd.glom().collect())
+        assert rdd.collect() == lines
+
+
 if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG)
     test_local_regex_read()
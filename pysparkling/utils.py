@@ -146,6 +146,8 @@ def get_keyfunc(cols, schema, nulls_are_smaller=False):
     """
     Return a function that maps a row to a tuple of some of its columns values
     """
+    for col in cols:
+        col.bind(schema)
 
     def key(row):
         """
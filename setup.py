@@ -22,6 +22,8 @@ setup(
     ],
     extras_require={
         'hdfs': ['hdfs>=2.0.0'],
+        'lz4': ['lz4>=2.1.0'],
+        'zstd': ['zstandard>=0.15.0'],
         'performance': ['matplotlib>=1.5.3'],
         'streaming': ['tornado>=4.3'],
         'dev': [
@@ -35,6 +37,7 @@ setup(
             'backports.tempfile==1.0rc1',
             'cloudpickle>=0.1.0',
             'futures>=3.0.1',
+            'lz4>=2.1.0',
             'pylint~=2.7',
             'pylzma',
             'memory-profiler>=0.47',
@@ -43,6 +46,7 @@ setup(
             'pytest-cov',
             'isort',
             'tornado>=4.3',
+            'zstandard>=0.15.0',
         ],
         'scripts': [
             'ipyparallel',